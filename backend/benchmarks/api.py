@@ -0,0 +1,388 @@
+"""
+Benchmark the main API endpoints and check the results against a baseline.
+
+Seeds `--users` users and `--tasks` tasks assigned to them, then sends
+`--requests` requests to each endpoint, `--concurrency` at a time:
+`GET /tasks/`, `GET /tasks/{id}` for random seeded tasks, `GET /users/` and
+signed `user.updated` events to `POST /webhooks/clerk`. For each endpoint it
+reports throughput, p50/p95/p99 latency, database statements per request
+(counted through SQLAlchemy) and the peak resident set size sampled while
+the endpoint runs. The app is driven in-process through an ASGI transport
+against the database configured in `.env`, which must be Postgres: the app
+relies on its locking, LISTEN/NOTIFY and upsert syntax. Requests are
+authenticated as a seeded user, with only the Clerk token check stubbed out.
+
+`--output` writes the results as JSON. Given a former output as
+`--baseline`, the run fails when an endpoint regresses by more than
+`--tolerance`: lower throughput, higher p95 latency or peak RSS, or more
+statements per request.
+
+Usage:
+    uv run python -m benchmarks.api --users 1000 --tasks 20000 --output bench.json
+    uv run python -m benchmarks.api --baseline bench.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+
+import httpx
+from sqlalchemy import event, insert
+from sqlmodel import Session, delete
+from svix import Webhook
+
+from src.api.deps import verify_clerk_token
+from src.core.config import settings
+from src.core.db import async_engine, engine
+from src.main import app
+from src.models.tasks import Task, TaskCategory, TaskStatus
+from src.models.users import User
+from src.models.versions import USER_COLLECTION, bump_versions
+from src.models.webhooks import WebhookInboxEvent
+
+SEED_PREFIX = "bench_api_"
+SEED_CHUNK = 5_000
+RSS_SAMPLE_INTERVAL = 0.01
+# Statement counts don't vary between runs; the slack only absorbs
+# statements shared between concurrent requests, such as pool pre-pings.
+STATEMENT_SLACK = 0.5
+
+
+@dataclass
+class Seed:
+    clerk_ids: list[str]
+    task_ids: list[int]
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    # Builds the path, headers and body of the i-th request.
+    request: Callable[[int], tuple[str, dict, bytes | None]]
+    expected_status: int = 200
+
+
+@dataclass
+class RSSSampler:
+    """Peak resident set size of the process while it runs."""
+
+    peak: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+
+    @staticmethod
+    def current() -> int:
+        try:
+            with open("/proc/self/statm") as statm:
+                return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except OSError:
+            # Outside Linux, fall back to the process-wide high-water mark.
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+    async def sample(self) -> None:
+        while True:
+            self.peak = max(self.peak, self.current())
+            await asyncio.sleep(RSS_SAMPLE_INTERVAL)
+
+    async def __aenter__(self) -> "RSSSampler":
+        self.peak = self.current()
+        self.task = asyncio.create_task(self.sample())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        assert self.task is not None
+        self.task.cancel()
+        self.peak = max(self.peak, self.current())
+
+
+def seed(users: int, tasks: int) -> Seed:
+    clerk_ids = [f"{SEED_PREFIX}{i}" for i in range(users)]
+    rng = random.Random(0)
+    with Session(engine) as session:
+        user_ids = list(
+            session.exec(
+                insert(User)
+                .values(
+                    [
+                        {
+                            "clerk_id": clerk_id,
+                            "email": f"{clerk_id}@example.com",
+                            "full_name": f"Bench {i}",
+                            "is_active": True,
+                            "is_superuser": False,
+                        }
+                        for i, clerk_id in enumerate(clerk_ids)
+                    ]
+                )
+                .returning(User.id)
+            ).scalars()
+        )
+        task_ids = []
+        for start in range(0, tasks, SEED_CHUNK):
+            rows = [
+                {
+                    "title": f"{SEED_PREFIX}{i}",
+                    "assignee_id": rng.choice(user_ids),
+                    "category": rng.choice(list(TaskCategory)),
+                    "status": rng.choice(list(TaskStatus)),
+                    "due_date": date.today() + timedelta(days=rng.randrange(-30, 60)),
+                }
+                for i in range(start, min(start + SEED_CHUNK, tasks))
+            ]
+            task_ids += session.exec(
+                insert(Task).values(rows).returning(Task.id)
+            ).scalars()
+        session.exec(bump_versions(USER_COLLECTION))
+        session.commit()
+    return Seed(clerk_ids, task_ids)
+
+
+def remove_seeded() -> None:
+    with Session(engine) as session:
+        session.exec(delete(Task).where(Task.title.startswith(SEED_PREFIX)))  # type: ignore
+        session.exec(delete(User).where(User.clerk_id.startswith(SEED_PREFIX)))  # type: ignore
+        session.exec(
+            delete(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(SEED_PREFIX)  # type: ignore
+            )
+        )
+        session.exec(bump_versions(USER_COLLECTION))
+        session.commit()
+
+
+def signed_events(clerk_ids: list[str], count: int) -> list[tuple[dict, bytes]]:
+    # Signing is done upfront, as Clerk does it, so it isn't measured.
+    webhook = Webhook(settings.CLERK_WEBHOOK_SECRET_KEY)
+    now = datetime.now(timezone.utc)
+    events = []
+    for i in range(count):
+        clerk_id = clerk_ids[i % len(clerk_ids)]
+        body = json.dumps(
+            {
+                "type": "user.updated",
+                "timestamp": int(now.timestamp() * 1000) + i,
+                "data": {
+                    "id": clerk_id,
+                    "email_addresses": [{"email_address": f"{clerk_id}@example.com"}],
+                    "first_name": "Bench",
+                    "last_name": f"v{i}",
+                },
+            }
+        )
+        svix_id = f"{SEED_PREFIX}{i}"
+        headers = {
+            "content-type": "application/json",
+            "svix-id": svix_id,
+            "svix-timestamp": str(int(now.timestamp())),
+            "svix-signature": webhook.sign(svix_id, now, body),
+        }
+        events.append((headers, body.encode()))
+    return events
+
+
+def endpoints(seeded: Seed, requests: int, warmup: int) -> list[Endpoint]:
+    rng = random.Random(1)
+    task_ids = [rng.choice(seeded.task_ids) for _ in range(requests + warmup)]
+    events = signed_events(seeded.clerk_ids, requests + warmup)
+    return [
+        Endpoint("GET /tasks/", "GET", lambda i: ("/tasks/", {}, None)),
+        Endpoint(
+            "GET /tasks/{id}", "GET", lambda i: (f"/tasks/{task_ids[i]}", {}, None)
+        ),
+        Endpoint("GET /users/", "GET", lambda i: ("/users/", {}, None)),
+        Endpoint(
+            "POST /webhooks/clerk",
+            "POST",
+            lambda i: ("/webhooks/clerk", *events[i]),
+            expected_status=202,
+        ),
+    ]
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    endpoint: Endpoint,
+    requests: int,
+    warmup: int,
+    concurrency: int,
+) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    statements = 0
+
+    def count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    async def one(i: int) -> None:
+        path, headers, body = endpoint.request(i)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(
+                endpoint.method, path, headers=headers, content=body
+            )
+            latencies.append(time.perf_counter() - start)
+        assert response.status_code == endpoint.expected_status, response.text
+
+    # Warm up the connection pool and caches before measuring.
+    await asyncio.gather(*(one(i) for i in range(warmup)))
+    latencies.clear()
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        async with RSSSampler() as rss:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(warmup, warmup + requests)))
+            elapsed = time.perf_counter() - start
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": requests,
+        "rps": requests / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p95_ms": percentiles[94] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+        "statements_per_request": statements / requests,
+        "peak_rss_mb": rss.peak / 2**20,
+    }
+
+
+def regressions(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """
+    Compare benchmark results against a baseline run.
+
+    Args:
+        results: Per-endpoint results of this run.
+        baseline: Per-endpoint results of the baseline run.
+        tolerance: Relative change allowed before a metric counts as a
+            regression, e.g. 0.2 for 20%.
+
+    Returns:
+        A description of each regression; empty if there is none.
+    """
+    found = []
+    for name, result in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        checks = [
+            ("rps", result["rps"] < before["rps"] * (1 - tolerance)),
+            ("p95_ms", result["p95_ms"] > before["p95_ms"] * (1 + tolerance)),
+            (
+                "peak_rss_mb",
+                result["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance),
+            ),
+            (
+                "statements_per_request",
+                result["statements_per_request"]
+                > before["statements_per_request"] + STATEMENT_SLACK,
+            ),
+        ]
+        for metric, regressed in checks:
+            if regressed:
+                found.append(
+                    f"{name}: {metric} {before[metric]:.2f} -> {result[metric]:.2f}"
+                )
+    return found
+
+
+async def main_async(args: argparse.Namespace, seeded: Seed) -> dict:
+    clerk_id = seeded.clerk_ids[0]
+    app.dependency_overrides[verify_clerk_token] = lambda: {"sub": clerk_id}
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport,
+            base_url="http://bench",
+            headers={"Authorization": "Bearer bench"},
+        ) as client:
+            for endpoint in endpoints(seeded, args.requests, args.warmup):
+                results[endpoint.name] = await measure(
+                    client, endpoint, args.requests, args.warmup, args.concurrency
+                )
+    finally:
+        app.dependency_overrides.clear()
+        await async_engine.dispose()
+    return results
+
+
+def print_results(args: argparse.Namespace, results: dict) -> None:
+    print(
+        f"{args.users} users, {args.tasks} tasks - {args.requests} requests "
+        f"per endpoint, concurrency {args.concurrency}"
+    )
+    print(
+        f"{'endpoint':<22}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'stmts/req':>11}{'rss MB':>9}"
+    )
+    for name, result in results.items():
+        print(
+            f"{name:<22}{result['rps']:>9.0f}{result['p50_ms']:>9.2f}"
+            f"{result['p95_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+            f"{result['statements_per_request']:>11.2f}{result['peak_rss_mb']:>9.1f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument("--tasks", type=int, default=20_000)
+    parser.add_argument("--requests", type=int, default=1_000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Fail on regressions against this file")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    if args.users < 1 or args.tasks < 1 or args.requests < 2:
+        parser.error("needs at least one user, one task and two requests")
+
+    remove_seeded()
+    try:
+        seeded = seed(args.users, args.tasks)
+        results = asyncio.run(main_async(args, seeded))
+    finally:
+        remove_seeded()
+
+    print_results(args, results)
+    if args.output:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "config": {
+                name: getattr(args, name)
+                for name in ("users", "tasks", "requests", "warmup", "concurrency")
+            },
+            "endpoints": results,
+        }
+        with open(args.output, "w") as output:
+            json.dump(report, output, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            found = regressions(
+                results, json.load(baseline)["endpoints"], args.tolerance
+            )
+        if found:
+            print(f"Regressions beyond {args.tolerance:.0%}:")
+            print("\n".join(f"  {regression}" for regression in found))
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
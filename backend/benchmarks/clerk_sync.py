@@ -0,0 +1,170 @@
+"""
+Benchmark the set-based Clerk user sync against the former per-user one.
+
+The per-user variant is the former implementation of `sync_clerk_users`: one
+SELECT per Clerk user, changes applied through ORM objects and missing users
+found by loading every active user. The set-based variant is the real
+`sync_user_pages`. Both get the same `--users` fake Clerk users from memory,
+so only the database work is measured, and run twice: importing users into
+an empty table, then syncing them again unchanged with `--deactivate-missing`.
+Imports are rolled back; the users synced again are seeded beforehand and
+removed afterwards. Statements are counted through SQLAlchemy, which leaves
+out the COPY of each page sent straight through asyncpg.
+
+Usage:
+    uv run python -m benchmarks.clerk_sync --users 100000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import time
+from collections.abc import AsyncIterator
+
+from sqlalchemy import event
+from sqlmodel import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.models.users import User
+from src.scripts.sync_clerk_users import (
+    PAGE_SIZE,
+    SyncStats,
+    extract_user_data,
+    sync_user_pages,
+)
+
+SEED_PREFIX = "bench_sync_"
+
+
+def clerk_user(i: int) -> dict:
+    return {
+        "id": f"{SEED_PREFIX}{i}",
+        "email_addresses": [{"email_address": f"{SEED_PREFIX}{i}@bench.test"}],
+        "first_name": "Bench",
+        "last_name": str(i),
+        "image_url": None,
+    }
+
+
+async def clerk_pages(count: int) -> AsyncIterator[list[dict]]:
+    for start in range(0, count, PAGE_SIZE):
+        yield [clerk_user(i) for i in range(start, min(start + PAGE_SIZE, count))]
+
+
+async def per_user_sync(
+    db: AsyncSession, pages: AsyncIterator[list[dict]], deactivate_missing: bool
+) -> SyncStats:
+    stats = SyncStats()
+    clerk_ids = set()
+    async for page in pages:
+        for clerk_user_data in page:
+            data = extract_user_data(clerk_user_data)
+            clerk_ids.add(data["clerk_id"])
+            user = (
+                await db.exec(select(User).where(User.clerk_id == data["clerk_id"]))
+            ).first()
+            if user is None:
+                db.add(User(**data, is_active=True, is_superuser=False))
+                stats.created += 1
+            elif (user.email, user.full_name, user.image_url, user.is_active) != (
+                data["email"],
+                data["full_name"],
+                data["image_url"],
+                True,
+            ):
+                user.sqlmodel_update({**data, "is_active": True})
+                db.add(user)
+                stats.updated += 1
+            else:
+                stats.unchanged += 1
+    if deactivate_missing:
+        for user in (await db.exec(select(User).where(User.is_active))).all():
+            if user.clerk_id not in clerk_ids:
+                user.is_active = False
+                db.add(user)
+                stats.deactivated += 1
+    await db.flush()
+    return stats
+
+
+async def timed(variant: str, users: int, deactivate_missing: bool) -> dict:
+    statements = 0
+
+    def count(*args) -> None:
+        nonlocal statements
+        statements += 1
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    start = time.perf_counter()
+    try:
+        async with AsyncSession(async_engine) as db:
+            pages = clerk_pages(users)
+            with contextlib.redirect_stdout(io.StringIO()):
+                if variant == "per-user":
+                    stats = await per_user_sync(db, pages, deactivate_missing)
+                else:
+                    stats = await sync_user_pages(
+                        db, pages, deactivate_missing=deactivate_missing
+                    )
+            await db.rollback()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+    return {
+        "seconds": time.perf_counter() - start,
+        "statements": statements,
+        "created": stats.created,
+        "unchanged": stats.unchanged,
+    }
+
+
+async def seed_users(count: int) -> None:
+    async with AsyncSession(async_engine) as db:
+        await sync_user_pages(db, clerk_pages(count))
+        await db.commit()
+
+
+async def remove_seeded_users() -> None:
+    async with AsyncSession(async_engine) as db:
+        await db.exec(delete(User).where(User.clerk_id.startswith(SEED_PREFIX)))  # type: ignore
+        await db.commit()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    results = {}
+    await remove_seeded_users()
+    try:
+        for variant in ("per-user", "set-based"):
+            results[("import", variant)] = await timed(variant, args.users, False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            await seed_users(args.users)
+        for variant in ("per-user", "set-based"):
+            results[("resync", variant)] = await timed(variant, args.users, True)
+    finally:
+        await remove_seeded_users()
+        await async_engine.dispose()
+
+    print(f"{args.users} Clerk users")
+    print(
+        f"{'scenario':<10}{'variant':<11}{'seconds':>9}{'users/s':>10}"
+        f"{'statements':>12}{'created':>9}{'unchanged':>11}"
+    )
+    for (scenario, variant), result in results.items():
+        print(
+            f"{scenario:<10}{variant:<11}{result['seconds']:>9.2f}"
+            f"{args.users / result['seconds']:>10.0f}{result['statements']:>12}"
+            f"{result['created']:>9}{result['unchanged']:>11}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000)
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
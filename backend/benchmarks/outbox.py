@@ -0,0 +1,143 @@
+"""
+Benchmark the domain event outbox relay.
+
+Seeds `--events` pending events for `--aggregates` aggregates in the outbox,
+then publishes them with each of the `--workers` counts of relays running
+side by side, reset in between. The publisher stands for a broker taking
+`--publish-latency` milliseconds per batch; it records what it receives, so
+that the run checks every event was published once, and in order within its
+aggregate. Other pending events of the database configured in `.env` are
+published too (to nobody), as a relay would.
+
+Usage:
+    uv run python -m benchmarks.outbox --events 100000 --workers 1 2 4 8
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Sequence
+
+from sqlalchemy import Text, cast, func, literal, select
+from sqlmodel import Session, delete, insert, update
+
+from src.core.db import async_engine, engine
+from src.core.outbox import DomainEvent, OutboxRelay
+from src.models.outbox import OutboxEvent, OutboxPartition
+
+SEED_AGGREGATE_TYPE = "bench_outbox"
+
+
+class RecordingPublisher:
+    def __init__(self, latency: float, received: list[DomainEvent]):
+        self.latency = latency
+        self.received = received
+
+    async def publish(self, events: Sequence[DomainEvent]) -> None:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        self.received.extend(
+            event for event in events if event.aggregate_type == SEED_AGGREGATE_TYPE
+        )
+
+
+def seed_events(count: int, aggregates: int) -> None:
+    n = func.generate_series(1, count).table_valued("n").render_derived(name="s")
+    with Session(engine) as session:
+        session.exec(
+            insert(OutboxEvent).from_select(  # type: ignore
+                ["aggregate_type", "aggregate_id", "event_type", "payload"],
+                select(
+                    literal(SEED_AGGREGATE_TYPE),
+                    cast(n.c.n % aggregates, Text),
+                    literal("bench.updated"),
+                    func.jsonb_build_object("n", n.c.n),
+                ),
+                include_defaults=False,
+            )
+        )
+        session.commit()
+
+
+def reset_events() -> None:
+    with Session(engine) as session:
+        session.exec(
+            update(OutboxEvent)
+            .where(OutboxEvent.aggregate_type == SEED_AGGREGATE_TYPE)  # type: ignore
+            .values(published_at=None)
+        )
+        session.exec(update(OutboxPartition).values(relayed_at=None))
+        session.commit()
+
+
+def check_order(received: list[DomainEvent], count: int) -> None:
+    assert len(received) == count, f"{len(received)} events published of {count}"
+    assert len({event.id for event in received}) == count, "events published twice"
+    last_ids: dict[str, int] = {}
+    for event in received:
+        previous = last_ids.get(event.aggregate_id, 0)
+        assert event.id > previous, f"aggregate {event.aggregate_id} reordered"
+        last_ids[event.aggregate_id] = event.id
+
+
+async def relay(
+    workers: int, args: argparse.Namespace
+) -> tuple[float, list[OutboxRelay]]:
+    received: list[DomainEvent] = []
+    publisher = RecordingPublisher(args.publish_latency / 1000, received)
+    relays = [
+        OutboxRelay(publisher, batch_size=args.batch_size) for _ in range(workers)
+    ]
+    start = time.perf_counter()
+    await asyncio.gather(*(r.drain() for r in relays))
+    seconds = time.perf_counter() - start
+    check_order(received, args.events)
+    return seconds, relays
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    results = {}
+    for workers in args.workers:
+        reset_events()
+        results[workers] = await relay(workers, args)
+    await async_engine.dispose()
+
+    print(
+        f"{args.events} events for {args.aggregates} aggregates, "
+        f"batches of {args.batch_size}, {args.publish_latency} ms per publish"
+    )
+    print(f"{'workers':>8}{'events/s':>12}{'batches':>10}")
+    for workers, (seconds, relays) in results.items():
+        batches = sum(r.stats.batches for r in relays)
+        print(f"{workers:>8}{args.events / seconds:>12.0f}{batches:>10}")
+
+
+def remove_leftovers() -> None:
+    with Session(engine) as session:
+        session.exec(
+            delete(OutboxEvent).where(
+                OutboxEvent.aggregate_type == SEED_AGGREGATE_TYPE  # type: ignore
+            )
+        )
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=100_000)
+    parser.add_argument("--aggregates", type=int, default=5_000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--publish-latency", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    remove_leftovers()
+    seed_events(args.events, args.aggregates)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        remove_leftovers()
+
+
+if __name__ == "__main__":
+    main()
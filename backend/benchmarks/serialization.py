@@ -0,0 +1,120 @@
+"""
+Micro-benchmark of serializing a list of tasks into a JSON response body.
+
+Compares the `response_model` path (Pydantic validation of ORM objects, JSON
+dump to Python objects, `json.dumps` by `JSONResponse`) with the direct path
+used by the list endpoints (column rows turned into dicts and encoded by
+orjson). Reports time per response and peak memory allocated while building
+it. No database is needed.
+
+Usage:
+    uv run python -m benchmarks.serialization --tasks 10000
+"""
+
+import argparse
+import statistics
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable
+from datetime import date, datetime, timezone
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from src.api.serializers import (
+    TASK_FIELDS,
+    USER_FIELDS,
+    ORJSONResponse,
+    task_row_to_dict,
+)
+from src.models.tasks import Task, TaskCategory, TaskPublic, TaskStatus
+from src.models.users import User
+
+
+def make_tasks(count: int) -> list[Task]:
+    users = [
+        User(id=uuid.uuid4(), email=f"member{i}@example.com", clerk_id=f"user_{i}")
+        for i in range(5)
+    ]
+    tasks = []
+    for i in range(count):
+        assignee = users[i % 6] if i % 6 < 5 else None
+        tasks.append(
+            Task(
+                id=i,
+                title=f"Task {i}",
+                description="Take out the trash and recycle the cardboard",
+                assignee_id=assignee.id if assignee else None,
+                assignee=assignee,
+                category=TaskCategory.Chore,
+                due_date=date(2026, 1, 1),
+                status=TaskStatus.TODO,
+                updated_at=datetime.now(timezone.utc),
+            )
+        )
+    return tasks
+
+
+def to_row(task: Task) -> tuple:
+    user_values = (
+        tuple(getattr(task.assignee, name) for name in USER_FIELDS)
+        if task.assignee
+        else (None,) * len(USER_FIELDS)
+    )
+    return tuple(getattr(task, name) for name in TASK_FIELDS) + user_values
+
+
+def measure(render: Callable[[], bytes], repeat: int) -> dict:
+    render()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        render()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    body = render()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ms": statistics.median(timings) * 1000,
+        "peak_mib": peak / 2**20,
+        "bytes": len(body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    tasks = make_tasks(args.tasks)
+    rows = [to_row(task) for task in tasks]
+    adapter = TypeAdapter(list[TaskPublic])
+
+    def response_model_path() -> bytes:
+        validated = adapter.validate_python(tasks, from_attributes=True)
+        return JSONResponse(adapter.dump_python(validated, mode="json")).body
+
+    def direct_path() -> bytes:
+        return ORJSONResponse([task_row_to_dict(row) for row in rows]).body
+
+    results = {
+        "response_model + json": measure(response_model_path, args.repeat),
+        "rows + orjson": measure(direct_path, args.repeat),
+    }
+
+    print(f"Serializing {args.tasks} tasks")
+    print(f"{'path':<24}{'ms':>10}{'peak MiB':>10}{'body KiB':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<24}{result['ms']:>10.1f}{result['peak_mib']:>10.1f}"
+            f"{result['bytes'] / 1024:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
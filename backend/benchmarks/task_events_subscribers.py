@@ -0,0 +1,117 @@
+"""
+Load test of the `GET /tasks/events` stream with many idle subscribers.
+
+Starts the app in-process with uvicorn, opens `--subscribers` SSE
+connections to it, then publishes events straight to the worker's broker
+(as the Postgres listener would) and measures how long it takes for every
+subscriber to receive each one. Authentication is stubbed out and no
+database is needed.
+
+Usage:
+    uv run python -m benchmarks.task_events_subscribers --subscribers 5000
+
+Each subscriber is a real socket: raise `ulimit -n` above twice the number of
+subscribers first.
+"""
+
+import argparse
+import asyncio
+import resource
+import socket
+import statistics
+import time
+
+import httpx
+import uvicorn
+
+from src.api.deps import get_current_user
+from src.core.events import task_events
+from src.main import app
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def subscriber(
+    client: httpx.AsyncClient, ready: asyncio.Event, received: list[float]
+) -> None:
+    async with client.stream("GET", "/tasks/events") as response:
+        response.raise_for_status()
+        ready.set()
+        async for line in response.aiter_lines():
+            if line.startswith("data:"):
+                received.append(time.perf_counter())
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    app.dependency_overrides[get_current_user] = lambda: None
+    port = free_port()
+    # Without lifespan: the Postgres listener is replaced by direct publishes.
+    server = uvicorn.Server(
+        uvicorn.Config(app, port=port, log_level="warning", lifespan="off")
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    rss_before = peak_rss_mb()
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(
+        base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=None
+    ) as client:
+        received: list[float] = []
+        readies = [asyncio.Event() for _ in range(args.subscribers)]
+        tasks = [
+            asyncio.create_task(subscriber(client, ready, received))
+            for ready in readies
+        ]
+        start = time.perf_counter()
+        await asyncio.gather(*(ready.wait() for ready in readies))
+        while task_events.subscriber_count < args.subscribers:
+            await asyncio.sleep(0.01)
+        connect_seconds = time.perf_counter() - start
+        rss_connected = peak_rss_mb()
+
+        fan_out = []
+        for i in range(args.events):
+            received.clear()
+            published = time.perf_counter()
+            task_events.publish(f'{{"op": "updated", "task_id": {i}}}')
+            while len(received) < args.subscribers:
+                await asyncio.sleep(0.001)
+            fan_out.append(max(received) - published)
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    server.should_exit = True
+    await server_task
+
+    print(f"subscribers:           {args.subscribers}")
+    print(f"connect all:           {connect_seconds:.2f} s")
+    print(f"fan-out to all, p50:   {statistics.median(fan_out) * 1000:.1f} ms")
+    print(f"fan-out to all, max:   {max(fan_out) * 1000:.1f} ms")
+    print(
+        "RSS per subscriber:    "
+        f"{(rss_connected - rss_before) * 1024 / args.subscribers:.1f} KiB "
+        "(server and client side)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--subscribers", type=int, default=2000)
+    parser.add_argument("--events", type=int, default=20)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
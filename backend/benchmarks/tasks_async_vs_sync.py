@@ -0,0 +1,137 @@
+"""
+Benchmark `GET /tasks/` served by the async handler against the sync one.
+
+The sync variant is the former psycopg2 implementation, run by FastAPI in its
+threadpool; the async variant is the real route from `src.main:app`. Both
+apps are driven in-process through an ASGI transport against the database
+configured in `.env`, with authentication stubbed out so only the request
+handling and database access are measured.
+
+Usage:
+    uv run python -m benchmarks.tasks_async_vs_sync
+
+    # Seed 500 tasks first (removed afterwards), 5000 requests, 200 in flight:
+    uv run python -m benchmarks.tasks_async_vs_sync --seed 500 \\
+        --requests 5000 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, delete, select
+
+from src.api.deps import SessionDep, get_current_user
+from src.core.db import async_engine, engine
+from src.main import app as async_app
+from src.models.tasks import Task, TaskCategory, TaskPublic, TaskStatus
+
+SEED_PREFIX = "bench-"
+
+
+def build_sync_app() -> FastAPI:
+    sync_app = FastAPI()
+
+    @sync_app.get("/tasks/", response_model=list[TaskPublic])
+    def read_tasks(session: SessionDep):
+        statement = select(Task).options(selectinload(Task.assignee))  # type: ignore
+        return session.exec(statement).all()
+
+    return sync_app
+
+
+def seed_tasks(count: int) -> None:
+    with Session(engine) as session:
+        session.add_all(
+            Task(
+                title=f"{SEED_PREFIX}{i}",
+                category=TaskCategory.Chore,
+                due_date=date.today(),
+                status=TaskStatus.TODO,
+            )
+            for i in range(count)
+        )
+        session.commit()
+
+
+def remove_seeded_tasks() -> None:
+    with Session(engine) as session:
+        session.exec(delete(Task).where(Task.title.startswith(SEED_PREFIX)))  # type: ignore
+        session.commit()
+
+
+async def run(app: FastAPI, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/tasks/")
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+
+        # Warm up the connection pool before measuring.
+        await asyncio.gather(*(one() for _ in range(min(concurrency, requests))))
+        latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": percentiles[49] * 1000,
+        "p99_ms": percentiles[98] * 1000,
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    async_app.dependency_overrides[get_current_user] = lambda: None
+    results = {
+        "sync": await run(build_sync_app(), args.requests, args.concurrency),
+        "async": await run(async_app, args.requests, args.concurrency),
+    }
+    async_app.dependency_overrides.clear()
+    await async_engine.dispose()
+
+    print(f"GET /tasks/ - {args.requests} requests, concurrency {args.concurrency}")
+    print(f"{'mode':<8}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for mode, result in results.items():
+        print(
+            f"{mode:<8}{result['rps']:>10.1f}"
+            f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Number of tasks to create first"
+    )
+    args = parser.parse_args()
+
+    if args.seed:
+        seed_tasks(args.seed)
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        if args.seed:
+            remove_seeded_tasks()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Benchmark the bulk task endpoints against the single-item ones.
+
+Creates, updates then deletes `--tasks` tasks, first one request per task
+(`POST /tasks/`, `PATCH /tasks/{id}`, `DELETE /tasks/{id}`, sent sequentially
+as a client planning a week of chores would), then in batches of `--batch`
+(`POST`, `PATCH` and `DELETE /tasks/bulk`). The app is driven in-process
+through an ASGI transport against the database configured in `.env`, with
+authentication stubbed out.
+
+Usage:
+    uv run python -m benchmarks.tasks_bulk --tasks 500 --batch 100
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from datetime import date
+
+import httpx
+from sqlmodel import Session, delete
+
+from src.api.deps import get_current_user
+from src.core.db import async_engine, engine
+from src.main import app
+from src.models.tasks import Task
+
+SEED_PREFIX = "bench-bulk-"
+
+
+def task_body(i: int) -> dict:
+    return {
+        "title": f"{SEED_PREFIX}{i}",
+        "category": "Chore",
+        "due_date": date.today().isoformat(),
+        "status": "todo",
+    }
+
+
+def batches(items: list, size: int) -> list[list]:
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def timed(run: Callable[[], Awaitable[list[int]]]) -> tuple[float, list[int]]:
+    start = time.perf_counter()
+    ids = await run()
+    return time.perf_counter() - start, ids
+
+
+async def single(client: httpx.AsyncClient, count: int) -> dict[str, float]:
+    async def create() -> list[int]:
+        ids = []
+        for i in range(count):
+            response = await client.post("/tasks/", json=task_body(i))
+            response.raise_for_status()
+            ids.append(response.json()["id"])
+        return ids
+
+    create_seconds, ids = await timed(create)
+
+    async def update() -> list[int]:
+        for task_id in ids:
+            response = await client.patch(
+                f"/tasks/{task_id}", json={"status": "completed"}
+            )
+            response.raise_for_status()
+        return ids
+
+    async def remove() -> list[int]:
+        for task_id in ids:
+            (await client.delete(f"/tasks/{task_id}")).raise_for_status()
+        return ids
+
+    return {
+        "create": create_seconds,
+        "update": (await timed(update))[0],
+        "delete": (await timed(remove))[0],
+    }
+
+
+async def bulk(client: httpx.AsyncClient, count: int, size: int) -> dict[str, float]:
+    async def create() -> list[int]:
+        ids = []
+        for batch in batches(list(range(count)), size):
+            response = await client.post(
+                "/tasks/bulk", json=[task_body(i) for i in batch]
+            )
+            response.raise_for_status()
+            ids.extend(task["id"] for task in response.json()["tasks"])
+        return ids
+
+    create_seconds, ids = await timed(create)
+
+    async def update() -> list[int]:
+        for batch in batches(ids, size):
+            response = await client.patch(
+                "/tasks/bulk",
+                json=[{"id": task_id, "status": "completed"} for task_id in batch],
+            )
+            response.raise_for_status()
+        return ids
+
+    async def remove() -> list[int]:
+        for batch in batches(ids, size):
+            response = await client.request("DELETE", "/tasks/bulk", json=batch)
+            response.raise_for_status()
+        return ids
+
+    return {
+        "create": create_seconds,
+        "update": (await timed(update))[0],
+        "delete": (await timed(remove))[0],
+    }
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    app.dependency_overrides[get_current_user] = lambda: None
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        results = {
+            "single": await single(client, args.tasks),
+            f"bulk/{args.batch}": await bulk(client, args.tasks, args.batch),
+        }
+    app.dependency_overrides.clear()
+    await async_engine.dispose()
+
+    print(f"{args.tasks} tasks, throughput in tasks/s")
+    print(f"{'mode':<12}{'create':>10}{'update':>10}{'delete':>10}")
+    for mode, seconds in results.items():
+        print(
+            f"{mode:<12}"
+            + "".join(f"{args.tasks / seconds[op]:>10.0f}" for op in seconds)
+        )
+
+
+def remove_leftovers() -> None:
+    with Session(engine) as session:
+        session.exec(delete(Task).where(Task.title.startswith(SEED_PREFIX)))  # type: ignore
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--batch", type=int, default=100)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        remove_leftovers()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark webhook ingestion and the inbox worker.
+
+Sends `--events` signed Clerk user events for `--users` users to
+`POST /webhooks/clerk`, `--concurrency` at a time: each user gets a
+`user.created` event followed by a burst of `user.updated` ones, as Clerk
+sends while a user completes their profile. The inbox is then drained with
+each of the `--batch-sizes`, reset in between; a batch size of 1 stands for
+applying every event on its own. The app is driven in-process through an
+ASGI transport against the database configured in `.env`; its inbox worker
+isn't started, so ingestion and draining are timed separately.
+
+Usage:
+    uv run python -m benchmarks.webhook_inbox --events 10000 --users 2000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+
+import httpx
+from sqlmodel import Session, delete, update
+from svix import Webhook
+
+from src.core.config import settings
+from src.core.db import async_engine, engine
+from src.main import app
+from src.models.users import User
+from src.models.webhooks import WebhookInboxEvent
+from src.webhooks.inbox import WebhookInboxWorker
+
+SEED_PREFIX = "bench_wh_"
+
+
+def signed_events(count: int, users: int) -> list[tuple[dict, bytes]]:
+    webhook = Webhook(settings.CLERK_WEBHOOK_SECRET_KEY)
+    now = datetime.now(timezone.utc)
+    per_user = -(-count // users)
+    events = []
+    for i in range(count):
+        user, version = divmod(i, per_user)
+        event = {
+            "type": "user.updated" if version else "user.created",
+            "timestamp": int(now.timestamp() * 1000) + i,
+            "data": {
+                "id": f"{SEED_PREFIX}{user}",
+                "email_addresses": [
+                    {"email_address": f"{SEED_PREFIX}{user}@bench.test"}
+                ],
+                "first_name": "Bench",
+                "last_name": f"v{version}",
+            },
+        }
+        svix_id = f"{SEED_PREFIX}{i}"
+        body = json.dumps(event)
+        headers = {
+            "svix-id": svix_id,
+            "svix-timestamp": str(int(now.timestamp())),
+            "svix-signature": webhook.sign(svix_id, now, body),
+        }
+        events.append((headers, body.encode()))
+    return events
+
+
+async def ingest(client: httpx.AsyncClient, events: list, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(headers: dict, body: bytes) -> None:
+        async with semaphore:
+            response = await client.post(
+                "/webhooks/clerk", content=body, headers=headers
+            )
+            assert response.status_code == 202, response.text
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send(headers, body) for headers, body in events))
+    return time.perf_counter() - start
+
+
+async def drain(batch_size: int) -> tuple[float, WebhookInboxWorker]:
+    worker = WebhookInboxWorker(batch_size=batch_size)
+    start = time.perf_counter()
+    await worker.drain()
+    return time.perf_counter() - start, worker
+
+
+def reset_inbox() -> None:
+    with Session(engine) as session:
+        session.exec(
+            update(WebhookInboxEvent)
+            .where(WebhookInboxEvent.svix_id.startswith(SEED_PREFIX))  # type: ignore
+            .values(processed_at=None, attempts=0, error=None)
+        )
+        session.exec(delete(User).where(User.clerk_id.startswith(SEED_PREFIX)))  # type: ignore
+        session.commit()
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    events = signed_events(args.events, args.users)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        ingest_seconds = await ingest(client, events, args.concurrency)
+
+    drains = {}
+    for batch_size in args.batch_sizes:
+        reset_inbox()
+        drains[batch_size] = await drain(batch_size)
+    await async_engine.dispose()
+
+    print(f"{args.events} events for {args.users} users")
+    print(
+        f"ingest: {args.events / ingest_seconds:.0f} events/s "
+        f"({args.concurrency} concurrent requests)"
+    )
+    print(f"{'batch':>8}{'events/s':>12}{'batches':>10}{'users/batch':>14}")
+    for batch_size, (seconds, worker) in drains.items():
+        stats = worker.stats
+        print(
+            f"{batch_size:>8}{stats.events / seconds:>12.0f}{stats.batches:>10}"
+            f"{stats.users_changed / stats.batches:>14.1f}"
+        )
+
+
+def remove_leftovers() -> None:
+    with Session(engine) as session:
+        session.exec(
+            delete(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(SEED_PREFIX)  # type: ignore
+            )
+        )
+        session.exec(delete(User).where(User.clerk_id.startswith(SEED_PREFIX)))  # type: ignore
+        session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--events", type=int, default=10_000)
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[500, 1])
+    args = parser.parse_args()
+
+    remove_leftovers()
+    try:
+        asyncio.run(main_async(args))
+    finally:
+        remove_leftovers()
+
+
+if __name__ == "__main__":
+    main()
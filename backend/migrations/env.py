@@ -21,9 +21,23 @@ if config.config_file_name is not None:
 # target_metadata = mymodel.Base.metadata
 from src.models.users import UserBase  # noqa
 from src.models.tasks import TaskBase  # noqa
+from src.models.versions import CollectionVersion  # noqa
+from src.models.sync import SyncCheckpoint  # noqa
+from src.models.webhooks import WebhookInboxEvent  # noqa
+from src.models.notifications import Notification  # noqa
+from src.models.outbox import OutboxEvent  # noqa
 
 target_metadata = SQLModel.metadata
 
+# Indexes that migrations create only where the extension they need is
+# available; autogenerate must neither add nor drop them.
+OPTIONAL_INDEXES = {"ix_task_title_trgm"}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    return not (type_ == "index" and name in OPTIONAL_INDEXES)
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -50,6 +64,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -74,7 +89,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
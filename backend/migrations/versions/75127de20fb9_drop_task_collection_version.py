@@ -0,0 +1,29 @@
+"""drop task collection version
+
+Revision ID: 75127de20fb9
+Revises: 781e591d109b
+Create Date: 2026-10-18 09:28:00.484966
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "75127de20fb9"
+down_revision: Union[str, Sequence[str], None] = "781e591d109b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The task version is derived from the task rows now.
+    op.execute("DELETE FROM collection_version WHERE name = 'task'")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("INSERT INTO collection_version (name, version) VALUES ('task', 0)")
@@ -2,12 +2,15 @@ from typing import Annotated
 
 import jwt
 from fastapi import Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from jwt import PyJWKClient
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from src.core.config import settings
-from src.core.db import engine
+from src.core.db import async_engine, engine
+from src.core.security import JWKSKeyStore, VerifiedTokenCache
+from src.core.user_cache import AuthUser, user_cache
 from src.models.users import User
 
 
@@ -19,6 +22,16 @@ def get_session():
 SessionDep = Annotated[Session, Depends(get_session)]
 
 
+async def get_async_session():
+    # Objects are used after commit (e.g. in the response), so don't expire
+    # them: with an async session, expired attributes can't be lazy-loaded.
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
+
+
+AsyncSessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
+
 # @lru_cache
 def get_config():
     return settings
@@ -27,19 +40,31 @@ def get_config():
 security = HTTPBearer()
 
 
-# @lru_cache
-def get_jwks_client() -> PyJWKClient:
-    return PyJWKClient(uri=settings.CLERK_JWKS_URL, cache_keys=True)
+# Shared by every request of the process: keys and verified tokens are only
+# fetched/verified once instead of per request.
+jwks_key_store = JWKSKeyStore(
+    uri=settings.CLERK_JWKS_URL, ttl=settings.CLERK_JWKS_CACHE_TTL
+)
+verified_token_cache = VerifiedTokenCache(maxsize=settings.CLERK_TOKEN_CACHE_SIZE)
 
 
-def verify_clerk_token(
+async def verify_clerk_token(
     credentials: Annotated[HTTPAuthorizationCredentials, Depends(security)],
 ):
     token = credentials.credentials
 
+    payload = verified_token_cache.get(token)
+    if payload is not None:
+        return payload
+
+    # Fetching keys and verifying the signature block, keep them off the loop.
+    return await run_in_threadpool(decode_clerk_token, token)
+
+
+def decode_clerk_token(token: str) -> dict:
     try:
-        jwks_client = get_jwks_client()
-        signin_key = jwks_client.get_signing_key_from_jwt(token)
+        kid = jwt.get_unverified_header(token).get("kid")
+        signin_key = jwks_key_store.get_signing_key(kid)
 
         payload = jwt.decode(
             token,
@@ -49,6 +74,7 @@ def verify_clerk_token(
             options={"verify_aud": False},  # Clerk doesn't always set audience
         )
 
+        verified_token_cache.put(token, payload)
         return payload
     except jwt.ExpiredSignatureError:
         raise HTTPException(
@@ -73,7 +99,9 @@ def verify_clerk_token(
 ClerkTokenDep = Annotated[dict, Depends(verify_clerk_token)]
 
 
-def get_current_user(token_payload: ClerkTokenDep, session: SessionDep) -> User:
+async def get_current_user(
+    token_payload: ClerkTokenDep, session: AsyncSessionDep
+) -> AuthUser:
     clerk_id = token_payload.get("sub")
     if not clerk_id:
         raise HTTPException(
@@ -82,11 +110,29 @@ def get_current_user(token_payload: ClerkTokenDep, session: SessionDep) -> User:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = session.exec(select(User).where(User.clerk_id == clerk_id)).first()
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="User not found. "
+    # FastAPI already runs this once per request; the cache spares the
+    # lookup across requests. On a hit no connection is checked out.
+    user = user_cache.get(clerk_id)
+    if user is None:
+        row = (
+            await session.exec(
+                select(User.id, User.is_active, User.is_superuser).where(
+                    User.clerk_id == clerk_id
+                )
+            )
+        ).first()
+        if not row:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="User not found. "
+            )
+        user = AuthUser(
+            id=row.id,
+            clerk_id=clerk_id,
+            is_active=row.is_active,
+            is_superuser=row.is_superuser,
         )
+        user_cache.put(user)
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="User is deactivated"
@@ -95,4 +141,4 @@ def get_current_user(token_payload: ClerkTokenDep, session: SessionDep) -> User:
     return user
 
 
-CurrentUserDep = Annotated[User, Depends(get_current_user)]
+CurrentUserDep = Annotated[AuthUser, Depends(get_current_user)]
@@ -0,0 +1,71 @@
+from fastapi import Request, Response, status
+from sqlalchemy import Text, cast, literal, union_all
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.versions import TASK_COLLECTION, CollectionVersion, task_version
+
+ETAG_HEADERS = {"Cache-Control": "private, no-cache"}
+
+
+async def read_versions(session: AsyncSession) -> dict[str, str]:
+    """Read the version of every collection, in one statement."""
+    statement = union_all(
+        select(CollectionVersion.name, cast(CollectionVersion.version, Text)),
+        select(literal(TASK_COLLECTION), task_version()),
+    )
+    rows = (await session.exec(statement)).all()  # type: ignore
+    return {name: version for name, version in rows}
+
+
+def make_etag(*parts: object) -> str:
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+async def collection_etag(session: AsyncSession, *collections: str) -> str:
+    """Strong ETag derived from the current version of `collections`."""
+    versions = await read_versions(session)
+    return make_etag(*(versions.get(name, 0) for name in collections))
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check the request's If-None-Match header against `etag`."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = (tag.strip().removeprefix("W/") for tag in header.split(","))
+    return etag in candidates
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, **ETAG_HEADERS},
+    )
+
+
+def etag_headers(etag: str) -> dict[str, str]:
+    return {"ETag": etag, **ETAG_HEADERS}
+
+
+def if_match_versions(request: Request) -> list[int] | None:
+    """
+    Versions the request's If-Match header allows, for optimistic updates.
+
+    Entity tags are versions, e.g. `"3"`. Weak tags never match, as required
+    for If-Match, and neither do tags that aren't versions.
+
+    Returns:
+        None if the header is missing or `*`, the allowed versions otherwise.
+    """
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        value = tag.strip().removeprefix('"').removesuffix('"')
+        if value.isdigit():
+            versions.append(int(value))
+    return versions
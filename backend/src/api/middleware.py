@@ -0,0 +1,121 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import REQUEST_DURATION, REQUESTS, REQUESTS_IN_PROGRESS
+from src.core.query_stats import QueryStats, current_query_stats
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    Record the latency and status of each request, per route template.
+
+    Requests matching no route are recorded under "unmatched", so that
+    unknown paths can't create new series. Streaming responses, such as
+    server-sent events, count until the stream ends.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # Label children, looked up once per series rather than per request.
+        self.series: dict[tuple[str, str, int], tuple] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_PROGRESS.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            REQUESTS_IN_PROGRESS.dec()
+            # Set by the router on the scope it shares with middlewares.
+            route = scope.get("route")
+            key = (scope["method"], getattr(route, "path", "unmatched"), status_code)
+            series = self.series.get(key)
+            if series is None:
+                method, path, status = key
+                series = self.series[key] = (
+                    REQUEST_DURATION.labels(method, path),
+                    REQUESTS.labels(method, path, str(status)),
+                )
+            series[0].observe(duration)
+            series[1].inc()
+
+
+class QueryStatsMiddleware:
+    """
+    Report the database statements run by each request.
+
+    The count and total duration go into a `Server-Timing` header, and once
+    the response is sent, into a log line along with the slowest statement.
+    Statement shapes repeated at least `n_plus_one_threshold` times are
+    logged as possible N+1 queries.
+
+    Statements run after the response starts, such as those of streaming
+    responses, are only in the log line.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 0) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", stats.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self.log(scope, status_code, stats)
+
+    def log(self, scope: Scope, status_code: int, stats: QueryStats) -> None:
+        method, path = scope["method"], scope["path"]
+        logger.info(
+            "method=%s path=%s status=%d queries=%d db_ms=%.2f slowest_ms=%.2f "
+            "slowest=%r",
+            method,
+            path,
+            status_code,
+            stats.count,
+            stats.duration * 1000,
+            stats.slowest_duration * 1000,
+            stats.slowest_statement,
+        )
+        for shape, count in stats.repeated(self.n_plus_one_threshold):
+            logger.warning(
+                "Possible N+1 query: run %d times by %s %s: %s",
+                count,
+                method,
+                path,
+                shape,
+            )
@@ -0,0 +1,34 @@
+import base64
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from fastapi import HTTPException, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of the last returned row into an opaque cursor."""
+    raw = json.dumps([str(v) if not isinstance(v, int) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[Any], Any]]) -> tuple:
+    """
+    Decode a cursor produced by `encode_cursor`, converting each value with the
+    matching callable of `types`.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("Unexpected cursor shape")
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        ) from exc
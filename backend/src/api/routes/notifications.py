@@ -0,0 +1,58 @@
+from typing import Annotated
+
+from fastapi import APIRouter, HTTPException, Query, Response, status
+from sqlalchemy import func, update
+from sqlmodel import select
+
+from src.api.deps import AsyncSessionDep, CurrentUserDep
+from src.models.notifications import Notification, NotificationPublic
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+router = APIRouter(prefix="/notifications", tags=["notifications"])
+
+
+@router.get("/", response_model=list[NotificationPublic])
+async def read_notifications(
+    session: AsyncSessionDep,
+    current_user: CurrentUserDep,
+    unread: bool = False,
+    before: int | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    """
+    Notifications of the current user, newest first.
+
+    Pass the ID of the last notification received as `before` to get the
+    next page.
+    """
+    statement = (
+        select(Notification)
+        .where(Notification.user_id == current_user.id)
+        .order_by(Notification.id.desc())  # type: ignore
+        .limit(limit)
+    )
+    if unread:
+        statement = statement.where(Notification.read_at.is_(None))  # type: ignore
+    if before is not None:
+        statement = statement.where(Notification.id < before)
+    return (await session.exec(statement)).all()
+
+
+@router.post("/{notification_id}/read", status_code=status.HTTP_204_NO_CONTENT)
+async def mark_notification_read(
+    notification_id: int, session: AsyncSessionDep, current_user: CurrentUserDep
+):
+    statement = (
+        update(Notification)
+        .where(
+            Notification.id == notification_id,  # type: ignore
+            Notification.user_id == current_user.id,  # type: ignore
+        )
+        .values(read_at=func.coalesce(Notification.read_at, func.now()))
+    )
+    if not (await session.exec(statement)).rowcount:  # type: ignore
+        raise HTTPException(status_code=404, detail="Notification not found")
+    await session.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
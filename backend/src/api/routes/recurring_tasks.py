@@ -0,0 +1,84 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy import update
+from sqlmodel import select
+
+from src.api.deps import AsyncSessionDep, get_current_user
+from src.api.routes.tasks import (
+    find_missing_assignees,
+    select_written_tasks,
+    task_table,
+)
+from src.core.scheduler import materialize_recurring_tasks, recurring_task_scheduler
+from src.models.tasks import RecurringTask, RecurringTaskCreate, RecurringTaskPublic
+
+router = APIRouter(
+    prefix="/recurring-tasks",
+    tags=["recurring-task"],
+    dependencies=[Depends(get_current_user)],
+)
+
+
+@router.get("/", response_model=list[RecurringTaskPublic])
+async def read_recurring_tasks(session: AsyncSessionDep):
+    statement = select(RecurringTask).order_by(RecurringTask.id)  # type: ignore
+    return (await session.exec(statement)).all()
+
+
+@router.get("/{recurring_task_id}", response_model=RecurringTaskPublic)
+async def read_recurring_task(recurring_task_id: int, session: AsyncSessionDep):
+    recurring_task = await session.get(RecurringTask, recurring_task_id)
+    if not recurring_task:
+        raise HTTPException(status_code=404, detail="Recurring task not found")
+    return recurring_task
+
+
+@router.post("/", status_code=201, response_model=RecurringTaskPublic)
+async def create_recurring_task(
+    recurring_task_in: RecurringTaskCreate,
+    session: AsyncSessionDep,
+    today: date | None = None,
+):
+    """
+    Create a recurring task, and its occurrences due within the horizon.
+
+    Later occurrences are created by the scheduler as their due date gets
+    closer. `today` defaults to the server's date.
+    """
+    if await find_missing_assignees(session, [recurring_task_in]):
+        raise HTTPException(status_code=404, detail="Assignee not found")
+
+    recurring_task = RecurringTask.model_validate(recurring_task_in)
+    session.add(recurring_task)
+    await session.flush()
+    await materialize_recurring_tasks(
+        session,
+        today or date.today(),
+        recurring_task_scheduler.horizon_days,
+        [recurring_task.id],
+    )
+    await session.commit()
+    await session.refresh(recurring_task)
+    return recurring_task
+
+
+@router.delete("/{recurring_task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_recurring_task(recurring_task_id: int, session: AsyncSessionDep):
+    """Stop a task from recurring. Its existing occurrences are kept."""
+    recurring_task = await session.get(RecurringTask, recurring_task_id)
+    if not recurring_task:
+        raise HTTPException(status_code=404, detail="Recurring task not found")
+    # The foreign key would unlink the occurrences too, but behind the back of
+    # clients syncing changes.
+    unlinked = (
+        update(task_table)
+        .where(task_table.c.recurring_task_id == recurring_task_id)
+        .values(recurring_task_id=None)
+        .returning(*task_table.c)
+        .cte("written")
+    )
+    await session.exec(select_written_tasks(unlinked, "updated"))  # type: ignore
+    await session.delete(recurring_task)
+    await session.commit()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
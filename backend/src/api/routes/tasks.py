@@ -1,79 +1,843 @@
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+import asyncio
+import uuid
+from collections.abc import Sequence
+from datetime import date
+from typing import Annotated
+
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    Select,
+    Update,
+    delete,
+    func,
+    insert,
+    tuple_,
+    update,
+)
 from sqlalchemy.orm import selectinload
 from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.deps import AsyncSessionDep, CurrentUserDep, get_current_user
+from src.api.etag import (
+    collection_etag,
+    etag_headers,
+    if_match_versions,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+    read_versions,
+)
+from src.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from src.api.search import task_search
+from src.api.task_transfer import (
+    MEDIA_TYPES,
+    TaskImport,
+    TransferFormat,
+    export_chunks,
+    read_records,
+    select_export_rows,
+)
+from src.api.serializers import (
+    TASK_FIELDS,
+    ORJSONResponse,
+    select_task_rows,
+    task_row_to_dict,
+)
+from src.core.db import unnest_rows
+from src.core.events import (
+    task_change_notification,
+    task_events,
+)
+from src.core.outbox import json_object, queue_domain_events
+from src.notifications.outbox import queue_task_notifications
+from src.models.tasks import (
+    AssigneeTaskCounts,
+    CategoryTaskCounts,
+    Task,
+    TaskCategory,
+    TaskBulkDeleteResult,
+    TaskBulkResult,
+    TaskBulkUpdate,
+    TaskChanges,
+    TaskCounts,
+    TaskCreate,
+    TaskFilter,
+    TaskImportResult,
+    TaskPublic,
+    TaskStats,
+    TaskStatus,
+    TaskTemplate,
+    TaskTombstone,
+    TaskUpdate,
+    committed_xid_horizon,
+)
+from src.models.notifications import NotificationKind
+from src.models.users import User
+from src.models.versions import TASK_COLLECTION, USER_COLLECTION
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+EVENTS_KEEPALIVE_SECONDS = 15
+MAX_BULK_SIZE = 500
+MAX_SEARCH_LENGTH = 200
+
+# Values of GROUPING(status, category, assignee_id) in the stats query, telling
+# which grouping set a row belongs to: a bit is set for each column rolled up.
+STATS_BY_STATUS = 0b011
+STATS_BY_CATEGORY = 0b101
+STATS_BY_ASSIGNEE = 0b110
+STATS_TOTAL = 0b111
 
-from src.api.deps import SessionDep, get_current_user
-from src.models.tasks import Task, TaskCategory, TaskCreate, TaskPublic, TaskUpdate
+task_table = Task.__table__  # type: ignore
+tombstone_table = TaskTombstone.__table__  # type: ignore
 
 router = APIRouter(
     prefix="/tasks", tags=["task"], dependencies=[Depends(get_current_user)]
 )
 
 
+def filter_tasks(statement: Select, filters: TaskFilter) -> Select:
+    if filters.status is not None:
+        statement = statement.where(Task.status == filters.status)
+    if filters.category is not None:
+        statement = statement.where(Task.category == filters.category)
+    if filters.assignee_id is not None:
+        statement = statement.where(Task.assignee_id == filters.assignee_id)
+    if filters.due_from is not None:
+        statement = statement.where(Task.due_date >= filters.due_from)
+    if filters.due_to is not None:
+        statement = statement.where(Task.due_date <= filters.due_to)
+    return statement
+
+
 @router.get("/", response_model=list[TaskPublic])
-def read_tasks(session: SessionDep):
-    statement = select(Task).options(selectinload(Task.assignee))  # type: ignore
-    tasks = session.exec(statement).all()
-    return tasks
+async def read_tasks(
+    request: Request,
+    session: AsyncSessionDep,
+    filters: Annotated[TaskFilter, Depends()],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    """
+    Return tasks ordered by (due_date, id), one page at a time.
+
+    When more tasks match, the `X-Next-Cursor` response header holds the cursor
+    to pass back for the next page.
+    """
+    # Tasks embed their assignee, so user changes invalidate them too.
+    etag = await collection_etag(session, TASK_COLLECTION, USER_COLLECTION)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    statement = (
+        filter_tasks(select_task_rows(), filters)
+        .order_by(Task.due_date, Task.id)  # type: ignore
+        .limit(limit + 1)
+    )
+    if cursor:
+        due_date, task_id = decode_cursor(cursor, (date.fromisoformat, int))
+        statement = statement.where(
+            tuple_(Task.due_date, Task.id) > tuple_(due_date, task_id)
+        )
+
+    rows = (await session.exec(statement)).all()  # type: ignore
+    headers = etag_headers(etag)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor((last.due_date, last.id))
+    # Rows come straight from the database: skip response_model validation.
+    return ORJSONResponse([task_row_to_dict(row) for row in rows], headers=headers)
+
+
+@router.get("/search", response_model=list[TaskPublic])
+async def search_tasks(
+    session: AsyncSessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=MAX_SEARCH_LENGTH)],
+    filters: Annotated[TaskFilter, Depends()],
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    """
+    Return the tasks matching `q` in their title or description, best first.
+
+    Results come one page at a time, like `GET /tasks/`: the `X-Next-Cursor`
+    response header holds the cursor of the next page, if any.
+    """
+    search = await task_search(session, q)
+    if search is None:
+        return ORJSONResponse([])
+    condition, rank = search
+
+    statement = (
+        filter_tasks(select_task_rows(), filters)
+        .add_columns(rank.label("rank"))
+        .where(condition)
+        .order_by(rank.desc(), Task.id.desc())  # type: ignore
+        .limit(limit + 1)
+    )
+    if cursor:
+        last_rank, task_id = decode_cursor(cursor, (float, int))
+        statement = statement.where(tuple_(rank, Task.id) < tuple_(last_rank, task_id))
+
+    rows = (await session.exec(statement)).all()  # type: ignore
+    headers = {}
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor((last.rank, last.id))
+    return ORJSONResponse([task_row_to_dict(row) for row in rows], headers=headers)
+
+
+@router.get("/stats", response_model=TaskStats)
+async def read_task_stats(
+    request: Request,
+    session: AsyncSessionDep,
+    filters: Annotated[TaskFilter, Depends()],
+    today: date | None = None,
+):
+    """
+    Return task counts per status, category and assignee, in a single query.
+
+    Tasks are overdue when they aren't completed and were due before
+    `today`, which defaults to the server's date: clients in other time
+    zones should pass their own.
+    """
+    today = today or date.today()
+    versions = await read_versions(session)
+    etag = make_etag(versions.get(TASK_COLLECTION, 0), today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    completed = Task.status == TaskStatus.COMPLETED
+    statement = filter_tasks(
+        select(
+            func.grouping(Task.status, Task.category, Task.assignee_id).label(
+                "grouping"
+            ),
+            Task.status,
+            Task.category,
+            Task.assignee_id,
+            func.count().label("total"),
+            func.count().filter(completed).label("completed"),
+            func.count().filter(~completed & (Task.due_date < today)).label("overdue"),
+        ).group_by(
+            func.grouping_sets(Task.status, Task.category, Task.assignee_id, tuple_())
+        ),
+        filters,
+    )
+    rows = (await session.exec(statement)).all()  # type: ignore
+
+    stats = TaskStats(
+        counts=TaskCounts(),
+        by_status={task_status: 0 for task_status in TaskStatus},
+        by_category=[],
+        by_assignee=[],
+    )
+    for row in rows:
+        counts = {
+            "total": row.total,
+            "completed": row.completed,
+            "overdue": row.overdue,
+        }
+        if row.grouping == STATS_TOTAL:
+            stats.counts = TaskCounts(**counts)
+        elif row.grouping == STATS_BY_STATUS:
+            stats.by_status[row.status] = row.total
+        elif row.grouping == STATS_BY_CATEGORY:
+            stats.by_category.append(
+                CategoryTaskCounts(category=row.category, **counts)
+            )
+        elif row.grouping == STATS_BY_ASSIGNEE:
+            stats.by_assignee.append(
+                AssigneeTaskCounts(assignee_id=row.assignee_id, **counts)
+            )
+    stats.by_category.sort(key=lambda counts: list(TaskCategory).index(counts.category))
+    stats.by_assignee.sort(key=lambda counts: counts.total, reverse=True)
+    return ORJSONResponse(stats.model_dump(mode="json"), headers=etag_headers(etag))
 
 
 @router.get("/category")
-def read_categories(session: SessionDep):
+async def read_categories():
     return [c.value for c in TaskCategory]
 
 
+@router.get("/changes", response_model=TaskChanges)
+async def read_task_changes(
+    session: AsyncSessionDep,
+    since: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=MAX_PAGE_SIZE)] = DEFAULT_PAGE_SIZE,
+):
+    """
+    Return tasks created, updated or deleted after the `since` cursor.
+
+    Start without `since` (every task), then pass the returned `cursor` back;
+    repeat immediately while `has_more` is true.
+
+    Changes are walked in (writing transaction, sequence) order, and only up
+    to the oldest transaction still running: a change committed late by a
+    long transaction is held back, with everything after it, rather than
+    passed by the cursor and never returned.
+    """
+    after = decode_cursor(since, (int, int)) if since is not None else (0, 0)
+    horizon = (await session.exec(select(committed_xid_horizon()))).one()
+    changed_statement = (
+        select(Task)
+        .options(selectinload(Task.assignee))  # type: ignore
+        .where(
+            tuple_(Task.change_xid, Task.change_seq) > tuple_(*after),
+            Task.change_xid < horizon,
+        )
+        .order_by(Task.change_xid, Task.change_seq)  # type: ignore
+        .limit(limit + 1)
+    )
+    deleted_statement = (
+        select(TaskTombstone)
+        .where(
+            tuple_(TaskTombstone.change_xid, TaskTombstone.change_seq) > tuple_(*after),
+            TaskTombstone.change_xid < horizon,
+        )
+        .order_by(TaskTombstone.change_xid, TaskTombstone.change_seq)  # type: ignore
+        .limit(limit + 1)
+    )
+    changed = (await session.exec(changed_statement)).all()
+    deleted = (await session.exec(deleted_statement)).all()
+
+    events = sorted(
+        [*changed, *deleted], key=lambda row: (row.change_xid, row.change_seq)
+    )[:limit]
+    if events:
+        after = (events[-1].change_xid, events[-1].change_seq)
+    return TaskChanges(
+        tasks=[row for row in events if isinstance(row, Task)],
+        deleted=[row.task_id for row in events if isinstance(row, TaskTombstone)],
+        cursor=encode_cursor(after),
+        has_more=len(changed) + len(deleted) > limit,
+    )
+
+
+@router.get("/events")
+async def stream_task_events(session: AsyncSessionDep):
+    """
+    Server-sent events stream announcing task changes made by anyone.
+
+    Each event's data is `{"op", "task_id", "change_seq"}`; clients apply them
+    by calling `GET /tasks/changes` with their last cursor. Imports, and
+    the creation of recurring task occurrences, send a single event with op
+    "imported" or "materialized" and no task ID.
+    """
+    # The session was only needed to authenticate the user: hand its
+    # connection back to the pool before the long-lived stream starts.
+    await session.close()
+
+    async def event_stream():
+        async with task_events.subscribe() as queue:
+            while True:
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=EVENTS_KEEPALIVE_SECONDS
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: task\ndata: {message}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/export")
+async def export_tasks(
+    session: AsyncSessionDep,
+    filters: Annotated[TaskFilter, Depends()],
+    format: TransferFormat = "ndjson",
+):
+    """
+    Stream every task matching the filters, ordered by ID, as NDJSON or CSV.
+
+    The output can be loaded back with `POST /tasks/import`.
+    """
+    # As for the event stream, the export reads through a session of its own.
+    await session.close()
+    statement = filter_tasks(select_export_rows(), filters).order_by(Task.id)
+    return StreamingResponse(
+        export_chunks(statement, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
+
+
+@router.post("/import", response_model=TaskImportResult)
+async def import_tasks(
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentUserDep,
+    format: TransferFormat = "ndjson",
+):
+    """
+    Create the tasks of an NDJSON or CSV upload, as produced by the export.
+
+    The body is read as it arrives and loaded with COPY in batches, in one
+    transaction. Records are validated like `POST /tasks/`; invalid ones are
+    skipped and reported in `errors` by their position in the upload, the
+    others are created regardless. Columns other than those of `TaskCreate`,
+    such as exported IDs, are ignored.
+    """
+    task_import = TaskImport(session, actor_id=current_user.id)
+    index = 0
+    try:
+        async for record in read_records(request.stream(), format):
+            await task_import.add(index, record)
+            index += 1
+    except UnicodeDecodeError:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Upload must be UTF-8")
+    await task_import.finish()
+    return ORJSONResponse(
+        {
+            "imported": task_import.imported,
+            "skipped": task_import.skipped,
+            "errors": task_import.errors,
+        }
+    )
+
+
+def select_written_tasks(written: CTE, op: str) -> Select:
+    """
+    Complete a write with the `TaskPublic` rows of the tasks it wrote.
+
+    `written` is an INSERT or UPDATE returning every task column. The
+    resulting statement also queues the change notifications and the
+    `task.<op>` domain events, so that the whole write is a single round
+    trip.
+    """
+    return (
+        select_task_rows(written)
+        .add_columns(task_change_notification(op, written.c.id, written.c.change_seq))
+        .add_cte(
+            queue_domain_events(
+                written,
+                "task",
+                f"task.{op}",
+                written.c.id,
+                json_object(written, TASK_FIELDS),
+            )
+        )
+        .order_by(written.c.id)
+    )
+
+
+def returning_previous_assignee(statement: Update) -> Update:
+    """
+    Make an UPDATE of tasks also return their assignee before the update.
+
+    The value is read from a self-join, which sees the rows as they were
+    when the statement started, as `previous_assignee_id`.
+    """
+    previous = task_table.alias("previous")
+    return statement.where(previous.c.id == task_table.c.id).returning(
+        previous.c.assignee_id.label("previous_assignee_id")
+    )
+
+
+def queue_unassigned_notifications(
+    written: CTE, actor_id: uuid.UUID, created: bool
+) -> CTE:
+    """
+    Queue notifications for the tasks of `written` left without assignee.
+
+    Created tasks are matched when they have no assignee, updated ones when
+    they lost theirs (see `returning_previous_assignee`).
+    """
+    if created:
+        return queue_task_notifications(
+            written,
+            NotificationKind.TASK_CREATED_UNASSIGNED,
+            actor_id,
+            written.c.assignee_id.is_(None),
+        )
+    return queue_task_notifications(
+        written,
+        NotificationKind.TASK_UNASSIGNED,
+        actor_id,
+        written.c.assignee_id.is_(None) & written.c.previous_assignee_id.is_not(None),
+    )
+
+
+def delete_tasks_returning_ids(condition: ColumnElement[bool]) -> Select:
+    """
+    Delete the tasks matching `condition`, returning their IDs.
+
+    Tombstones, change notifications and `task.deleted` domain events are
+    part of the same statement.
+    """
+    deleted = delete(task_table).where(condition).returning(task_table.c.id)
+    tombstone = (
+        insert(tombstone_table)
+        .from_select(["task_id"], select(deleted.cte("deleted").c.id))
+        .returning(tombstone_table.c.task_id, tombstone_table.c.change_seq)
+        .cte("tombstone")
+    )
+    queued = queue_domain_events(
+        tombstone,
+        "task",
+        "task.deleted",
+        tombstone.c.task_id,
+        func.jsonb_build_object("id", tombstone.c.task_id),
+    )
+    return select(
+        tombstone.c.task_id,
+        task_change_notification(
+            "deleted", tombstone.c.task_id, tombstone.c.change_seq
+        ),
+    ).add_cte(queued)
+
+
+async def find_missing_assignees(
+    session: AsyncSession, tasks_in: Sequence[TaskTemplate | TaskUpdate]
+) -> set[uuid.UUID]:
+    """Return the assignee IDs of `tasks_in` that match no user."""
+    wanted = {task.assignee_id for task in tasks_in if task.assignee_id is not None}
+    if not wanted:
+        return set()
+    statement = select(User.id).where(User.id.in_(wanted))  # type: ignore
+    return wanted - set((await session.exec(statement)).all())
+
+
+@router.post("/bulk", response_model=TaskBulkResult)
+async def create_tasks(
+    tasks_in: Annotated[list[TaskCreate], Body(max_length=MAX_BULK_SIZE)],
+    session: AsyncSessionDep,
+    current_user: CurrentUserDep,
+):
+    """
+    Create several tasks in one transaction, with a single multi-row INSERT.
+
+    Items that can't be created are reported in `errors` by their index in
+    the request body; the other items are created regardless.
+    """
+    errors = []
+    rows = []
+    missing_assignees = await find_missing_assignees(session, tasks_in)
+    for index, task_in in enumerate(tasks_in):
+        if task_in.assignee_id in missing_assignees:
+            errors.append({"index": index, "detail": "Assignee not found"})
+        else:
+            rows.append(task_in.model_dump())
+
+    tasks = []
+    if rows:
+        names = list(rows[0])
+        data = unnest_rows(task_table, names, rows)
+        written = (
+            insert(task_table)
+            .from_select(names, select(*(data.c[name] for name in names)))
+            .returning(*task_table.c)
+            .cte("written")
+        )
+        # IDs are drawn in array order: ordering by ID keeps the body's order.
+        statement = select_written_tasks(written, "created").add_cte(
+            queue_unassigned_notifications(written, current_user.id, created=True)
+        )
+        tasks = [task_row_to_dict(row) for row in await session.exec(statement)]  # type: ignore
+        await session.commit()
+
+    return ORJSONResponse({"tasks": tasks, "errors": errors})
+
+
+@router.patch("/bulk", response_model=TaskBulkResult)
+async def update_tasks(
+    tasks_in: Annotated[list[TaskBulkUpdate], Body(max_length=MAX_BULK_SIZE)],
+    session: AsyncSessionDep,
+    current_user: CurrentUserDep,
+):
+    """
+    Update several tasks in one transaction.
+
+    Items setting the same fields are applied together by a single
+    `UPDATE ... FROM unnest(...)`. Items that can't be applied are reported
+    in `errors` by their index in the request body; the other items are
+    applied regardless. Like `PATCH /tasks/{id}`, an item with a `version`
+    is only applied if the task is still at that version.
+    """
+    errors = []
+    seen: set[int] = set()
+    accepted: list[tuple[int, int]] = []  # (index, task ID) of valid items
+    versions: dict[int, int] = {}  # Version each item is based on, if given
+    groups: dict[tuple[str, ...], list[tuple[int, dict]]] = {}
+    missing_assignees = await find_missing_assignees(session, tasks_in)
+    for index, task_in in enumerate(tasks_in):
+        changes = task_in.model_dump(exclude_unset=True, exclude={"id", "version"})
+        null_field = next(
+            (
+                name
+                for name, value in changes.items()
+                if value is None and not task_table.c[name].nullable
+            ),
+            None,
+        )
+        if task_in.id in seen:
+            errors.append({"index": index, "detail": "Duplicate task ID"})
+        elif null_field:
+            errors.append({"index": index, "detail": f"{null_field} cannot be null"})
+        elif "assignee_id" in changes and task_in.assignee_id in missing_assignees:
+            errors.append({"index": index, "detail": "Assignee not found"})
+        else:
+            seen.add(task_in.id)
+            accepted.append((index, task_in.id))
+            if task_in.version is not None:
+                versions[task_in.id] = task_in.version
+            if changes:
+                groups.setdefault(tuple(sorted(changes)), []).append(
+                    (task_in.id, changes)
+                )
+
+    tasks: dict[int, dict] = {}
+    for fields, items in groups.items():
+        data = unnest_rows(
+            task_table,
+            ("id", "version", *fields),
+            [
+                {"id": task_id, "version": versions.get(task_id), **changes}
+                for task_id, changes in items
+            ],
+        )
+        written = (
+            update(task_table)
+            .where(
+                task_table.c.id == data.c.id,
+                # Items without a version match any.
+                task_table.c.version
+                == func.coalesce(data.c.version, task_table.c.version),
+            )
+            .values({name: data.c[name] for name in fields})
+            .returning(*task_table.c)
+        )
+        if "assignee_id" in fields:
+            written = returning_previous_assignee(written).cte("written")
+            statement = select_written_tasks(written, "updated").add_cte(
+                queue_unassigned_notifications(written, current_user.id, created=False)
+            )
+        else:
+            written = written.cte("written")
+            statement = select_written_tasks(written, "updated")
+        for row in await session.exec(statement):  # type: ignore
+            tasks[row.id] = task_row_to_dict(row)
+
+    # Items without changes, missing tasks and version conflicts still need
+    # to be looked up.
+    conflicts: dict[int, int] = {}  # Current version of conflicting tasks
+    unchecked = {task_id for _, task_id in accepted} - tasks.keys()
+    if unchecked:
+        statement = select_task_rows().where(Task.id.in_(unchecked))  # type: ignore
+        for row in await session.exec(statement):  # type: ignore
+            task = task_row_to_dict(row)
+            if versions.get(row.id, task["version"]) != task["version"]:
+                conflicts[row.id] = task["version"]
+            else:
+                tasks[row.id] = task
+
+    for index, task_id in accepted:
+        if task_id in conflicts:
+            errors.append(
+                {
+                    "index": index,
+                    "detail": "Task has been updated since, it is at version "
+                    f"{conflicts[task_id]}",
+                }
+            )
+        elif task_id not in tasks:
+            errors.append({"index": index, "detail": "Task not found"})
+    errors.sort(key=lambda error: error["index"])
+
+    if tasks:
+        await session.commit()
+
+    return ORJSONResponse(
+        {
+            "tasks": [tasks[task_id] for _, task_id in accepted if task_id in tasks],
+            "errors": errors,
+        }
+    )
+
+
+@router.delete("/bulk", response_model=TaskBulkDeleteResult)
+async def delete_tasks(
+    task_ids: Annotated[list[int], Body(max_length=MAX_BULK_SIZE)],
+    session: AsyncSessionDep,
+):
+    """
+    Delete several tasks in one transaction, with a single DELETE.
+
+    IDs that can't be deleted are reported in `errors` by their index in the
+    request body; the other tasks are deleted regardless.
+    """
+    errors = []
+    unique_ids = list(dict.fromkeys(task_ids))
+
+    deleted: set[int] = set()
+    if unique_ids:
+        statement = delete_tasks_returning_ids(task_table.c.id.in_(unique_ids))
+        deleted = {row.task_id for row in await session.exec(statement)}  # type: ignore
+
+    seen: set[int] = set()
+    for index, task_id in enumerate(task_ids):
+        if task_id in seen:
+            errors.append({"index": index, "detail": "Duplicate task ID"})
+        elif task_id not in deleted:
+            errors.append({"index": index, "detail": "Task not found"})
+        seen.add(task_id)
+
+    if deleted:
+        await session.commit()
+
+    return ORJSONResponse(
+        {
+            "deleted": [task_id for task_id in unique_ids if task_id in deleted],
+            "errors": errors,
+        }
+    )
+
+
 @router.get("/{task_id}", response_model=TaskPublic)
-def read_task(*, task_id: int, session: SessionDep):
+async def read_task(
+    *, task_id: int, request: Request, response: Response, session: AsyncSessionDep
+):
+    """
+    Read a task, tagged with its version: `ETag: "<version>"`.
+
+    The tag can be sent back as `If-Match` to update the task only if it is
+    still at that version, or as `If-None-Match` to revalidate it. It
+    versions the task's own fields: renaming its assignee doesn't change it.
+    """
     statement = (
         select(Task).options(selectinload(Task.assignee)).where(Task.id == task_id)  # type: ignore
     )
-    task = session.exec(statement).first()  # Add eager loading
+    task = (await session.exec(statement)).first()  # Add eager loading
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    etag = make_etag(task.version)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(etag_headers(etag))
     return task
 
 
 @router.post("/", status_code=201, response_model=TaskPublic)
-def create_task(task_in: TaskCreate, session: SessionDep):
-    task = Task.model_validate(task_in)
-    session.add(task)
-    session.commit()
-    session.refresh(task)
-
-    statement = (
-        select(Task).options(selectinload(Task.assignee)).where(Task.id == task.id)  # type: ignore
+async def create_task(
+    task_in: TaskCreate, session: AsyncSessionDep, current_user: CurrentUserDep
+):
+    written = (
+        insert(task_table)
+        .values(**task_in.model_dump())
+        .returning(*task_table.c)
+        .cte("written")
     )
-    task = session.exec(statement).first()
-
-    return task
+    statement = select_written_tasks(written, "created").add_cte(
+        queue_unassigned_notifications(written, current_user.id, created=True)
+    )
+    row = (await session.exec(statement)).one()  # type: ignore
+    await session.commit()
+    return ORJSONResponse(task_row_to_dict(row), status_code=201)
 
 
 @router.patch("/{task_id}", response_model=TaskPublic)
-def update_task(*, task_id: int, task_in: TaskUpdate, session: SessionDep):
-    db_task = session.get(Task, task_id)
-    if not db_task:
-        raise HTTPException(status_code=404, detail="Task not found")
+async def update_task(
+    *,
+    task_id: int,
+    task_in: TaskUpdate,
+    request: Request,
+    session: AsyncSessionDep,
+    current_user: CurrentUserDep,
+):
+    """
+    Update a task, optionally only if it is still at a given version.
 
-    update_data = task_in.model_dump(exclude_unset=True)
-    db_task.sqlmodel_update(update_data)
-    session.add(db_task)
-    session.commit()
-    session.refresh(db_task)
+    The version the changes are based on is taken from the `version` field,
+    or from an `If-Match: "<version>"` header, e.g. the `ETag` of
+    `GET /tasks/{task_id}`. The check is part of the UPDATE itself
+    (`WHERE id = :id AND version = :version`): of concurrent updates based
+    on the same version, only the first to commit succeeds, without any lock
+    being taken besides the one on the updated row. The others get a 412
+    Precondition Failed when `If-Match` no longer matches, a 409 Conflict
+    when `version` is stale. The updated task is tagged with its new version.
+    """
+    update_data = task_in.model_dump(exclude_unset=True, exclude={"version"})
+    if_match = versions = if_match_versions(request)
+    if task_in.version is not None:
+        # Both given: they must agree.
+        if if_match is None or task_in.version in if_match:
+            versions = [task_in.version]
+        else:
+            versions = []
+    condition = task_table.c.id == task_id
+    if versions is not None:
+        condition &= task_table.c.version.in_(versions)
 
-    # Add eager loading
-    statement = (
-        select(Task).options(selectinload(Task.assignee)).where(Task.id == task_id)  # type: ignore
-    )  # type: ignore
-    db_task = session.exec(statement).first()
-    return db_task
+    if "assignee_id" in update_data:
+        written = returning_previous_assignee(
+            update(task_table)
+            .where(condition)
+            .values(**update_data)
+            .returning(*task_table.c)
+        ).cte("written")
+        statement = select_written_tasks(written, "updated").add_cte(
+            queue_unassigned_notifications(written, current_user.id, created=False)
+        )
+    elif update_data:
+        written = (
+            update(task_table)
+            .where(condition)
+            .values(**update_data)
+            .returning(*task_table.c)
+            .cte("written")
+        )
+        statement = select_written_tasks(written, "updated")
+    else:
+        statement = select_task_rows().where(condition)
+
+    row = (await session.exec(statement)).first()  # type: ignore
+    if not row:
+        # Only failed conditional updates need telling a conflict apart.
+        current = None
+        if versions is not None:
+            current = (
+                await session.exec(select(Task.version).where(Task.id == task_id))
+            ).first()
+        if current is not None:
+            raise HTTPException(
+                status_code=(
+                    status.HTTP_412_PRECONDITION_FAILED
+                    if if_match is not None and current not in if_match
+                    else status.HTTP_409_CONFLICT
+                ),
+                detail=f"Task has been updated since, it is at version {current}",
+            )
+        raise HTTPException(status_code=404, detail="Task not found")
+    await session.commit()
+    task = task_row_to_dict(row)
+    return ORJSONResponse(task, headers=etag_headers(make_etag(task["version"])))
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(*, task_id: int, session: SessionDep):
-    task = session.get(Task, task_id)
-    if not task:
+async def delete_task(*, task_id: int, session: AsyncSessionDep):
+    statement = delete_tasks_returning_ids(task_table.c.id == task_id)
+    if not (await session.exec(statement)).first():  # type: ignore
         raise HTTPException(status_code=404, detail="Task not found")
-
-    session.delete(task)
-    session.commit()
+    await session.commit()
     return Response(status_code=status.HTTP_204_NO_CONTENT)
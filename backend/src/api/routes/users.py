@@ -1,56 +1,117 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import delete, func, insert
 from sqlmodel import select
 
-from src.api.deps import SessionDep, get_current_user
-from src.models.users import User, UserCreate
+from src.api.deps import AsyncSessionDep, get_current_user
+from src.api.etag import (
+    collection_etag,
+    etag_headers,
+    is_not_modified,
+    not_modified_response,
+)
+from src.api.serializers import (
+    USER_FIELDS,
+    ORJSONResponse,
+    select_user_rows,
+    user_rows_to_dicts,
+)
+from src.core.outbox import json_object, queue_domain_events
+from src.core.user_cache import invalidation_notify, shared_invalidation, user_cache
+from src.models.users import User, UserCreate, UserPublic
+from src.models.versions import USER_COLLECTION, bump_versions
+
+user_table = User.__table__  # type: ignore
 
 router = APIRouter(
     prefix="/users", tags=["users"], dependencies=[Depends(get_current_user)]
 )
 
 
-@router.get("/")
-def read_users(session: SessionDep, response_model=list[User]):
-    users = session.exec(select(User)).all()
-    return users
+@router.get("/", response_model=list[UserPublic])
+async def read_users(request: Request, session: AsyncSessionDep):
+    etag = await collection_etag(session, USER_COLLECTION)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    rows = (await session.exec(select_user_rows())).all()  # type: ignore
+    # Rows come straight from the database: skip response_model validation.
+    return ORJSONResponse(user_rows_to_dicts(rows), headers=etag_headers(etag))
 
 
 @router.get("/{user_id}")
-def read_user(*, user_id: uuid.UUID, session: SessionDep):
-    user = session.get(User, user_id)
+async def read_user(
+    *,
+    user_id: uuid.UUID,
+    request: Request,
+    response: Response,
+    session: AsyncSessionDep,
+):
+    etag = await collection_etag(session, USER_COLLECTION)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    user = await session.get(User, user_id)
+    response.headers.update(etag_headers(etag))
     return user
 
 
 @router.post("/", status_code=201)
-def create_user(user_in: UserCreate, session: SessionDep):
+async def create_user(user_in: UserCreate, session: AsyncSessionDep):
     # Check if user with the same email already exists
-    existing_user = session.exec(
-        select(User).where(User.email == user_in.email)
+    existing_user = (
+        await session.exec(select(User).where(User.email == user_in.email))
     ).first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
-    # Create new user
-    user = User(
-        email=user_in.email,
-        full_name=user_in.full_name,
-        is_active=user_in.is_active,
-        is_superuser=user_in.is_superuser,
-        hashed_password=user_in.password,  # TODO: Hash the password properly
+    # Create new user, queuing its domain event in the same statement
+    written = (
+        insert(user_table)
+        # Passwords are handled by Clerk: there is no column for them.
+        .values(id=uuid.uuid4(), **user_in.model_dump(exclude={"password"}))
+        .returning(*user_table.c)
+        .cte("written")
     )
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    return user
+    statement = select(*written.c).add_cte(
+        queue_domain_events(
+            written,
+            "user",
+            "user.created",
+            written.c.id,
+            json_object(written, USER_FIELDS),
+        )
+    )
+    row = (await session.exec(statement)).one()  # type: ignore
+    await session.exec(bump_versions(USER_COLLECTION))
+    await session.commit()
+    return User.model_validate(row._mapping)
 
 
 @router.delete("/{user_id}")
-def delete_user(user_id: str, session: SessionDep):
-    user = session.get(User, user_id)
-    if not user:
+async def delete_user(user_id: uuid.UUID, session: AsyncSessionDep):
+    deleted = (
+        delete(user_table)
+        .where(user_table.c.id == user_id)
+        .returning(user_table.c.id, user_table.c.clerk_id)
+        .cte("deleted")
+    )
+    statement = select(deleted.c.clerk_id).add_cte(
+        queue_domain_events(
+            deleted,
+            "user",
+            "user.deleted",
+            deleted.c.id,
+            func.jsonb_build_object("id", deleted.c.id),
+        )
+    )
+    clerk_id = (await session.exec(statement)).first()  # type: ignore
+    if clerk_id is None:
         raise HTTPException(status_code=404, detail="User not found")
-    session.delete(user)
-    session.commit()
+    await session.exec(bump_versions(USER_COLLECTION))
+    if shared_invalidation():
+        await session.exec(invalidation_notify(clerk_id))  # type: ignore
+    await session.commit()
+    user_cache.invalidate(clerk_id)
     return {"ok": True}
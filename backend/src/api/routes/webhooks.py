@@ -1,22 +1,24 @@
 import json
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 from svix import Webhook, WebhookVerificationError
 
-from src.api.deps import SessionDep
+from src.api.deps import AsyncSessionDep
 from src.core.config import settings
-from src.webhooks.handlers import (
-    WebhookDataError,
-    handle_user_created,
-    handle_user_deleted,
-    handle_user_updated,
-)
+from src.core.metrics import record_webhook_events
+from src.webhooks.inbox import store_event, webhook_inbox_worker
 
 router = APIRouter(prefix="/webhooks", tags=["webhooks"])
 
 
-@router.post("/clerk")
-async def clerk_webhook(request: Request, session: SessionDep):
+@router.post("/clerk", status_code=status.HTTP_202_ACCEPTED)
+async def clerk_webhook(request: Request, session: AsyncSessionDep):
+    """
+    Verify a Clerk event and queue it in the webhook inbox.
+
+    The event is applied shortly after by the inbox worker. Redeliveries of
+    an event (same `svix-id`) are accepted but stored only once.
+    """
     payload = await request.body()
 
     if settings.CLERK_WEBHOOK_SECRET_KEY:
@@ -24,22 +26,20 @@ async def clerk_webhook(request: Request, session: SessionDep):
             wh = Webhook(settings.CLERK_WEBHOOK_SECRET_KEY)
             event = wh.verify(payload, dict(request.headers))
         except WebhookVerificationError:
+            record_webhook_events([""], "rejected")
             raise HTTPException(status.HTTP_400_BAD_REQUEST, "Invalid signature")
     else:
         event = json.loads(payload)
 
-    event_type = event.get("type")
-    user_data = event.get("data")
-
-    try:
-        if event_type == "user.created":
-            handle_user_created(session, user_data)
-        elif event_type == "user.updated":
-            handle_user_updated(session, user_data)
-        elif event_type == "user.deleted":
-            handle_user_deleted(session, user_data)
-    except WebhookDataError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e),
-        )
+    svix_id = request.headers.get("svix-id")
+    if not svix_id:
+        raise HTTPException(status.HTTP_400_BAD_REQUEST, "Missing svix-id header")
+
+    stored = await store_event(session, svix_id, event)
+    await session.commit()
+    record_webhook_events(
+        [event.get("type", "")], "received" if stored else "duplicate"
+    )
+    # Other workers are woken up by the notification sent on commit.
+    webhook_inbox_worker.wake()
+    return Response(status_code=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,71 @@
+"""
+Task search: full-text matching, plus typo-tolerant title matching where the
+trigram index exists (see the `add task search` migration).
+"""
+
+import re
+
+from sqlalchemy import REAL, ColumnElement, func, literal, literal_column, or_, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.tasks import TASK_SEARCH_CONFIG, TASK_TITLE_TRIGRAM_INDEX, Task
+
+_WORD = re.compile(r"\w+")
+
+# Whether the trigram index exists, looked up by the first search.
+_trigram_index: bool | None = None
+
+
+def prefix_tsquery(q: str) -> str | None:
+    """
+    Turn free text into a tsquery matching every word of it as a prefix.
+
+    Only word characters are kept, so the result is always a valid tsquery.
+
+    Returns:
+        The tsquery, or None if `q` has no words.
+    """
+    return " & ".join(f"{word}:*" for word in _WORD.findall(q)) or None
+
+
+async def has_trigram_index(session: AsyncSession) -> bool:
+    global _trigram_index
+    if _trigram_index is None:
+        statement = text("SELECT to_regclass(:name) IS NOT NULL").bindparams(
+            name=TASK_TITLE_TRIGRAM_INDEX
+        )
+        _trigram_index = (await session.exec(statement)).scalar_one()  # type: ignore
+    return _trigram_index
+
+
+async def task_search(
+    session: AsyncSession, q: str
+) -> tuple[ColumnElement[bool], ColumnElement[float]] | None:
+    """
+    Build the condition matching tasks to `q`, and the rank to sort them by.
+
+    Every word of `q` must start a word of the title or description, e.g.
+    "groc" matches "Buy groceries"; title matches rank higher. With the
+    trigram index, titles containing a word close to `q` also match, such
+    as "Buy groceries" for "grocereis" (see `TASK_SEARCH_WORD_SIMILARITY`).
+
+    Returns:
+        The condition and the rank, or None if nothing can match.
+    """
+    conditions, ranks = [], []
+    tsquery = prefix_tsquery(q)
+    if tsquery is not None:
+        vector = Task.__table__.c.search_vector  # type: ignore
+        query = func.to_tsquery(
+            literal_column(f"'{TASK_SEARCH_CONFIG}'::regconfig"), tsquery
+        )
+        conditions.append(vector.op("@@")(query))
+        ranks.append(func.ts_rank_cd(vector, query, type_=REAL))
+    if await has_trigram_index(session):
+        # `<%` is the operator form of word_similarity() above its threshold,
+        # which the trigram index can serve.
+        conditions.append(literal(q).op("<%")(Task.title))
+        ranks.append(func.word_similarity(q, Task.title, type_=REAL))
+    if not conditions:
+        return None
+    return or_(*conditions), sum(ranks[1:], ranks[0])
@@ -0,0 +1,74 @@
+"""
+Direct serialization of trusted database rows for list endpoints.
+
+Rows are selected as plain columns (no ORM objects) and turned into dicts
+that orjson encodes natively, skipping the per-item Pydantic validation that
+`response_model` would otherwise do on data we just read from Postgres.
+"""
+
+import uuid
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import orjson
+from fastapi import responses
+from sqlalchemy import FromClause, Select, select
+
+from src.models.tasks import Task, TaskPublic
+from src.models.users import User, UserPublic
+
+TASK_FIELDS = tuple(name for name in TaskPublic.model_fields if name != "assignee")
+USER_FIELDS = tuple(UserPublic.model_fields)
+
+_ASSIGNEE_ID = TASK_FIELDS.index("assignee_id")
+_USER_OFFSET = len(TASK_FIELDS)
+
+
+def _default(obj: Any) -> Any:
+    # asyncpg returns its own uuid.UUID subclass, which orjson doesn't know.
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    raise TypeError
+
+
+class ORJSONResponse(responses.ORJSONResponse):
+    """`ORJSONResponse` that also encodes the driver's UUID type."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def select_task_rows(tasks: FromClause | None = None) -> Select:
+    """
+    Select the columns of `TaskPublic`, assignee included, in one query.
+
+    Args:
+        tasks: Where to read the task columns from, e.g. a CTE returning the
+            rows of an INSERT or UPDATE. Defaults to the task table.
+    """
+    if tasks is None:
+        tasks = Task.__table__  # type: ignore
+    return select(
+        *(tasks.c[name] for name in TASK_FIELDS),
+        *(getattr(User, name).label(f"assignee_{name}") for name in USER_FIELDS),
+    ).outerjoin(User, tasks.c.assignee_id == User.id)  # type: ignore
+
+
+def task_row_to_dict(row: Sequence[Any]) -> dict[str, Any]:
+    """Build the `TaskPublic` dict of a row from `select_task_rows`."""
+    task = dict(zip(TASK_FIELDS, row))
+    task["assignee"] = (
+        dict(zip(USER_FIELDS, row[_USER_OFFSET:]))
+        if row[_ASSIGNEE_ID] is not None
+        else None
+    )
+    return task
+
+
+def select_user_rows() -> Select:
+    """Select the columns of `UserPublic`."""
+    return select(*(getattr(User, name) for name in USER_FIELDS))
+
+
+def user_rows_to_dicts(rows: Iterable[Sequence[Any]]) -> list[dict[str, Any]]:
+    return [dict(zip(USER_FIELDS, row)) for row in rows]
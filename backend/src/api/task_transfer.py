@@ -0,0 +1,314 @@
+"""
+Streaming export and bulk import of tasks, as NDJSON or CSV.
+
+Exports read tasks through a server-side cursor and imports load them with
+COPY, through a staging table, both one batch at a time, so memory use
+doesn't grow with the number of tasks.
+"""
+
+import csv
+import io
+import uuid
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Literal
+
+import orjson
+from pydantic import ValidationError
+from sqlalchemy import Select, column, delete, func, insert, null, select, table, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.serializers import TASK_FIELDS
+from src.core.db import async_engine
+from src.core.events import task_change_notification
+from src.core.outbox import json_object, queue_domain_events
+from src.models.notifications import NotificationKind
+from src.models.tasks import Task, TaskCreate
+from src.models.users import User
+from src.notifications.outbox import queue_task_notifications
+
+TransferFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "assignee_id",
+    "category",
+    "due_date",
+    "status",
+    "updated_at",
+)
+IMPORT_FIELDS = (
+    "title",
+    "description",
+    "assignee_id",
+    "category",
+    "due_date",
+    "status",
+)
+EXPORT_BATCH_SIZE = 1_000
+IMPORT_BATCH_SIZE = 5_000
+MAX_IMPORT_ERRORS = 100
+
+task_table = Task.__table__  # type: ignore
+# Each batch is COPYed here, then moved to `task` by an INSERT that also
+# queues its domain events: COPY itself can't be part of a statement.
+staging_table = table("task_import", *(column(name) for name in IMPORT_FIELDS))
+
+
+def select_export_rows() -> Select:
+    return select(*(getattr(Task, name) for name in EXPORT_FIELDS))
+
+
+def csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+def format_rows(rows: Iterable[Sequence[Any]], fmt: TransferFormat) -> bytes:
+    if fmt == "ndjson":
+        # orjson encodes enums, dates and UUIDs; asyncpg's UUID subclass
+        # falls back to `str`.
+        return b"".join(
+            orjson.dumps(dict(zip(EXPORT_FIELDS, row)), default=str) + b"\n"
+            for row in rows
+        )
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows([csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode()
+
+
+async def export_chunks(
+    statement: Select, fmt: TransferFormat, batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield the rows of `statement`, from `select_export_rows`, formatted.
+
+    Rows are fetched `batch_size` at a time through a server-side cursor on a
+    session of their own, held for as long as the export streams.
+    """
+    if fmt == "csv":
+        yield format_rows([EXPORT_FIELDS], fmt)
+    async with AsyncSession(async_engine) as session:
+        result = await session.stream(statement.execution_options(yield_per=batch_size))
+        async for rows in result.partitions():
+            yield format_rows(rows, fmt)
+
+
+async def read_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split a stream of bytes into lines of UTF-8 text.
+
+    Raises:
+        UnicodeDecodeError: If the stream isn't UTF-8.
+    """
+    pending = b""
+    async for chunk in chunks:
+        *lines, pending = (pending + chunk).split(b"\n")
+        for line in lines:
+            yield line.removesuffix(b"\r").decode()
+    if pending:
+        yield pending.removesuffix(b"\r").decode()
+
+
+async def read_csv_records(lines: AsyncIterator[str]) -> AsyncIterator[list[str]]:
+    """Parse CSV records, which may span lines within quoted values."""
+    record: list[str] = []
+    quotes = 0
+    async for line in lines:
+        record.append(line)
+        quotes += line.count('"')
+        # An odd number of quotes leaves a quoted value open.
+        if quotes % 2:
+            continue
+        yield next(csv.reader(["\n".join(record)]), [])
+        record, quotes = [], 0
+    if record:
+        yield next(csv.reader(["\n".join(record)]), [])
+
+
+async def read_records(
+    chunks: AsyncIterator[bytes], fmt: TransferFormat
+) -> AsyncIterator[dict[str, Any] | ValueError]:
+    """
+    Yield the records of an uploaded file as dicts.
+
+    A record that can't be parsed is yielded as the error, so that it can be
+    reported without aborting the import. Blank lines are skipped. CSV files
+    start with a header naming their columns; empty values become None.
+    """
+    lines = read_lines(chunks)
+    if fmt == "ndjson":
+        async for line in lines:
+            if line.strip():
+                try:
+                    yield orjson.loads(line)
+                except orjson.JSONDecodeError as exc:
+                    yield exc
+        return
+
+    header = None
+    async for record in read_csv_records(lines):
+        if not any(record):
+            continue
+        if header is None:
+            header = record
+            continue
+        yield {name: value or None for name, value in zip(header, record)}
+
+
+def validation_detail(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def insert_staged_tasks(actor_id: uuid.UUID | None) -> Select:
+    """
+    Move the staged batch to `task`, queuing its domain events.
+
+    Tasks without assignee also queue a notification, from `actor_id`.
+    """
+    staged = delete(staging_table).returning(*staging_table.c).cte("staged")
+    written = (
+        insert(task_table)
+        .from_select(IMPORT_FIELDS, select(*staged.c))
+        .returning(*task_table.c)
+        .cte("written")
+    )
+    return (
+        select(func.count())
+        .select_from(written)
+        .add_cte(
+            queue_domain_events(
+                written,
+                "task",
+                "task.created",
+                written.c.id,
+                json_object(written, TASK_FIELDS),
+            )
+        )
+        .add_cte(
+            queue_task_notifications(
+                written,
+                NotificationKind.TASK_CREATED_UNASSIGNED,
+                actor_id,
+                written.c.assignee_id.is_(None),
+            )
+        )
+    )
+
+
+@dataclass
+class TaskImport:
+    """
+    Load tasks into the database with COPY, `batch_size` at a time.
+
+    Batches are COPYed into a temporary staging table, then moved to `task`
+    by an INSERT queuing a `task.created` domain event per task, and a
+    notification from `actor_id` per task without assignee, like any other
+    task write. Invalid records are skipped and reported (up to
+    `MAX_IMPORT_ERRORS` of them) by their position in the upload.
+    Everything happens in the transaction of `session`, which `finish`
+    commits.
+    """
+
+    session: AsyncSession
+    actor_id: uuid.UUID | None = None
+    batch_size: int = IMPORT_BATCH_SIZE
+    imported: int = 0
+    skipped: int = 0
+    errors: list[dict] = field(default_factory=list)
+    batch: list[tuple[int, TaskCreate]] = field(default_factory=list)
+    staged: bool = False
+
+    def reject(self, index: int, detail: str) -> None:
+        self.skipped += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append({"index": index, "detail": detail})
+
+    async def add(self, index: int, record: dict[str, Any] | ValueError) -> None:
+        if isinstance(record, ValueError):
+            self.reject(index, f"Unreadable record: {record}")
+            return
+        try:
+            task_in = TaskCreate.model_validate(record)
+        except ValidationError as exc:
+            self.reject(index, validation_detail(exc))
+            return
+        self.batch.append((index, task_in))
+        if len(self.batch) >= self.batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        wanted = {task.assignee_id for _, task in self.batch if task.assignee_id}
+        found = set()
+        if wanted:
+            statement = select(User.id).where(User.id.in_(wanted))  # type: ignore
+            found = set((await self.session.exec(statement)).scalars())  # type: ignore
+
+        records = []
+        for index, task in self.batch:
+            if task.assignee_id is not None and task.assignee_id not in found:
+                self.reject(index, "Assignee not found")
+                continue
+            records.append(
+                (
+                    task.title,
+                    task.description,
+                    task.assignee_id,
+                    # COPY sends enums by label, which are the member names.
+                    task.category.name,
+                    task.due_date,
+                    task.status.name,
+                )
+            )
+        self.batch = []
+        if not records:
+            return
+
+        if not self.staged:
+            await self.session.exec(
+                text(  # type: ignore
+                    f"CREATE TEMPORARY TABLE {staging_table.name} ON COMMIT DROP AS "
+                    f"SELECT {', '.join(IMPORT_FIELDS)} FROM {Task.__tablename__} "
+                    "WITH NO DATA"
+                )
+            )
+            self.staged = True
+        connection = await (await self.session.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(  # type: ignore
+            staging_table.name, records=records, columns=IMPORT_FIELDS
+        )
+        await self.session.exec(insert_staged_tasks(self.actor_id))  # type: ignore
+        self.imported += len(records)
+
+    async def finish(self) -> None:
+        """
+        Load the last batch and commit.
+
+        A single change notification covers the whole import: clients fetch
+        the tasks through `GET /tasks/changes` anyway.
+        """
+        await self.flush()
+        # Missing assignees are only found when their batch is flushed.
+        self.errors.sort(key=lambda error: error["index"])
+        if self.imported:
+            await self.session.exec(
+                select(  # type: ignore
+                    task_change_notification(
+                        "imported", null(), func.currval("task_change_seq")
+                    )
+                )
+            )
+        await self.session.commit()
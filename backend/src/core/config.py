@@ -1,3 +1,4 @@
+from typing import Literal
 from urllib.parse import quote_plus
 
 from pydantic import Field
@@ -19,6 +20,48 @@ class Settings(BaseSettings):
     CLERK_JWKS_URL: str = Field(
         init=False, min_length=1
     )  # e.g., "https://your-clerk-instance.clerk.accounts.dev/.well-known/jwks.json"
+    CLERK_JWKS_CACHE_TTL: float = Field(300.0, init=False)  # seconds
+    CLERK_TOKEN_CACHE_SIZE: int = Field(10_000, init=False)
+
+    # Cache of the users behind the tokens, see src/core/user_cache.py.
+    # "local" only invalidates the worker that made the change (others catch
+    # up after the TTL); "postgres" broadcasts invalidations with NOTIFY.
+    USER_CACHE_TTL: float = Field(60.0, init=False)  # seconds, 0 disables
+    USER_CACHE_SIZE: int = Field(10_000, init=False)
+    USER_CACHE_INVALIDATION: Literal["local", "postgres"] = Field("local", init=False)
+
+    # Webhook inbox worker, see src/webhooks/inbox.py
+    WEBHOOK_INBOX_BATCH_SIZE: int = Field(500, init=False)
+    WEBHOOK_INBOX_PARTITIONS_PER_BATCH: int = Field(4, init=False)
+    WEBHOOK_INBOX_POLL_INTERVAL: float = Field(5.0, init=False)  # seconds
+    WEBHOOK_INBOX_MAX_ATTEMPTS: int = Field(5, init=False)
+
+    # Notification dispatcher, see src/notifications/outbox.py. Webhook
+    # delivery is enabled by setting its URL; "email" only logs the emails.
+    NOTIFICATION_CHANNELS: list[Literal["in_app", "email"]] = Field(
+        ["in_app"], init=False
+    )
+    NOTIFICATION_WEBHOOK_URL: str = Field("", init=False)
+    NOTIFICATION_BATCH_SIZE: int = Field(200, init=False)
+    NOTIFICATION_POLL_INTERVAL: float = Field(5.0, init=False)  # seconds
+    NOTIFICATION_MAX_ATTEMPTS: int = Field(5, init=False)
+    NOTIFICATION_RETRY_DELAY: float = Field(10.0, init=False)  # seconds, doubling
+    NOTIFICATION_DELIVERY_TIMEOUT: float = Field(10.0, init=False)  # seconds
+
+    # Recurring task scheduler, see src/core/scheduler.py: occurrences due
+    # within the horizon are created ahead of time, at every interval.
+    RECURRING_TASK_HORIZON_DAYS: int = Field(14, init=False)
+    RECURRING_TASK_INTERVAL: float = Field(3600.0, init=False)  # seconds
+
+    # Relay of the domain event outbox, see src/core/outbox.py
+    OUTBOX_BATCH_SIZE: int = Field(500, init=False)
+    OUTBOX_PARTITIONS_PER_BATCH: int = Field(4, init=False)
+    OUTBOX_POLL_INTERVAL: float = Field(1.0, init=False)  # seconds
+    OUTBOX_RETRY_DELAY: float = Field(5.0, init=False)  # seconds
+
+    # Typo tolerance of task title search, when pg_trgm is installed: minimal
+    # trigram similarity between the query and a word of the title.
+    TASK_SEARCH_WORD_SIMILARITY: float = Field(0.4, init=False)
 
     POSTGRES_DB: str = Field(init=False, min_length=1)
     POSTGRES_USER: str = Field(init=False, min_length=1)
@@ -26,6 +69,22 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = Field("db", init=False)  # Default value for Docker setup
     POSTGRES_PORT: str = Field("5432", init=False)
 
+    # Engine profile, shared by the sync and async engines
+    DB_ECHO: bool = Field(False, init=False)
+    DB_POOL_SIZE: int = Field(5, init=False)
+    DB_MAX_OVERFLOW: int = Field(10, init=False)
+    DB_POOL_TIMEOUT: float = Field(30.0, init=False)  # seconds
+    DB_POOL_RECYCLE: int = Field(1800, init=False)  # seconds, -1 disables
+    DB_POOL_PRE_PING: bool = Field(True, init=False)
+    DB_STATEMENT_TIMEOUT_MS: int = Field(30_000, init=False)  # 0 disables
+    DB_APPLICATION_NAME: str = Field("family-task-hub", init=False)
+
+    # Per-request query stats, see src/core/query_stats.py
+    DB_SLOW_QUERY_MS: float = Field(200.0, init=False)  # 0 disables
+    # Same statement shape run this many times in a request is reported as a
+    # possible N+1 query; 0 disables.
+    DB_N_PLUS_ONE_THRESHOLD: int = Field(5, init=False)
+
     @property
     def database_url(self) -> str:
         password_encoded = quote_plus(self.POSTGRES_PASSWORD)
@@ -34,5 +93,13 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
 
+    @property
+    def async_database_url(self) -> str:
+        password_encoded = quote_plus(self.POSTGRES_PASSWORD)
+        return (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:{password_encoded}@"
+            f"{self.POSTGRES_SERVER}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
+
 
 settings = Settings()
@@ -1,9 +1,94 @@
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import ARRAY, Enum, String, Table, TableValuedAlias, bindparam, func
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.types import TypeDecorator, TypeEngine
 from sqlmodel import SQLModel, create_engine
 
 from src.core.config import settings
+from src.core.metrics import instrument_pool
+from src.core.pool import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool
+from src.core.query_stats import instrument_engine
+
+pool_options = {
+    "echo": settings.DB_ECHO,
+    "pool_size": settings.DB_POOL_SIZE,
+    "max_overflow": settings.DB_MAX_OVERFLOW,
+    "pool_timeout": settings.DB_POOL_TIMEOUT,
+    "pool_recycle": settings.DB_POOL_RECYCLE,
+    "pool_pre_ping": settings.DB_POOL_PRE_PING,
+}
+
+# Session settings applied by Postgres to every new connection
+server_settings = {"application_name": settings.DB_APPLICATION_NAME}
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+# Threshold of the `<%` operator used by task search. Accepted by Postgres
+# even where pg_trgm isn't installed.
+server_settings["pg_trgm.word_similarity_threshold"] = str(
+    settings.TASK_SEARCH_WORD_SIMILARITY
+)
+
+sync_connect_args = {"application_name": settings.DB_APPLICATION_NAME}
+if settings.DB_STATEMENT_TIMEOUT_MS:
+    sync_connect_args["options"] = (
+        f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
+    )
+
+# Sync engine: used by Alembic and the maintenance scripts.
+engine = create_engine(
+    settings.database_url,
+    poolclass=InstrumentedQueuePool,
+    connect_args=sync_connect_args,
+    **pool_options,
+)
+
+# Async engine: used by the API so requests don't occupy threadpool workers
+# while waiting on Postgres.
+async_engine = create_async_engine(
+    settings.async_database_url,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    connect_args={"server_settings": server_settings},
+    **pool_options,
+)
 
-engine = create_engine(settings.database_url, echo=True)
+instrument_engine(engine, settings.DB_SLOW_QUERY_MS)
+instrument_engine(async_engine.sync_engine, settings.DB_SLOW_QUERY_MS)
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
 
 
 def create_db_and_tables():
     SQLModel.metadata.create_all(engine)
+
+
+def _unbounded(type_: TypeEngine) -> TypeEngine:
+    """Return `type_` without its length, if it is a string type."""
+    impl = type_.impl_instance if isinstance(type_, TypeDecorator) else type_
+    if isinstance(impl, String) and not isinstance(impl, Enum) and impl.length:
+        return String()
+    return type_
+
+
+def unnest_rows(
+    table: Table, names: Sequence[str], rows: Sequence[dict[str, Any]]
+) -> TableValuedAlias:
+    """
+    Turn `rows` into a derived table, passing one array parameter per column.
+
+    Columns are named `names` and typed like the same columns of `table`,
+    without their length: Postgres truncates strings cast to a shorter
+    `VARCHAR(n)`, while writing them to the column raises. Unlike a
+    multi-row VALUES, the statement keeps the same shape whatever the number
+    of rows, so SQLAlchemy compiles it once and caches it.
+    """
+    arrays = (
+        bindparam(
+            f"{name}_values",
+            [row[name] for row in rows],
+            type_=ARRAY(_unbounded(table.c[name].type)),
+        )
+        for name in names
+    )
+    return func.unnest(*arrays).table_valued(*names).render_derived(name="data")
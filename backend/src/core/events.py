@@ -0,0 +1,146 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager
+
+import asyncpg
+from sqlalchemy import ColumnElement, Text, cast, func
+from sqlalchemy.engine import make_url
+
+from src.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TASK_EVENTS_CHANNEL = "task_events"
+
+
+def task_change_notification(
+    op: str, task_id: ColumnElement[int], change_seq: ColumnElement[int]
+) -> ColumnElement:
+    """
+    SQL expression queuing a task change notification for each selected row.
+
+    Lets a write statement notify of its own changes, e.g. by selecting this
+    over the rows it returns. Postgres only delivers the notification once the
+    transaction commits, and drops it on rollback. The payload is kept small
+    (well under the 8000 bytes NOTIFY limit): clients fetch the actual rows
+    with `GET /tasks/changes`.
+    """
+    payload = func.jsonb_build_object(
+        "op", op, "task_id", task_id, "change_seq", change_seq
+    )
+    return func.pg_notify(TASK_EVENTS_CHANNEL, cast(payload, Text))
+
+
+class EventBroker:
+    """
+    In-process fan-out of messages to any number of subscribers.
+
+    Each subscriber gets a bounded queue; when a slow subscriber's queue is
+    full its oldest message is dropped rather than blocking the publisher.
+
+    Args:
+        max_queue_size: Messages buffered per subscriber.
+    """
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self.dropped = 0
+        self._subscribers: set[asyncio.Queue[str]] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, message: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str]]:
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.max_queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+
+class PostgresListener:
+    """
+    Dispatch notifications of Postgres channels to in-process callbacks.
+
+    A single dedicated connection (outside of the engine pool) is used per
+    process, whatever the number of channels and of clients subscribed to
+    them. The connection is re-established if it drops; notifications sent
+    while it is down are lost.
+
+    Args:
+        dsn: libpq connection string.
+        reconnect_delay: Seconds to wait before reconnecting.
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float = 1.0):
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self._callbacks: dict[str, list[Callable[[str], None]]] = {}
+        self._task: asyncio.Task | None = None
+
+    def listen(self, channel: str, callback: Callable[[str], None]) -> None:
+        """
+        Call `callback` with the payload of every notification on `channel`.
+
+        A channel may have several callbacks, called in registration order.
+        Channels must be registered before `start()`.
+        """
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="postgres-listener")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notification(self, connection, pid, channel, payload) -> None:
+        for callback in self._callbacks[channel]:
+            callback(payload)
+
+    async def _run(self) -> None:
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(
+                    self.dsn,
+                    server_settings={"application_name": settings.DB_APPLICATION_NAME},
+                )
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                for channel in self._callbacks:
+                    await connection.add_listener(channel, self._on_notification)
+                await lost.wait()
+                logger.warning("LISTEN connection lost")
+            except (OSError, asyncpg.PostgresError):
+                logger.warning("LISTEN failed", exc_info=True)
+            finally:
+                if connection is not None and not connection.is_closed():
+                    await connection.close()
+            await asyncio.sleep(self.reconnect_delay)
+
+
+task_events = EventBroker()
+postgres_listener = PostgresListener(
+    dsn=make_url(settings.async_database_url)
+    .set(drivername="postgresql")
+    .render_as_string(hide_password=False),
+)
+postgres_listener.listen(TASK_EVENTS_CHANNEL, task_events.publish)
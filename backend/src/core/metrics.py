@@ -0,0 +1,107 @@
+import os
+import time
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import Engine, event
+
+# With several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory
+# shared by all of them (and wiped before they start): each process then
+# writes its metrics to memory-mapped files there, which are added up on
+# every scrape, whichever worker serves it.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, until its response is sent.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS = Counter(
+    "http_requests_total", "Requests handled.", ["method", "route", "status"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests being handled.",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_SIZE = Gauge(
+    "db_pool_size",
+    "Size of the connection pool, overflow excluded.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out of the pool.",
+    ["engine"],
+    multiprocess_mode="livesum",
+)
+
+JWKS_FETCHES = Counter("jwks_fetches_total", "Fetches of Clerk's JWKS.", ["result"])
+JWKS_FETCH_DURATION = Histogram(
+    "jwks_fetch_duration_seconds",
+    "Time to fetch Clerk's JWKS.",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# Outcomes: "received", "duplicate" or "rejected" (bad signature) when
+# posted, then "processed", "invalid" or "failed" (to be retried) by the
+# inbox worker.
+WEBHOOK_EVENTS = Counter(
+    "webhook_events_total", "Clerk webhook events.", ["event_type", "outcome"]
+)
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Keep the pool gauges of `engine` up to date, labelled `name`."""
+    size = DB_POOL_SIZE.labels(name)
+    checked_out = DB_POOL_CHECKED_OUT.labels(name)
+    size.set(engine.pool.size())  # type: ignore[attr-defined]
+
+    # Gauges follow connections as they move rather than being read at
+    # scrape time: a scrape is served by a single worker, which can't see
+    # the pools of the others.
+    @event.listens_for(engine, "checkout")
+    def checkout(*args) -> None:
+        checked_out.inc()
+
+    @event.listens_for(engine, "checkin")
+    def checkin(*args) -> None:
+        checked_out.dec()
+
+
+class JWKSFetchTimer:
+    """Time a JWKS fetch, counting it as an error if it raises."""
+
+    def __enter__(self) -> None:
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        JWKS_FETCH_DURATION.observe(time.perf_counter() - self.start)
+        JWKS_FETCHES.labels("error" if exc_type else "ok").inc()
+
+
+def record_webhook_events(event_types: list[str], outcome: str) -> None:
+    """Count webhook events of the given types with the same outcome."""
+    for event_type in event_types:
+        WEBHOOK_EVENTS.labels(event_type or "unknown", outcome).inc()
+
+
+def latest_metrics() -> tuple[bytes, str]:
+    """Return the metrics in the text exposition format, and its content type."""
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
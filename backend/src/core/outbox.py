@@ -0,0 +1,389 @@
+"""
+Transactional outbox of domain events.
+
+Every write of a task or a user also inserts its events in `outbox_event`,
+in the same statement or transaction: an event exists if and only if its
+change committed. The `OutboxRelay` then publishes committed events to a
+`Publisher`, in ID order within each aggregate, at least once.
+"""
+
+import asyncio
+import logging
+import sys
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Protocol, TextIO
+
+import orjson
+from sqlalchemy import (
+    CTE,
+    BigInteger,
+    ColumnElement,
+    FromClause,
+    Select,
+    SmallInteger,
+    Text,
+    bindparam,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.db import async_engine
+from src.models.outbox import OutboxEvent, OutboxPartition
+
+logger = logging.getLogger(__name__)
+
+event_table = OutboxEvent.__table__  # type: ignore
+partition_table = OutboxPartition.__table__  # type: ignore
+
+
+def json_object(rows: FromClause, names: Sequence[str]) -> ColumnElement:
+    """
+    Build a JSONB object of the columns `names` of `rows`.
+
+    Enum columns are stored by member name; they are converted to the values
+    the API uses, so that payloads read like API responses.
+    """
+    pairs: list[Any] = []
+    for name in names:
+        column: ColumnElement = rows.c[name]
+        enum_class = getattr(column.type, "enum_class", None)
+        if enum_class is not None:
+            column = case(
+                {member.name: member.value for member in enum_class},
+                value=cast(column, Text),
+            )
+        pairs += (name, column)
+    return func.jsonb_build_object(*pairs)
+
+
+def queue_domain_events(
+    rows: FromClause,
+    aggregate_type: str,
+    event_type: str | ColumnElement[str],
+    aggregate_id: ColumnElement,
+    payload: ColumnElement,
+    name: str = "outbox_events",
+) -> CTE:
+    """
+    Queue an `event_type` event for each of `rows`.
+
+    The INSERT is returned as a CTE, to add to the statement writing the
+    rows, so that events are only queued if the write commits.
+
+    Args:
+        rows: The rows written, e.g. the CTE of an UPDATE returning them.
+        aggregate_type: Kind of entity of the rows, e.g. "task".
+        event_type: Type of the events, e.g. "task.created", or an
+            expression over `rows` when it depends on the row.
+        aggregate_id: ID of the entity of each row, in `rows`.
+        payload: JSONB body of each event, see `json_object`.
+        name: Name of the CTE, unique within the statement.
+    """
+    queued = insert(event_table).from_select(
+        ["aggregate_type", "aggregate_id", "event_type", "payload"],
+        select(
+            literal(aggregate_type),
+            cast(aggregate_id, Text),
+            literal(event_type) if isinstance(event_type, str) else event_type,
+            payload,
+        ),
+        include_defaults=False,
+    )
+    return queued.cte(name)
+
+
+async def pending_domain_event_count() -> int:
+    """Return the number of events not published yet."""
+    statement = select(func.count()).where(event_table.c.published_at.is_(None))
+    async with async_engine.connect() as connection:
+        return (await connection.execute(statement)).scalar_one()
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    id: int
+    aggregate_type: str
+    aggregate_id: str
+    event_type: str
+    payload: dict[str, Any]
+    created_at: datetime
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class Publisher(Protocol):
+    async def publish(self, events: Sequence[DomainEvent]) -> None:
+        """
+        Publish `events`, in order.
+
+        Raising fails the batch, which is published again later: consumers
+        must tolerate seeing an event twice.
+        """
+        ...
+
+
+Subscriber = Callable[[DomainEvent], Awaitable[None]]
+
+
+class InProcessPublisher:
+    """
+    Pass events to subscribers of this process.
+
+    Subscribers are awaited one event at a time, in order, and get the
+    events of the aggregate types they subscribed to (all by default).
+    """
+
+    def __init__(self):
+        self._subscribers: list[tuple[Subscriber, frozenset[str] | None]] = []
+
+    def subscribe(
+        self, subscriber: Subscriber, aggregate_types: Sequence[str] | None = None
+    ) -> None:
+        types = frozenset(aggregate_types) if aggregate_types is not None else None
+        self._subscribers.append((subscriber, types))
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers = [s for s in self._subscribers if s[0] is not subscriber]
+
+    async def publish(self, events: Sequence[DomainEvent]) -> None:
+        for event in events:
+            for subscriber, types in self._subscribers:
+                if types is None or event.aggregate_type in types:
+                    await subscriber(event)
+
+
+class StreamPublisher:
+    """
+    Stand-in for an external broker, writing events as NDJSON to `stream`.
+
+    A batch is written and flushed at once, like a batch of messages sent to
+    a broker.
+    """
+
+    def __init__(self, stream: TextIO | None = None):
+        self.stream = stream or sys.stdout
+
+    async def publish(self, events: Sequence[DomainEvent]) -> None:
+        self.stream.write(
+            "".join(
+                orjson.dumps(event.to_dict(), option=orjson.OPT_APPEND_NEWLINE).decode()
+                for event in events
+            )
+        )
+        self.stream.flush()
+
+
+@dataclass
+class RelayStats:
+    """Counters for the outbox relay."""
+
+    batches: int = 0
+    events: int = 0
+    errors: int = 0
+
+
+class OutboxRelay:
+    """
+    Publish the committed events of the outbox, in batches.
+
+    Events are spread over the partitions of `OutboxPartition` by a hash of
+    their aggregate. A batch locks up to `partitions_per_batch` partitions
+    with pending events, with `FOR UPDATE SKIP LOCKED` and least recently
+    relayed first, then publishes their oldest events in ID order, marks
+    them published and commits. Since a partition is only relayed by one
+    relay at a time, the relays of several API processes can run side by
+    side without ever reordering the events of an aggregate.
+
+    When publishing fails, the batch is rolled back: its events are
+    published again, in the same order, after `retry_delay`. Later events of
+    the same aggregates wait for them, so delivery is at least once and in
+    order.
+
+    Args:
+        publisher: Where events are published.
+        batch_size: Maximum events published per transaction.
+        partitions_per_batch: Maximum partitions locked per transaction.
+        poll_interval: Seconds between two checks of the outbox when nothing
+            wakes the relay up.
+        retry_delay: Seconds to wait after a failed batch.
+    """
+
+    def __init__(
+        self,
+        publisher: Publisher,
+        batch_size: int = 500,
+        partitions_per_batch: int = 4,
+        poll_interval: float = 1.0,
+        retry_delay: float = 5.0,
+    ):
+        self.publisher = publisher
+        self.batch_size = batch_size
+        self.partitions_per_batch = partitions_per_batch
+        self.poll_interval = poll_interval
+        self.retry_delay = retry_delay
+        self.stats = RelayStats()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self, payload: str = "") -> None:
+        """Check the outbox now; usable as a `PostgresListener` callback."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="outbox-relay")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            # Publishers are pluggable: whatever they raise is retried later.
+            except Exception:
+                self.stats.errors += 1
+                logger.warning("Relaying the outbox failed", exc_info=True)
+                await asyncio.sleep(self.retry_delay)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """
+        Publish batches until no unlocked partition has pending events.
+
+        Returns:
+            Number of events published.
+        """
+        total = 0
+        while published := await self.process_batch():
+            total += published
+        return total
+
+    async def process_batch(self) -> int:
+        """Claim, publish and mark one batch of events; return its size."""
+        pending = exists().where(
+            event_table.c.partition == partition_table.c.partition,
+            event_table.c.published_at.is_(None),
+        )
+        locked = (
+            select(partition_table.c.partition)
+            .where(pending)
+            .order_by(partition_table.c.relayed_at.asc().nulls_first())
+            .limit(self.partitions_per_batch)
+            .with_for_update(skip_locked=True)
+        )
+        claim = (
+            update(partition_table)
+            .where(partition_table.c.partition.in_(locked.scalar_subquery()))
+            .values(relayed_at=func.now())
+            .returning(partition_table.c.partition)
+        )
+        async with AsyncSession(async_engine) as session:
+            while True:
+                partitions = (await session.exec(claim)).scalars().all()  # type: ignore
+                if not partitions:
+                    return 0
+                # The events are read by a statement of their own, whose
+                # snapshot is taken once the partitions are locked: it sees
+                # the events marked by the relay that held them before.
+                rows = (
+                    await session.exec(self._select_events(partitions))  # type: ignore
+                ).all()
+                if rows:
+                    break
+                # Relayed by another relay in the meantime: claim others,
+                # which now come first.
+                await session.commit()
+
+            events = [DomainEvent(*row) for row in rows]
+            await self.publisher.publish(events)
+            event_ids = bindparam(
+                "event_ids", [event.id for event in events], ARRAY(BigInteger)
+            )
+            await session.exec(
+                update(event_table)  # type: ignore
+                .where(event_table.c.id == func.any(event_ids))
+                .values(published_at=func.now())
+            )
+            await session.commit()
+
+        self.stats.batches += 1
+        self.stats.events += len(events)
+        return len(events)
+
+    def _select_events(self, partitions: Sequence[int]) -> Select:
+        """
+        Select the oldest pending events of `partitions`, in ID order.
+
+        Each partition is read from its own range of the pending index, so
+        that the cost of a batch doesn't grow with the events left behind.
+        Taking the first IDs of the union keeps a prefix of each partition.
+        """
+        claimed = (
+            func.unnest(bindparam("partitions", list(partitions), ARRAY(SmallInteger)))
+            .table_valued("partition")
+            .render_derived(name="claimed")
+        )
+        oldest = (
+            select(event_table)
+            .where(
+                event_table.c.partition == claimed.c.partition,
+                event_table.c.published_at.is_(None),
+            )
+            .order_by(event_table.c.id)
+            .limit(self.batch_size)
+            .lateral("oldest")
+        )
+        return (
+            select(
+                oldest.c.id,
+                oldest.c.aggregate_type,
+                oldest.c.aggregate_id,
+                oldest.c.event_type,
+                oldest.c.payload,
+                oldest.c.created_at,
+            )
+            .select_from(claimed)
+            .join(oldest, true())
+            .order_by(oldest.c.id)
+            .limit(self.batch_size)
+        )
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+domain_events = InProcessPublisher()
+
+outbox_relay = OutboxRelay(
+    publisher=domain_events,
+    batch_size=settings.OUTBOX_BATCH_SIZE,
+    partitions_per_batch=settings.OUTBOX_PARTITIONS_PER_BATCH,
+    poll_interval=settings.OUTBOX_POLL_INTERVAL,
+    retry_delay=settings.OUTBOX_RETRY_DELAY,
+)
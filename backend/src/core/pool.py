@@ -0,0 +1,100 @@
+import threading
+import time
+from dataclasses import dataclass, field
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    """Cumulative checkout statistics of a connection pool."""
+
+    checkouts: int = 0
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+    overflow_events: int = 0
+    timeouts: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_checkout(self, waited: float, overflowed: bool) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            if overflowed:
+                self.overflow_events += 1
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "overflow_events": self.overflow_events,
+                "timeouts": self.timeouts,
+            }
+
+
+class InstrumentedPoolMixin:
+    """
+    Record how long each checkout takes, and whether it had to open an
+    overflow connection or timed out waiting for one.
+
+    Stats survive `Pool.recreate()` (e.g. `engine.dispose()`).
+    """
+
+    stats: PoolStats
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        overflow_before = self.overflow()
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        waited = time.perf_counter() - start
+        overflow_after = self.overflow()
+        self.stats.record_checkout(
+            waited, overflowed=overflow_after > 0 and overflow_after > overflow_before
+        )
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_status(pool: Pool) -> dict:
+    """Return the live occupancy of `pool` and, if instrumented, its stats."""
+    status: dict = {"status": pool.status()}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, InstrumentedPoolMixin):
+        status.update(pool.stats.snapshot())
+    return status
@@ -0,0 +1,93 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger(__name__)
+
+# Bound parameters as rendered by psycopg2 and asyncpg, optionally cast, and
+# runs of them as in expanded IN lists or multi-row VALUES.
+_PLACEHOLDER = r"(?:\$\d+|%\(\w+\)s)(?:::\w+(?:\[\])?)?"
+_PLACEHOLDERS = re.compile(rf"{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*")
+
+
+@lru_cache(maxsize=1024)
+def statement_shape(statement: str) -> str:
+    """
+    Reduce a statement to its shape, so that repeats can be spotted.
+
+    Parameters are already bound, but IN lists and multi-row VALUES render
+    one placeholder per item; each run of placeholders becomes a single `?`.
+    """
+    return _PLACEHOLDERS.sub("?", statement)
+
+
+@dataclass
+class QueryStats:
+    """Statements run on behalf of one request, and how long they took."""
+
+    count: int = 0
+    duration: float = 0.0
+    slowest_duration: float = 0.0
+    slowest_statement: str | None = None
+    shapes: Counter[str] = field(default_factory=Counter, repr=False)
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_statement = statement
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes run at least `threshold` times, most run first."""
+        if threshold <= 0:
+            return []
+        return [
+            (shape, count)
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def server_timing(self) -> str:
+        """Value of a `Server-Timing` header describing these statements."""
+        timing = f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+        if self.count:
+            timing += f", db-slowest;dur={self.slowest_duration * 1000:.2f}"
+        return timing
+
+
+# Set by `QueryStatsMiddleware` for the duration of each request. Threadpool
+# workers and SQLAlchemy's greenlets run in a copy of the request's context,
+# which still refers to the same `QueryStats`.
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+def instrument_engine(engine: Engine, slow_query_ms: float) -> None:
+    """
+    Time every statement run by `engine`.
+
+    Statements are added to the stats of the current request, if any, and
+    those taking at least `slow_query_ms` are logged (0 disables).
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        conn.info["query_started_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - conn.info.pop("query_started_at")
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.record(statement, duration)
+        if slow_query_ms and duration * 1000 >= slow_query_ms:
+            logger.warning("Slow query (%.1f ms): %s", duration * 1000, statement)
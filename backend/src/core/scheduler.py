@@ -0,0 +1,290 @@
+"""
+Scheduler creating the upcoming occurrences of recurring tasks.
+
+Each run creates, for every recurring task at once, the tasks due between
+today and the end of the horizon that weren't created yet: a single
+INSERT ... SELECT expands the schedules with `generate_series`, so its cost
+doesn't depend on the number of recurring tasks but on the number of rows.
+"""
+
+import asyncio
+import logging
+from collections.abc import Collection
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import (
+    ColumnElement,
+    Integer,
+    Select,
+    and_,
+    case,
+    cast,
+    extract,
+    func,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.serializers import TASK_FIELDS
+from src.core.config import settings
+from src.core.db import async_engine
+from src.core.events import task_change_notification
+from src.core.outbox import json_object, queue_domain_events
+from src.models.notifications import NotificationKind
+from src.models.tasks import RecurrenceFrequency, RecurringTask, Task, TaskStatus
+from src.notifications.outbox import queue_task_notifications
+
+logger = logging.getLogger(__name__)
+
+recurring_table = RecurringTask.__table__  # type: ignore
+task_table = Task.__table__  # type: ignore
+
+TEMPLATE_FIELDS = ("title", "description", "assignee_id", "category")
+
+
+def _months(day: ColumnElement[date]) -> ColumnElement[int]:
+    year = cast(extract("year", day), Integer)
+    return year * 12 + cast(extract("month", day), Integer)
+
+
+def materialize_statement(
+    today: date, horizon_days: int, recurring_task_ids: Collection[int] | None = None
+) -> Select:
+    """
+    Create the occurrences due from `today` to `today + horizon_days`.
+
+    Only days after the `materialized_through` of each recurring task are
+    considered, which is then moved to the end of the horizon. Occurrences
+    that exist already are skipped thanks to the unique (recurring task,
+    occurrence date) key, so that concurrent runs are harmless. A
+    `task.created` domain event per task, a notification of each task
+    without assignee and a single "materialized" change notification are
+    part of the statement.
+
+    Args:
+        recurring_task_ids: Only materialize these recurring tasks.
+
+    Returns:
+        A statement selecting the number of tasks created.
+    """
+    r = recurring_table
+    through = today + timedelta(days=horizon_days)
+    # greatest() and least() ignore NULLs
+    first = func.greatest(r.c.starts_on, r.c.materialized_through + 1, today)
+    last = func.least(r.c.until, through)
+    offsets = (
+        func.generate_series(0, last - first)
+        .table_valued("offset")
+        .render_derived(name="offsets")
+    )
+    selected = [
+        r.c.materialized_through.is_(None) | (r.c.materialized_through < through)
+    ]
+    if recurring_task_ids is not None:
+        selected.append(r.c.id.in_(recurring_task_ids))
+
+    days = (
+        select(r, (first + offsets.c.offset).label("day"))
+        .join(offsets, true())
+        .where(*selected)
+        .subquery("days")
+    )
+    day = days.c.day
+    elapsed_days = day - days.c.starts_on
+    # Weeks start on Monday, as with RRULE's default WKST
+    weekday = cast(extract("isodow", day), Integer)
+    start_weekday = cast(extract("isodow", days.c.starts_on), Integer)
+    occurs = or_(
+        and_(
+            days.c.frequency == RecurrenceFrequency.DAILY,
+            elapsed_days % days.c.interval == 0,
+        ),
+        and_(
+            days.c.frequency == RecurrenceFrequency.WEEKLY,
+            weekday == func.any(days.c.by_weekday),
+            (elapsed_days + start_weekday - 1) // 7 % days.c.interval == 0,
+        ),
+        and_(
+            days.c.frequency == RecurrenceFrequency.MONTHLY,
+            extract("day", day) == extract("day", days.c.starts_on),
+            (_months(day) - _months(days.c.starts_on)) % days.c.interval == 0,
+        ),
+    )
+
+    inserted = (
+        insert(task_table)
+        .from_select(
+            [
+                *TEMPLATE_FIELDS,
+                "due_date",
+                "status",
+                "recurring_task_id",
+                "occurrence_date",
+            ],
+            select(
+                *(days.c[name] for name in TEMPLATE_FIELDS),
+                day,
+                literal(TaskStatus.TODO, task_table.c.status.type),
+                days.c.id,
+                day,
+            ).where(occurs),
+        )
+        .on_conflict_do_nothing(
+            index_elements=[
+                task_table.c.recurring_task_id,
+                task_table.c.occurrence_date,
+            ]
+        )
+        .returning(*task_table.c)
+        .cte("inserted")
+    )
+    advanced = (
+        update(r)
+        .where(*selected)
+        .values(materialized_through=through)
+        .returning(r.c.id)
+        .cte("advanced")
+    )
+    created = func.count(inserted.c.id)
+    return (
+        select(
+            created,
+            case(
+                (
+                    created > 0,
+                    task_change_notification(
+                        "materialized", null(), func.max(inserted.c.change_seq)
+                    ),
+                ),
+            ),
+        )
+        .add_cte(advanced)
+        .add_cte(
+            queue_domain_events(
+                inserted,
+                "task",
+                "task.created",
+                inserted.c.id,
+                json_object(inserted, TASK_FIELDS),
+            )
+        )
+        .add_cte(
+            queue_task_notifications(
+                inserted,
+                NotificationKind.TASK_CREATED_UNASSIGNED,
+                None,
+                inserted.c.assignee_id.is_(None),
+            )
+        )
+    )
+
+
+async def materialize_recurring_tasks(
+    session: AsyncSession,
+    today: date,
+    horizon_days: int,
+    recurring_task_ids: Collection[int] | None = None,
+) -> int:
+    """
+    Run `materialize_statement` in the transaction of `session`.
+
+    Returns:
+        Number of tasks created.
+    """
+    statement = materialize_statement(today, horizon_days, recurring_task_ids)
+    return (await session.exec(statement)).one()[0]  # type: ignore
+
+
+@dataclass
+class SchedulerStats:
+    """Counters for the recurring task scheduler."""
+
+    runs: int = 0
+    tasks_created: int = 0
+    errors: int = 0
+    last_run_at: datetime | None = None
+
+
+class RecurringTaskScheduler:
+    """
+    Materialize recurring tasks in the background, every `interval` seconds.
+
+    Several API processes may each run a scheduler: runs are idempotent, so
+    the extra ones just find nothing to create.
+
+    Args:
+        horizon_days: How many days ahead occurrences are created.
+        interval: Seconds between two runs.
+    """
+
+    def __init__(self, horizon_days: int = 14, interval: float = 3600.0):
+        self.horizon_days = horizon_days
+        self.interval = interval
+        self.stats = SchedulerStats()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="recurring-tasks")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except (OSError, SQLAlchemyError):
+                self.stats.errors += 1
+                logger.warning("Materializing recurring tasks failed", exc_info=True)
+            await asyncio.sleep(self.interval)
+
+    async def run_once(self, today: date | None = None, dry_run: bool = False) -> int:
+        """
+        Create the occurrences due within the horizon of `today`.
+
+        Args:
+            today: Defaults to the current date.
+            dry_run: If True, roll back instead of committing.
+
+        Returns:
+            Number of tasks created (or that would have been).
+        """
+        async with AsyncSession(async_engine) as session:
+            created = await materialize_recurring_tasks(
+                session, today or date.today(), self.horizon_days
+            )
+            if dry_run:
+                await session.rollback()
+                return created
+            await session.commit()
+
+        self.stats.runs += 1
+        self.stats.tasks_created += created
+        self.stats.last_run_at = datetime.now()
+        if created:
+            logger.info("Created %d occurrences of recurring tasks", created)
+        return created
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+recurring_task_scheduler = RecurringTaskScheduler(
+    horizon_days=settings.RECURRING_TASK_HORIZON_DAYS,
+    interval=settings.RECURRING_TASK_INTERVAL,
+)
@@ -0,0 +1,236 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from jwt import PyJWK, PyJWKClient
+from jwt.exceptions import PyJWKClientError
+
+from src.core.metrics import JWKSFetchTimer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class KeyStoreStats:
+    """Counters for the JWKS key store."""
+
+    hits: int = 0
+    misses: int = 0
+    fetches: int = 0
+    fetch_errors: int = 0
+
+
+@dataclass
+class TokenCacheStats:
+    """Counters for the verified-token cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class JWKSKeyStore:
+    """
+    Process-wide, thread-safe store of the signing keys published by Clerk.
+
+    Keys are served from memory and refreshed once they are older than `ttl`.
+    A token signed with an unknown `kid` triggers an immediate refetch (Clerk
+    rotated its keys). Request-driven refetches are rate limited by
+    `min_refetch_interval` so that garbage tokens or an unreachable Clerk
+    cannot be used to hammer the JWKS endpoint. Concurrent refreshes
+    are collapsed into a single request, and a stale key set keeps being
+    served if Clerk is unreachable.
+
+    Args:
+        uri: URL of the JWKS document.
+        ttl: Seconds after which the key set is considered stale.
+        min_refetch_interval: Minimum seconds between two refetches triggered
+            by incoming requests.
+        timeout: HTTP timeout for fetching the key set.
+    """
+
+    def __init__(
+        self,
+        uri: str,
+        ttl: float = 300.0,
+        min_refetch_interval: float = 30.0,
+        timeout: float = 10.0,
+    ):
+        self.ttl = ttl
+        self.min_refetch_interval = min_refetch_interval
+        self.stats = KeyStoreStats()
+
+        self._client = PyJWKClient(uri, cache_jwk_set=False, timeout=timeout)
+        self._keys: dict[str, PyJWK] = {}
+        self._fetched_at: float | None = None
+        self._last_attempt: float | None = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def get_signing_key(self, kid: str | None) -> PyJWK:
+        """
+        Return the signing key for `kid`, fetching the key set if needed.
+
+        Raises:
+            PyJWKClientError: If no key matches `kid`.
+        """
+        with self._lock:
+            key = self._keys.get(kid) if kid else None
+            fetched_at = self._fetched_at
+            fresh = fetched_at is not None and time.monotonic() - fetched_at < self.ttl
+            if key is not None and fresh:
+                self.stats.hits += 1
+                return key
+            self.stats.misses += 1
+
+        self._refresh(observed=fetched_at, force=False)
+
+        with self._lock:
+            refreshed = self._keys.get(kid) if kid else None
+        if refreshed is not None:
+            return refreshed
+        if key is not None:
+            # Refresh failed or was rate limited; the stale key is still usable.
+            return key
+        raise PyJWKClientError(f'Unable to find a signing key that matches: "{kid}"')
+
+    def refresh(self) -> None:
+        """Fetch the key set now, regardless of its age."""
+        self._refresh(observed=self._fetched_at, force=True)
+
+    def _refresh(self, observed: float | None, force: bool) -> None:
+        with self._refresh_lock:
+            if self._fetched_at != observed:
+                # Another thread refreshed while this one was waiting.
+                return
+
+            now = time.monotonic()
+            if (
+                not force
+                and self._last_attempt is not None
+                and now - self._last_attempt < self.min_refetch_interval
+            ):
+                return
+            self._last_attempt = now
+
+            try:
+                with JWKSFetchTimer():
+                    jwk_set = self._client.get_jwk_set(refresh=True)
+            except PyJWKClientError:
+                with self._lock:
+                    self.stats.fetch_errors += 1
+                if not self._keys:
+                    raise
+                logger.warning("JWKS refresh failed, serving stale keys", exc_info=True)
+                return
+
+            keys = {key.key_id: key for key in jwk_set.keys if key.key_id}
+            with self._lock:
+                self._keys = keys
+                self._fetched_at = time.monotonic()
+                self.stats.fetches += 1
+
+    def start(self) -> None:
+        """Start a daemon thread that refreshes the key set before it expires."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._prefetch_loop, name="jwks-prefetch", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background prefetch thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _prefetch_loop(self) -> None:
+        interval = self.ttl * 0.8
+        while True:
+            try:
+                self.refresh()
+            except PyJWKClientError:
+                logger.warning("JWKS prefetch failed", exc_info=True)
+            if self._stop.wait(interval):
+                return
+
+    def snapshot(self) -> dict:
+        """Return the counters and the number of cached keys."""
+        with self._lock:
+            return {**asdict(self.stats), "keys": len(self._keys)}
+
+
+class VerifiedTokenCache:
+    """
+    Bounded LRU cache of already-verified JWT payloads.
+
+    Entries are keyed by the SHA-256 of the raw token, so tokens are never
+    kept in memory, and are dropped once the token's `exp` has passed.
+    Payloads without `exp` are never cached.
+
+    Args:
+        maxsize: Maximum number of payloads kept; least recently used entries
+            are evicted first.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self.stats = TokenCacheStats()
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        """Return the cached payload for `token`, or None if absent or expired."""
+        key = self._key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return payload
+
+    def put(self, token: str, payload: dict) -> None:
+        """Cache a verified payload until its `exp` claim."""
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+        if self.maxsize <= 0:
+            return
+
+        key = self._key(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Return the counters and the current number of entries."""
+        with self._lock:
+            return {**asdict(self.stats), "size": len(self._entries)}
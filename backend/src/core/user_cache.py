@@ -0,0 +1,122 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import TextClause, text
+
+from src.core.config import settings
+
+USER_CACHE_CHANNEL = "user_cache"
+ALL_USERS = "*"
+
+
+@dataclass(frozen=True, slots=True)
+class AuthUser:
+    """The parts of a `User` needed to authorize a request."""
+
+    id: uuid.UUID
+    clerk_id: str
+    is_active: bool
+    is_superuser: bool
+
+
+@dataclass
+class UserCacheStats:
+    """Counters for the authorized-user cache."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class UserCache:
+    """
+    Bounded LRU cache of `AuthUser`s keyed by Clerk ID.
+
+    Entries are dropped after `ttl` seconds, which bounds how long a change
+    made elsewhere (another worker, the sync script) can go unnoticed when no
+    invalidation reaches this process. Users that are not found are never
+    cached.
+
+    Args:
+        maxsize: Maximum number of users kept; least recently used entries
+            are evicted first.
+        ttl: Seconds an entry is served for.
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stats = UserCacheStats()
+        self._entries: OrderedDict[str, tuple[float, AuthUser]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, clerk_id: str) -> AuthUser | None:
+        """Return the cached user, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(clerk_id)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            expires_at, user = entry
+            if expires_at <= time.monotonic():
+                del self._entries[clerk_id]
+                self.stats.expirations += 1
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(clerk_id)
+            self.stats.hits += 1
+            return user
+
+    def put(self, user: AuthUser) -> None:
+        if self.maxsize <= 0 or self.ttl <= 0:
+            return
+        with self._lock:
+            self._entries[user.clerk_id] = (time.monotonic() + self.ttl, user)
+            self._entries.move_to_end(user.clerk_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def invalidate(self, clerk_id: str) -> None:
+        """Drop one user, or every user if `clerk_id` is `ALL_USERS`."""
+        with self._lock:
+            if clerk_id == ALL_USERS:
+                self._entries.clear()
+            else:
+                self._entries.pop(clerk_id, None)
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        """Return the counters and the current number of entries."""
+        with self._lock:
+            return {**asdict(self.stats), "size": len(self._entries)}
+
+
+def shared_invalidation() -> bool:
+    """Whether invalidations are broadcast to every worker through Postgres."""
+    return settings.USER_CACHE_INVALIDATION == "postgres"
+
+
+def invalidation_notify(clerk_id: str) -> TextClause:
+    """
+    Statement queuing an invalidation of `clerk_id` for every worker.
+
+    Execute it in the transaction changing the user: Postgres only delivers
+    the notification once that transaction commits, so a worker can't drop
+    its entry and reload the old row before the change is visible.
+    """
+    return text("SELECT pg_notify(:channel, :payload)").bindparams(
+        channel=USER_CACHE_CHANNEL, payload=clerk_id
+    )
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
@@ -1,14 +1,61 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.deps import jwks_key_store, verified_token_cache
+from src.api.middleware import MetricsMiddleware, QueryStatsMiddleware
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.api.serializers import ORJSONResponse
+from src.api.routes.notifications import router as notifications_router
+from src.api.routes.recurring_tasks import router as recurring_tasks_router
 from src.api.routes.tasks import router as tasks_router
 from src.api.routes.users import router as users_router
 from src.api.routes.webhooks import router as webhooks_router
+from src.core.config import settings
+from src.core.db import async_engine, engine
+from src.core.events import TASK_EVENTS_CHANNEL, postgres_listener
+from src.core.metrics import latest_metrics
+from src.core.outbox import outbox_relay, pending_domain_event_count
+from src.core.pool import pool_status
+from src.core.scheduler import recurring_task_scheduler
+from src.core.user_cache import USER_CACHE_CHANNEL, shared_invalidation, user_cache
+from src.notifications.outbox import notification_dispatcher, pending_notification_count
+from src.webhooks.inbox import (
+    WEBHOOK_INBOX_CHANNEL,
+    pending_event_count,
+    webhook_inbox_worker,
+)
 
 # from src.core.db import create_db_and_tables
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    jwks_key_store.start()
+    if shared_invalidation():
+        postgres_listener.listen(USER_CACHE_CHANNEL, user_cache.invalidate)
+    postgres_listener.listen(WEBHOOK_INBOX_CHANNEL, webhook_inbox_worker.wake)
+    # Notifications are only queued by task writes, which all announce
+    # themselves on the task events channel.
+    postgres_listener.listen(TASK_EVENTS_CHANNEL, notification_dispatcher.wake)
+    # User changes are only relayed at the next poll.
+    postgres_listener.listen(TASK_EVENTS_CHANNEL, outbox_relay.wake)
+    postgres_listener.start()
+    webhook_inbox_worker.start()
+    recurring_task_scheduler.start()
+    notification_dispatcher.start()
+    outbox_relay.start()
+    yield
+    await outbox_relay.stop()
+    await notification_dispatcher.stop()
+    await recurring_task_scheduler.stop()
+    await webhook_inbox_worker.stop()
+    await postgres_listener.stop()
+    jwks_key_store.stop()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -21,7 +68,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Server-Timing"],
+)
+app.add_middleware(
+    QueryStatsMiddleware, n_plus_one_threshold=settings.DB_N_PLUS_ONE_THRESHOLD
 )
+app.add_middleware(MetricsMiddleware)
 
 
 @app.get("/healthcheck")
@@ -29,6 +81,61 @@ async def healthcheck():
     return {"status": "ok"}
 
 
+@app.get("/healthcheck/auth")
+async def healthcheck_auth():
+    return {
+        "jwks": jwks_key_store.snapshot(),
+        "token_cache": verified_token_cache.snapshot(),
+        "user_cache": user_cache.snapshot(),
+    }
+
+
+@app.get("/healthcheck/db")
+async def healthcheck_db():
+    return {
+        "async_pool": pool_status(async_engine.pool),
+        "sync_pool": pool_status(engine.pool),
+    }
+
+
+@app.get("/healthcheck/webhooks")
+async def healthcheck_webhooks():
+    return {
+        "inbox_worker": webhook_inbox_worker.snapshot(),
+        "pending": await pending_event_count(),
+    }
+
+
+@app.get("/healthcheck/scheduler")
+async def healthcheck_scheduler():
+    return {"recurring_tasks": recurring_task_scheduler.snapshot()}
+
+
+@app.get("/healthcheck/notifications")
+async def healthcheck_notifications():
+    return {
+        "dispatcher": notification_dispatcher.snapshot(),
+        "pending": await pending_notification_count(),
+    }
+
+
+@app.get("/healthcheck/outbox")
+async def healthcheck_outbox():
+    return {
+        "relay": outbox_relay.snapshot(),
+        "pending": await pending_domain_event_count(),
+    }
+
+
+# Sync, so that multi-process collection reads its files in the threadpool.
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    content, content_type = latest_metrics()
+    return Response(content, media_type=content_type)
+
+
 app.include_router(users_router)
 app.include_router(tasks_router)
+app.include_router(recurring_tasks_router)
+app.include_router(notifications_router)
 app.include_router(webhooks_router)
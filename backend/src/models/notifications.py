@@ -0,0 +1,101 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    DateTime,
+    Index,
+    Text,
+    UniqueConstraint,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlmodel import Field, SQLModel
+
+
+class NotificationKind(str, Enum):
+    TASK_CREATED_UNASSIGNED = "task-created-unassigned"
+    TASK_UNASSIGNED = "task-unassigned"
+
+
+class NotificationOutboxEvent(SQLModel, table=True):
+    """
+    Event to notify users of, written in the transaction of the change.
+
+    The dispatcher (see `src/notifications/outbox.py`) delivers it to
+    its recipients later, so that writes never wait on delivery. Failed
+    deliveries are retried from `available_at` on, through the channels
+    missing from `delivered_channels` only; `dispatched_at` is set once the
+    event was delivered through every channel, or given up on (in which case
+    `error` says why).
+    """
+
+    __tablename__ = "notification_outbox"  # type: ignore
+    # Only pending events are scanned by the dispatcher.
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_pending",
+            "available_at",
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
+    kind: NotificationKind
+    task_id: int
+    # The user whose change caused the event, who isn't notified of it
+    actor_id: uuid.UUID | None = Field(default=None)
+    payload: dict[str, Any] = Field(sa_type=JSONB)
+    created_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    available_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    dispatched_at: datetime | None = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    delivered_channels: list[str] = Field(
+        default=None,
+        sa_type=ARRAY(Text),
+        sa_column_kwargs={"server_default": text("'{}'")},
+    )
+    error: str | None = Field(default=None)
+
+
+class NotificationBase(SQLModel):
+    kind: NotificationKind
+    task_id: int
+    payload: dict[str, Any] = Field(sa_type=JSONB)
+    created_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    read_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+
+
+class Notification(NotificationBase, table=True):
+    """A notification in the in-app inbox of a user."""
+
+    # Retried deliveries don't notify a user twice of the same event.
+    __table_args__ = (
+        UniqueConstraint("event_id", "user_id"),
+        Index("ix_notification_user_id_id", "user_id", "id"),
+    )
+
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
+    user_id: uuid.UUID = Field(foreign_key="user.id", ondelete="CASCADE")
+    event_id: int = Field(sa_type=BigInteger)
+
+
+class NotificationPublic(NotificationBase):
+    id: int
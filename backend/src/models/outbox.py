@@ -0,0 +1,81 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import (
+    BigInteger,
+    Computed,
+    DateTime,
+    Index,
+    SmallInteger,
+    func,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+# Events are spread over this many partitions by aggregate, see
+# `src/core/outbox.py`. Changing it needs a migration of both tables.
+OUTBOX_PARTITIONS = 16
+
+
+class OutboxEvent(SQLModel, table=True):
+    """
+    Domain event, written in the transaction of the change it describes.
+
+    The relay publishes events once committed, in ID order within each
+    aggregate (e.g. a task), and then sets `published_at`.
+    """
+
+    __tablename__ = "outbox_event"  # type: ignore
+    # Only unpublished events are scanned by the relay, partition by partition.
+    __table_args__ = (
+        Index(
+            "ix_outbox_event_pending",
+            "partition",
+            "id",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
+
+    id: int = Field(default=None, primary_key=True, sa_type=BigInteger)
+    aggregate_type: str = Field(max_length=50)
+    aggregate_id: str = Field(max_length=255)
+    event_type: str = Field(max_length=100)
+    payload: dict[str, Any] = Field(sa_type=JSONB)
+    # Events of an aggregate always share a partition.
+    partition: int = Field(
+        default=None,
+        sa_type=SmallInteger,
+        sa_column_kwargs={
+            "server_default": Computed(
+                "(hashtext(aggregate_type || ':' || aggregate_id) & 2147483647)"
+                f" % {OUTBOX_PARTITIONS}",
+                persisted=True,
+            )
+        },
+    )
+    created_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    published_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+
+
+class OutboxPartition(SQLModel, table=True):
+    """
+    Lock of a partition of the outbox for the relay.
+
+    A relay publishes the events of a partition while holding its row
+    locked, so that events of the same aggregate are never published by two
+    relays at once. `relayed_at` makes relays go through partitions in turn.
+    """
+
+    __tablename__ = "outbox_partition"  # type: ignore
+
+    partition: int = Field(
+        primary_key=True,
+        sa_type=SmallInteger,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    relayed_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime
+from sqlmodel import Field, SQLModel
+
+CLERK_USERS_SYNC = "clerk_users"
+
+
+class SyncCheckpoint(SQLModel, table=True):
+    """
+    Progress of a periodic sync from an external source, such as Clerk users.
+
+    The checkpoint is written in the same transaction as the synced data, so
+    a failed run leaves it untouched and the next run starts from the same
+    point.
+    """
+
+    __tablename__ = "sync_checkpoint"  # type: ignore
+
+    name: str = Field(primary_key=True, max_length=50)
+    # Latest `updated_at` seen in the source, in Unix milliseconds as Clerk
+    # sends it.
+    high_water_mark: int | None = Field(default=None, sa_type=BigInteger)
+    last_run_at: datetime = Field(sa_type=DateTime(timezone=True))
+    last_full_sync_at: datetime | None = Field(
+        default=None, sa_type=DateTime(timezone=True)
+    )
@@ -1,8 +1,25 @@
 import uuid
-from datetime import date
+from datetime import date, datetime
 from enum import Enum
-from typing import Optional
+from typing import Optional, Self
 
+from pydantic import model_validator
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    ColumnElement,
+    Computed,
+    DateTime,
+    Index,
+    Sequence,
+    SmallInteger,
+    Text,
+    cast,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.models.users import User, UserPublic
@@ -21,32 +38,300 @@ class TaskStatus(str, Enum):
     COMPLETED = "completed"
 
 
-class TaskBase(SQLModel):
+# Shared by task writes and deletions, so that both can be replayed in order
+# by clients syncing changes.
+task_change_seq = Sequence("task_change_seq", metadata=SQLModel.metadata)
+
+# 64-bit ID (xid8, which never wraps around) of the transaction writing a row.
+# Sequence values are drawn before commit, in another order than commits; the
+# writing transaction tells when a change is committed for good, see
+# `committed_xid_horizon`.
+CURRENT_XID = "pg_current_xact_id()::text::bigint"
+
+
+def committed_xid_horizon() -> ColumnElement[int]:
+    """
+    Oldest transaction still running when the statement started.
+
+    Every transaction below it has ended, and any transaction that hasn't is
+    at or above it. Rows written below the horizon are thus settled: walking
+    changes in (transaction, sequence) order up to the horizon never passes a
+    change that would show up later.
+    """
+    return cast(
+        cast(func.pg_snapshot_xmin(func.pg_current_snapshot()), Text), BigInteger
+    )
+
+
+class TaskTemplate(SQLModel):
+    """Fields of a task that recurring tasks copy to each occurrence."""
+
     title: str
     description: str | None = Field(default=None)
     assignee_id: uuid.UUID | None = Field(default=None, foreign_key="user.id")
     category: TaskCategory
+
+
+class TaskBase(TaskTemplate):
     due_date: date
     status: TaskStatus
 
 
 class Task(TaskBase, table=True):
+    # Keyset pagination walks (due_date, id); each filter gets its own prefix.
+    __table_args__ = (
+        Index("ix_task_due_date_id", "due_date", "id"),
+        Index("ix_task_status_due_date_id", "status", "due_date", "id"),
+        Index("ix_task_category_due_date_id", "category", "due_date", "id"),
+        Index("ix_task_assignee_id_due_date_id", "assignee_id", "due_date", "id"),
+        # Changes feed, see `GET /tasks/changes`
+        Index("ix_task_change_xid_change_seq", "change_xid", "change_seq"),
+        # One task per occurrence of a recurring task, whatever its due date
+        # becomes; the key of the scheduler's ON CONFLICT DO NOTHING.
+        Index(
+            "ix_task_recurring_task_id_occurrence_date",
+            "recurring_task_id",
+            "occurrence_date",
+            unique=True,
+        ),
+    )
+    # Fetch server-generated columns with RETURNING instead of a lazy load
+    __mapper_args__ = {"eager_defaults": True}
+
     id: int = Field(default=None, primary_key=True)
+    updated_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now(), "onupdate": func.now()},
+    )
+    change_seq: int = Field(
+        default=None,
+        index=True,
+        sa_type=BigInteger,
+        sa_column_kwargs={
+            "server_default": task_change_seq.next_value(),
+            "onupdate": task_change_seq.next_value(),
+        },
+    )
+    change_xid: int = Field(
+        default=None,
+        sa_type=BigInteger,
+        sa_column_kwargs={
+            "server_default": text(CURRENT_XID),
+            "onupdate": text(CURRENT_XID),
+        },
+    )
+    # Optimistic concurrency: updates can require the version they were based
+    # on (see `PATCH /tasks/{id}`). Qualified, since some UPDATEs join `task`
+    # to itself.
+    version: int = Field(
+        default=None,
+        sa_column_kwargs={
+            "server_default": "1",
+            "onupdate": literal_column("task.version + 1"),
+        },
+    )
+    recurring_task_id: int | None = Field(
+        default=None, foreign_key="recurring_task.id", ondelete="SET NULL"
+    )
+    occurrence_date: date | None = Field(default=None)
     assignee: Optional[User] = Relationship(back_populates="tasks")
 
 
+# Full-text search over title and description, see `GET /tasks/search`. The
+# column is generated by Postgres and appended to the table after mapping, so
+# that loading tasks never fetches it. Titles weigh more than descriptions.
+TASK_SEARCH_CONFIG = "english"
+Task.__table__.append_column(  # type: ignore
+    Column(
+        "search_vector",
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', coalesce(title, '')), 'A')"
+            f" || setweight(to_tsvector('{TASK_SEARCH_CONFIG}',"
+            " coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
+)
+Index(
+    "ix_task_search_vector",
+    Task.__table__.c.search_vector,  # type: ignore
+    postgresql_using="gin",
+)
+# Typo-tolerant title matching also uses a trigram index on `title`. It needs
+# the pg_trgm extension, so it's created by the migration only where the
+# extension is available, and left out of the metadata.
+TASK_TITLE_TRIGRAM_INDEX = "ix_task_title_trgm"
+
+
+class RecurrenceFrequency(str, Enum):
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+
+
+class RecurringTaskBase(TaskTemplate):
+    """
+    A task template and its schedule, modeled on iCalendar's RRULE.
+
+    Occurrences fall every `interval` days, weeks or months from `starts_on`
+    (DTSTART) until `until` (UNTIL, inclusive) if set. Weekly occurrences
+    fall on the ISO weekdays of `by_weekday` (BYDAY, 1 for Monday), and
+    monthly ones on the day of the month of `starts_on`, skipping months
+    too short for it.
+    """
+
+    frequency: RecurrenceFrequency
+    interval: int = Field(default=1, ge=1)
+    by_weekday: list[int] | None = Field(default=None, sa_type=ARRAY(SmallInteger))
+    starts_on: date
+    until: date | None = Field(default=None)
+
+
+class RecurringTask(RecurringTaskBase, table=True):
+    __tablename__ = "recurring_task"  # type: ignore
+
+    id: int = Field(default=None, primary_key=True)
+    # Last day the scheduler created occurrences up to, see
+    # `src/core/scheduler.py`. Occurrences are never created twice, so tasks
+    # deleted by users stay deleted.
+    materialized_through: date | None = Field(default=None)
+
+
+class RecurringTaskCreate(RecurringTaskBase):
+    @model_validator(mode="after")
+    def check_schedule(self) -> Self:
+        if self.until is not None and self.until < self.starts_on:
+            raise ValueError("until must not be before starts_on")
+        if self.frequency != RecurrenceFrequency.WEEKLY:
+            if self.by_weekday:
+                raise ValueError("by_weekday only applies to weekly schedules")
+        elif not self.by_weekday:
+            self.by_weekday = [self.starts_on.isoweekday()]
+        elif not all(1 <= weekday <= 7 for weekday in self.by_weekday):
+            raise ValueError("by_weekday values are ISO weekdays, from 1 to 7")
+        else:
+            self.by_weekday = sorted(set(self.by_weekday))
+        return self
+
+
+class RecurringTaskPublic(RecurringTaskBase):
+    id: int
+    materialized_through: date | None = None
+
+
+class TaskTombstone(SQLModel, table=True):
+    """Marker left behind by a deleted task for clients syncing changes."""
+
+    __tablename__ = "task_tombstone"  # type: ignore
+    __table_args__ = (
+        Index("ix_task_tombstone_change_xid_change_seq", "change_xid", "change_seq"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    task_id: int = Field(primary_key=True, sa_column_kwargs={"autoincrement": False})
+    deleted_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    change_seq: int = Field(
+        default=None,
+        index=True,
+        sa_type=BigInteger,
+        sa_column_kwargs={"server_default": task_change_seq.next_value()},
+    )
+    change_xid: int = Field(
+        default=None,
+        sa_type=BigInteger,
+        sa_column_kwargs={"server_default": text(CURRENT_XID)},
+    )
+
+
 class TaskPublic(TaskBase):
     id: int
+    updated_at: datetime | None = None
+    version: int = 1
+    recurring_task_id: int | None = None  # Set for occurrences of recurring tasks
     assignee: Optional[UserPublic] = None
 
 
+class TaskChanges(SQLModel):
+    tasks: list[TaskPublic]
+    deleted: list[int]
+    cursor: str
+    has_more: bool
+
+
 class TaskCreate(TaskBase): ...
 
 
+class TaskFilter(SQLModel):
+    status: TaskStatus | None = None
+    category: TaskCategory | None = None
+    assignee_id: uuid.UUID | None = None
+    due_from: date | None = None
+    due_to: date | None = None
+
+
 class TaskUpdate(SQLModel):
     title: str | None = None
     description: str | None = None
     assignee_id: uuid.UUID | None = None
     category: TaskCategory | None = None
     due_date: date | None = None
-    status: TaskStatus | None = None
\ No newline at end of file
+    status: TaskStatus | None = None
+    # The version the changes are based on; the update fails if the task has
+    # been updated since. Not a field to update.
+    version: int | None = None
+
+
+class TaskBulkUpdate(TaskUpdate):
+    id: int
+
+
+class TaskBulkError(SQLModel):
+    index: int  # Position of the item in the request body
+    detail: str
+
+
+class TaskBulkResult(SQLModel):
+    tasks: list[TaskPublic]
+    errors: list[TaskBulkError]
+
+
+class TaskBulkDeleteResult(SQLModel):
+    deleted: list[int]
+    errors: list[TaskBulkError]
+
+
+class TaskImportResult(SQLModel):
+    imported: int
+    skipped: int
+    # The first errors only, when many records are skipped
+    errors: list[TaskBulkError]
+
+
+class TaskCounts(SQLModel):
+    total: int = 0
+    completed: int = 0
+    # Not completed and due before the `today` of the request
+    overdue: int = 0
+
+
+class CategoryTaskCounts(TaskCounts):
+    category: TaskCategory
+
+
+class AssigneeTaskCounts(TaskCounts):
+    assignee_id: uuid.UUID | None  # None for unassigned tasks
+
+
+class TaskStats(SQLModel):
+    """Dashboard aggregates of the tasks matching a `TaskFilter`."""
+
+    counts: TaskCounts
+    by_status: dict[TaskStatus, int]
+    by_category: list[CategoryTaskCounts]
+    by_assignee: list[AssigneeTaskCounts]
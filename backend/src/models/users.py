@@ -2,6 +2,7 @@ import uuid
 from typing import TYPE_CHECKING
 
 from pydantic import EmailStr
+from sqlalchemy import BigInteger
 from sqlmodel import Field, Relationship, SQLModel
 
 # Just for ty to not show missing import error
@@ -20,6 +21,9 @@ class UserBase(SQLModel):
 
 class User(UserBase, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+    # Clerk `timestamp` (ms) of the latest webhook event applied to the user:
+    # older events, retried or delivered late, are not applied over it.
+    clerk_event_at: int | None = Field(default=None, sa_type=BigInteger)
     tasks: list["Task"] = Relationship(back_populates="assignee")
 
 
@@ -0,0 +1,72 @@
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Update,
+    func,
+    select,
+    union_all,
+    update,
+)
+from sqlmodel import Field, SQLModel
+
+from src.models.tasks import Task, TaskTombstone, committed_xid_horizon
+
+TASK_COLLECTION = "task"
+USER_COLLECTION = "user"
+
+
+class CollectionVersion(SQLModel, table=True):
+    """
+    Version counter of a collection, bumped by every transaction changing it.
+
+    Because the bump is an UPDATE in the writer's transaction, a new version
+    only becomes visible together with the data it describes, which makes it
+    safe to derive cache validators (ETags) from. Every writer contends for
+    the row, though: it suits rarely written collections (users), while
+    tasks derive their version from their own rows, see `task_version`.
+    """
+
+    __tablename__ = "collection_version"  # type: ignore
+
+    name: str = Field(primary_key=True, max_length=50)
+    version: int = Field(default=0, sa_type=BigInteger)
+
+
+def bump_versions(*names: str) -> Update:
+    """Statement bumping the version of the given collections."""
+    return (
+        update(CollectionVersion)
+        .where(CollectionVersion.name.in_(names))  # type: ignore
+        .values(version=CollectionVersion.version + 1)
+    )
+
+
+def task_version() -> ColumnElement[str]:
+    """
+    Version of the task collection, from the change keys of its rows.
+
+    Every write gives the row it leaves (a task, or the tombstone of a
+    deleted one) a new (change_xid, change_seq) key, without any row shared
+    by writers. Keys aren't drawn in commit order, so the version combines
+    the highest key below the committed horizon, which a later commit can
+    only raise, with the sum of the sequence numbers above it, which a later
+    commit always grows. Both are read from the changes feed indexes.
+    """
+    horizon = committed_xid_horizon()
+    changes = union_all(
+        select(Task.change_xid, Task.change_seq),
+        select(TaskTombstone.change_xid, TaskTombstone.change_seq),
+    ).subquery("changes")
+    settled = (
+        select(func.concat_ws("-", changes.c.change_xid, changes.c.change_seq))
+        .where(changes.c.change_xid < horizon)
+        .order_by(changes.c.change_xid.desc(), changes.c.change_seq.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    recent = (
+        select(func.coalesce(func.sum(changes.c.change_seq), 0))
+        .where(changes.c.change_xid >= horizon)
+        .scalar_subquery()
+    )
+    return func.concat_ws("-", func.coalesce(settled, "0"), recent)
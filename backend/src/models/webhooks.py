@@ -0,0 +1,75 @@
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import Computed, DateTime, Index, SmallInteger, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlmodel import Field, SQLModel
+
+# Events are spread over this many partitions by user, see
+# `src/webhooks/inbox.py`. Changing it needs a migration of both tables.
+WEBHOOK_INBOX_PARTITIONS = 16
+
+
+class WebhookInboxEvent(SQLModel, table=True):
+    """
+    Verified webhook event waiting to be applied, keyed by its `svix-id`.
+
+    Svix retries deliver the same ID again, so storing an event is idempotent.
+    `processed_at` is set once the event has been applied, or given up on (in
+    which case `error` says why).
+    """
+
+    __tablename__ = "webhook_inbox"  # type: ignore
+    # Only pending events are scanned by the worker, partition by partition.
+    __table_args__ = (
+        Index(
+            "ix_webhook_inbox_pending",
+            "partition",
+            "received_at",
+            postgresql_where=text("processed_at IS NULL"),
+        ),
+    )
+
+    svix_id: str = Field(primary_key=True, max_length=255)
+    event_type: str = Field(max_length=100)
+    payload: dict[str, Any] = Field(sa_type=JSONB)
+    received_at: datetime = Field(
+        default=None,
+        sa_type=DateTime(timezone=True),
+        sa_column_kwargs={"server_default": func.now()},
+    )
+    processed_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
+    attempts: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    error: str | None = Field(default=None)
+    # Events of a user (by the Clerk ID of their `data`) always share a
+    # partition.
+    partition: int = Field(
+        default=None,
+        sa_type=SmallInteger,
+        sa_column_kwargs={
+            "server_default": Computed(
+                "(hashtext(coalesce(payload -> 'data' ->> 'id', '')) & 2147483647)"
+                f" % {WEBHOOK_INBOX_PARTITIONS}",
+                persisted=True,
+            )
+        },
+    )
+
+
+class WebhookInboxPartition(SQLModel, table=True):
+    """
+    Lock of a partition of the webhook inbox for the worker.
+
+    A worker applies the events of a partition while holding its row locked,
+    so that the events of a user are never applied by two workers at once.
+    `claimed_at` makes workers go through partitions in turn.
+    """
+
+    __tablename__ = "webhook_inbox_partition"  # type: ignore
+
+    partition: int = Field(
+        primary_key=True,
+        sa_type=SmallInteger,
+        sa_column_kwargs={"autoincrement": False},
+    )
+    claimed_at: datetime | None = Field(default=None, sa_type=DateTime(timezone=True))
@@ -0,0 +1,159 @@
+"""
+Channels through which the notification dispatcher delivers notifications.
+
+A channel receives all the deliveries of a batch of events at once, so that
+it can deliver them in bulk. Raising fails the channel: its deliveries are
+retried later, but not those of the channels that succeeded. Channels must
+still tolerate seeing a delivery again, should the dispatcher stop between a
+delivery and its record.
+"""
+
+import logging
+import uuid
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import unnest_rows
+from src.models.notifications import (
+    Notification,
+    NotificationKind,
+    NotificationOutboxEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+notification_table = Notification.__table__  # type: ignore
+outbox_table = NotificationOutboxEvent.__table__  # type: ignore
+
+SUBJECTS = {
+    NotificationKind.TASK_CREATED_UNASSIGNED: "New task without assignee: {title}",
+    NotificationKind.TASK_UNASSIGNED: "Task left without assignee: {title}",
+}
+
+
+@dataclass(frozen=True)
+class Delivery:
+    """A notification of an outbox event to one of its recipients."""
+
+    event_id: int
+    kind: NotificationKind
+    task_id: int
+    payload: dict[str, Any]
+    user_id: uuid.UUID
+    email: str
+    full_name: str | None
+
+    @property
+    def subject(self) -> str:
+        return SUBJECTS[self.kind].format(title=self.payload.get("title", ""))
+
+
+class NotificationChannel(Protocol):
+    name: str
+
+    async def deliver(
+        self, session: AsyncSession, deliveries: Sequence[Delivery]
+    ) -> None:
+        """
+        Deliver `deliveries`.
+
+        `session` is a transaction of the channel's own, committed once the
+        deliveries succeed; channels writing to the database use it, so that
+        their writes are rolled back if they fail. No lock of the outbox is
+        held meanwhile.
+        """
+        ...
+
+
+class InAppChannel:
+    """Add notifications to the in-app inbox of their recipients."""
+
+    name = "in_app"
+
+    async def deliver(
+        self, session: AsyncSession, deliveries: Sequence[Delivery]
+    ) -> None:
+        if not deliveries:
+            return
+        data = unnest_rows(
+            notification_table,
+            ("event_id", "user_id"),
+            [{"event_id": d.event_id, "user_id": d.user_id} for d in deliveries],
+        )
+        # The rest of the notification is copied from its event.
+        statement = (
+            insert(notification_table)
+            .from_select(
+                ["event_id", "user_id", "kind", "task_id", "payload"],
+                select(
+                    data.c.event_id,
+                    data.c.user_id,
+                    outbox_table.c.kind,
+                    outbox_table.c.task_id,
+                    outbox_table.c.payload,
+                ).join(outbox_table, outbox_table.c.id == data.c.event_id),
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    notification_table.c.event_id,
+                    notification_table.c.user_id,
+                ]
+            )
+        )
+        await session.exec(statement)  # type: ignore
+
+
+class WebhookChannel:
+    """
+    POST the deliveries of a batch as one JSON document to `url`.
+
+    Args:
+        url: Endpoint receiving `{"notifications": [...]}`.
+        timeout: Seconds to wait for the endpoint.
+    """
+
+    name = "webhook"
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        self.url = url
+        self.timeout = timeout
+
+    async def deliver(
+        self, session: AsyncSession, deliveries: Sequence[Delivery]
+    ) -> None:
+        if not deliveries:
+            return
+        notifications = [
+            {
+                "event_id": d.event_id,
+                "kind": d.kind.value,
+                "task_id": d.task_id,
+                "user_id": str(d.user_id),
+                "subject": d.subject,
+                "payload": d.payload,
+            }
+            for d in deliveries
+        ]
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(
+                self.url, json={"notifications": notifications}
+            )
+            response.raise_for_status()
+
+
+class EmailChannel:
+    """Stand-in for email delivery, which logs the emails it would send."""
+
+    name = "email"
+
+    async def deliver(
+        self, session: AsyncSession, deliveries: Sequence[Delivery]
+    ) -> None:
+        for d in deliveries:
+            logger.info("Email to %s: %s", d.email, d.subject)
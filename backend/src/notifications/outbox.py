@@ -0,0 +1,360 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+
+from sqlalchemy import (
+    CTE,
+    ColumnElement,
+    FromClause,
+    case,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.engine import Row
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.db import async_engine
+from src.models.notifications import NotificationKind, NotificationOutboxEvent
+from src.models.users import User
+from src.notifications.channels import (
+    Delivery,
+    EmailChannel,
+    InAppChannel,
+    NotificationChannel,
+    WebhookChannel,
+)
+
+logger = logging.getLogger(__name__)
+
+outbox_table = NotificationOutboxEvent.__table__  # type: ignore
+
+
+def queue_task_notifications(
+    tasks: FromClause,
+    kind: NotificationKind,
+    actor_id: uuid.UUID | None,
+    condition: ColumnElement[bool],
+) -> CTE:
+    """
+    Queue a `kind` event for each of `tasks` matching `condition`.
+
+    The INSERT is returned as a CTE, to add to the statement writing the
+    tasks: events are only queued if the write commits.
+
+    Args:
+        tasks: The tasks written, e.g. the CTE of an INSERT returning them.
+        actor_id: The user writing the tasks, who isn't notified.
+    """
+    queued = insert(outbox_table).from_select(
+        ["kind", "task_id", "actor_id", "payload"],
+        select(
+            literal(kind, outbox_table.c.kind.type),
+            tasks.c.id,
+            literal(actor_id, outbox_table.c.actor_id.type),
+            func.jsonb_build_object("title", tasks.c.title),
+        ).where(condition),
+        include_defaults=False,
+    )
+    return queued.cte(f"queued_{kind.name.lower()}")
+
+
+async def pending_notification_count() -> int:
+    """Return the number of events not dispatched yet."""
+    statement = select(func.count()).where(outbox_table.c.dispatched_at.is_(None))
+    async with async_engine.connect() as connection:
+        return (await connection.execute(statement)).scalar_one()
+
+
+@dataclass
+class DispatcherStats:
+    """Counters for the notification dispatcher."""
+
+    batches: int = 0
+    events: int = 0
+    deliveries: int = 0
+    retried: int = 0
+    errors: int = 0
+
+
+class NotificationDispatcher:
+    """
+    Deliver the events of the notification outbox, in batches.
+
+    A batch is claimed with `FOR UPDATE SKIP LOCKED` in a short transaction,
+    which counts an attempt and moves `available_at` past the time the
+    channels may take: other dispatchers skip the batch while it is in
+    flight, and claim it again should this one die before marking it. The
+    channels then deliver it outside of any lock, and a second short
+    transaction records the outcome. The dispatchers of several API
+    processes can thus drain the outbox side by side. Recipients (every
+    active user but the one who caused the event) are resolved with one
+    query per batch, and each channel gets the deliveries of the whole batch
+    at once.
+
+    The outbox is the only buffer: a batch is only claimed once the previous
+    one is delivered, so slow channels hold events back in the database
+    rather than in memory. When a channel fails or times out, the event is
+    retried after `retry_delay`, doubled at each attempt, through the
+    channels that haven't delivered it yet, and given up on after
+    `max_attempts`. Delivery is at least once per channel: a channel only
+    sees an event again if the dispatcher died before recording that it
+    delivered it.
+
+    Args:
+        channels: Where notifications are delivered.
+        batch_size: Maximum events claimed per transaction.
+        poll_interval: Seconds between two checks of the outbox when no
+            notification wakes the dispatcher up.
+        max_attempts: Attempts after which a failing event is given up on.
+        retry_delay: Seconds before the first retry of a failed event.
+        delivery_timeout: Seconds a channel may take to deliver a batch.
+    """
+
+    def __init__(
+        self,
+        channels: Sequence[NotificationChannel],
+        batch_size: int = 200,
+        poll_interval: float = 5.0,
+        max_attempts: int = 5,
+        retry_delay: float = 10.0,
+        delivery_timeout: float = 10.0,
+    ):
+        self.channels = list(channels)
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.delivery_timeout = delivery_timeout
+        self.stats = DispatcherStats()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self, payload: str = "") -> None:
+        """Check the outbox now; usable as a `PostgresListener` callback."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="notifications")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            except (OSError, SQLAlchemyError):
+                self.stats.errors += 1
+                logger.warning("Draining the notification outbox failed", exc_info=True)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """Dispatch batches until none is due; return the event count."""
+        total = 0
+        while dispatched := await self.process_batch():
+            total += dispatched
+        return total
+
+    async def process_batch(self) -> int:
+        """Claim, deliver and mark one batch of events; return its size."""
+        events, recipients = await self._claim()
+        if not events:
+            return 0
+
+        errors: list[str] = []
+        delivered: dict[str, list[int]] = {}
+        delivery_count = 0
+        for channel in self.channels:
+            deliveries = [
+                Delivery(
+                    event_id=event.id,
+                    kind=event.kind,
+                    task_id=event.task_id,
+                    payload=event.payload,
+                    user_id=user.id,
+                    email=user.email,
+                    full_name=user.full_name,
+                )
+                for event in events
+                if channel.name not in event.delivered_channels
+                for user in recipients
+                if user.id != event.actor_id
+            ]
+            error = await self._deliver(channel, deliveries)
+            if error is None:
+                delivered[channel.name] = [event.id for event in events]
+                delivery_count += len(deliveries)
+            else:
+                errors.append(error)
+        await self._mark(
+            [event.id for event in events], delivered, "; ".join(errors) or None
+        )
+
+        self.stats.batches += 1
+        self.stats.events += len(events)
+        self.stats.deliveries += delivery_count
+        if errors:
+            self.stats.retried += len(events)
+        return len(events)
+
+    async def _claim(self) -> tuple[Sequence[Row], Sequence[Row]]:
+        """
+        Claim a batch of due events, with their recipients.
+
+        The events are put off for as long as the channels may take to
+        deliver them, and their attempt is counted, before the locks are
+        released.
+        """
+        due = (
+            select(outbox_table.c.id)
+            .where(
+                outbox_table.c.dispatched_at.is_(None),
+                outbox_table.c.available_at <= func.now(),
+            )
+            .order_by(outbox_table.c.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        # Each channel may take `delivery_timeout`, plus one more as a margin.
+        in_flight = timedelta(seconds=self.delivery_timeout * (len(self.channels) + 1))
+        claim = (
+            update(outbox_table)
+            .where(outbox_table.c.id.in_(due.scalar_subquery()))
+            .values(
+                attempts=outbox_table.c.attempts + 1,
+                available_at=func.now() + literal(in_flight),
+            )
+            .returning(outbox_table)
+        )
+        async with AsyncSession(async_engine) as session:
+            events = (await session.exec(claim)).all()  # type: ignore
+            if not events:
+                return [], []
+            recipients = (
+                await session.exec(
+                    select(User.id, User.email, User.full_name).where(  # type: ignore
+                        User.is_active  # type: ignore
+                    )
+                )
+            ).all()
+            await session.commit()
+        return sorted(events, key=lambda event: event.id), recipients
+
+    async def _deliver(
+        self, channel: NotificationChannel, deliveries: list[Delivery]
+    ) -> str | None:
+        """Deliver through `channel`; return the error, if any."""
+        try:
+            async with asyncio.timeout(self.delivery_timeout):
+                async with AsyncSession(async_engine) as session:
+                    await channel.deliver(session, deliveries)
+                    await session.commit()
+        # Channels are pluggable: whatever they raise fails the channel,
+        # not the dispatcher.
+        except Exception as exc:
+            logger.warning(
+                "Delivering notifications through %s failed",
+                channel.name,
+                exc_info=True,
+            )
+            return f"{channel.name}: {exc!r}"
+        return None
+
+    async def _mark(
+        self, event_ids: list[int], delivered: dict[str, list[int]], error: str | None
+    ) -> None:
+        """
+        Record the outcome of the attempt of each event, with the error if any.
+
+        `delivered` maps the channels that succeeded to their events. Events
+        delivered through every channel are marked as dispatched, failed
+        ones too once they reach `max_attempts`; the others are scheduled
+        for a retry.
+        """
+        async with AsyncSession(async_engine) as session:
+            for name, ids in delivered.items():
+                await session.exec(
+                    update(outbox_table)  # type: ignore
+                    .where(
+                        outbox_table.c.id.in_(ids),
+                        ~outbox_table.c.delivered_channels.any(name),
+                    )
+                    .values(
+                        delivered_channels=func.array_append(
+                            outbox_table.c.delivered_channels, name
+                        )
+                    )
+                )
+            names = [channel.name for channel in self.channels]
+            done = outbox_table.c.delivered_channels.contains(
+                literal(names, outbox_table.c.delivered_channels.type)
+            )
+            backoff = literal(timedelta(seconds=self.retry_delay)) * func.power(
+                2, outbox_table.c.attempts - 1
+            )
+            await session.exec(
+                update(outbox_table)  # type: ignore
+                .where(outbox_table.c.id.in_(event_ids))
+                .values(
+                    error=case(
+                        (done, None), else_=literal(error, outbox_table.c.error.type)
+                    ),
+                    dispatched_at=case(
+                        (
+                            done | (outbox_table.c.attempts >= self.max_attempts),
+                            func.now(),
+                        ),
+                        else_=None,
+                    ),
+                    available_at=func.now() + backoff,
+                )
+            )
+            await session.commit()
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+def channels_from_settings() -> list[NotificationChannel]:
+    channels: list[NotificationChannel] = [
+        InAppChannel() if name == "in_app" else EmailChannel()
+        for name in settings.NOTIFICATION_CHANNELS
+    ]
+    if settings.NOTIFICATION_WEBHOOK_URL:
+        channels.append(
+            WebhookChannel(
+                settings.NOTIFICATION_WEBHOOK_URL,
+                timeout=settings.NOTIFICATION_DELIVERY_TIMEOUT,
+            )
+        )
+    return channels
+
+
+notification_dispatcher = NotificationDispatcher(
+    channels=channels_from_settings(),
+    batch_size=settings.NOTIFICATION_BATCH_SIZE,
+    poll_interval=settings.NOTIFICATION_POLL_INTERVAL,
+    max_attempts=settings.NOTIFICATION_MAX_ATTEMPTS,
+    retry_delay=settings.NOTIFICATION_RETRY_DELAY,
+    delivery_timeout=settings.NOTIFICATION_DELIVERY_TIMEOUT,
+)
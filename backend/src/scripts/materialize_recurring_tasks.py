@@ -0,0 +1,66 @@
+"""
+Script to create the upcoming occurrences of recurring tasks.
+
+API workers do this in the background every `RECURRING_TASK_INTERVAL`
+seconds. This script does the same once, e.g. from cron when the scheduler
+of the API is not wanted, or to create occurrences further ahead. Runs are
+idempotent: occurrences are never created twice.
+
+Usage:
+    uv run python -m src.scripts.materialize_recurring_tasks
+
+    # Create occurrences due within the next 60 days:
+    uv run python -m src.scripts.materialize_recurring_tasks --horizon-days 60
+
+    # With dry-run mode (no changes made):
+    uv run python -m src.scripts.materialize_recurring_tasks --dry-run
+"""
+
+import argparse
+import asyncio
+from datetime import date
+
+from src.core.config import settings
+from src.core.db import async_engine
+from src.core.scheduler import RecurringTaskScheduler
+
+
+async def materialize(horizon_days: int, today: date | None, dry_run: bool) -> int:
+    scheduler = RecurringTaskScheduler(horizon_days=horizon_days)
+    try:
+        return await scheduler.run_once(today=today, dry_run=dry_run)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create upcoming occurrences of recurring tasks"
+    )
+    parser.add_argument(
+        "--horizon-days",
+        type=int,
+        default=settings.RECURRING_TASK_HORIZON_DAYS,
+        help="Create occurrences due within this many days (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--today",
+        type=date.fromisoformat,
+        help="Start from this ISO date instead of the current one",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show how many tasks would be created without creating them",
+    )
+
+    args = parser.parse_args()
+    created = asyncio.run(materialize(args.horizon_days, args.today, args.dry_run))
+    if args.dry_run:
+        print(f"Dry run - {created} tasks would be created")
+    else:
+        print(f"Created {created} tasks")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Script to replay events stored in the webhook inbox.
+
+Every verified Clerk webhook is kept in the `webhook_inbox` table. Replaying
+an event clears its processing state so the inbox worker applies it again,
+e.g. after fixing the cause of a failure or to rebuild users from history.
+Running API workers are woken up on commit; `--process-now` applies the
+events from this process instead.
+
+Usage:
+    # Retry the events that were given up on or rejected:
+    uv run python -m src.scripts.replay_webhooks --failed
+
+    # Replay given events:
+    uv run python -m src.scripts.replay_webhooks --svix-id msg_1 --svix-id msg_2
+
+    # Replay everything received since a date, and apply it right away:
+    uv run python -m src.scripts.replay_webhooks --since 2026-01-01 --process-now
+
+    # With dry-run mode (no changes made):
+    uv run python -m src.scripts.replay_webhooks --failed --dry-run
+"""
+
+import argparse
+import asyncio
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlmodel import Session
+
+from src.core.db import async_engine, engine
+from src.models.tasks import Task  # noqa: F401
+from src.webhooks.inbox import WEBHOOK_INBOX_CHANNEL, inbox_table, webhook_inbox_worker
+
+
+def replay_events(
+    svix_ids: list[str] | None = None,
+    failed: bool = False,
+    since: datetime | None = None,
+    dry_run: bool = False,
+) -> int:
+    """
+    Mark the selected inbox events as pending again.
+
+    Args:
+        svix_ids: Replay these events.
+        failed: Replay events processed with an error.
+        since: Replay events received at or after this time.
+        dry_run: If True, only count the events.
+
+    Returns:
+        Number of events selected for replay.
+    """
+    conditions = []
+    if svix_ids:
+        conditions.append(inbox_table.c.svix_id.in_(svix_ids))
+    if failed:
+        conditions.append(inbox_table.c.error.is_not(None))
+    if since:
+        conditions.append(inbox_table.c.received_at >= since)
+
+    with Session(engine) as db:
+        if dry_run:
+            statement = select(func.count()).select_from(inbox_table).where(*conditions)
+            return db.exec(statement).scalar_one()  # type: ignore
+
+        result = db.exec(
+            update(inbox_table)  # type: ignore
+            .where(*conditions)
+            .values(processed_at=None, attempts=0, error=None)
+        )
+        if result.rowcount:
+            db.exec(select(func.pg_notify(WEBHOOK_INBOX_CHANNEL, "")))  # type: ignore
+        db.commit()
+        return result.rowcount
+
+
+async def process_pending() -> int:
+    try:
+        return await webhook_inbox_worker.drain()
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay webhook inbox events")
+    parser.add_argument(
+        "--svix-id",
+        action="append",
+        dest="svix_ids",
+        help="Replay the event with this svix ID (repeatable)",
+    )
+    parser.add_argument(
+        "--failed",
+        action="store_true",
+        help="Replay events that were processed with an error",
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        help="Replay events received since this ISO date or time",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show how many events would be replayed without changing them",
+    )
+    parser.add_argument(
+        "--process-now",
+        action="store_true",
+        help="Apply pending events from this process instead of the API workers",
+    )
+
+    args = parser.parse_args()
+    if not (args.svix_ids or args.failed or args.since):
+        parser.error("select events with --svix-id, --failed or --since")
+
+    count = replay_events(
+        svix_ids=args.svix_ids,
+        failed=args.failed,
+        since=args.since,
+        dry_run=args.dry_run,
+    )
+    if args.dry_run:
+        print(f"Dry run - {count} events would be replayed")
+        return
+    print(f"Replaying {count} events")
+
+    if args.process_now and count:
+        processed = asyncio.run(process_pending())
+        print(f"Processed {processed} events")
+
+
+if __name__ == "__main__":
+    main()
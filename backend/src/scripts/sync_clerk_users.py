@@ -15,18 +15,73 @@ Usage:
 
     # Deactivate users not in Clerk:
     uv run python -m src.scripts.sync_clerk_users --deactivate-missing
+
+    # Request more pages from Clerk at once (default: 4):
+    uv run python -m src.scripts.sync_clerk_users --concurrency 8
+
+    # Only sync users changed since the last run, with a full sync at most
+    # every 24 hours (e.g. from cron, every few minutes):
+    uv run python -m src.scripts.sync_clerk_users --incremental --full-sync-every 24
 """
 
 import argparse
+import asyncio
+import os
+import random
 import sys
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 
 import httpx
-from sqlmodel import Session, select
-
-from src.core.db import engine
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Executable,
+    MetaData,
+    String,
+    Table,
+    case,
+    exists,
+    false,
+    func,
+    literal_column,
+    select,
+    text,
+    true,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.serializers import USER_FIELDS
+from src.core.db import async_engine
+from src.core.outbox import json_object, queue_domain_events
+from src.core.user_cache import ALL_USERS, invalidation_notify, shared_invalidation
 from src.models.tasks import Task  # noqa: F401
+from src.models.sync import CLERK_USERS_SYNC, SyncCheckpoint
 from src.models.users import User
+from src.models.versions import USER_COLLECTION, bump_versions
+
+CLERK_API_URL = "https://api.clerk.com/v1"
+PAGE_SIZE = 100  # Max allowed by Clerk
+# Rate limited (429) and server errors are retried, other errors aren't.
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5  # seconds, doubled on every retry
+
+STAGED_COLUMNS = ("clerk_id", "email", "full_name", "image_url")
+
+DEFAULT_FULL_SYNC_INTERVAL = timedelta(hours=24)
+# Incremental syncs go back a bit before the checkpoint, so that users
+# updated in the same millisecond, or indexed late by Clerk, aren't missed.
+# Users synced twice are left unchanged.
+CHECKPOINT_OVERLAP_MS = 60_000
+
+user_table = User.__table__  # type: ignore
 
 
 @dataclass
@@ -38,6 +93,8 @@ class SyncStats:
     deactivated: int = 0
     unchanged: int = 0
     errors: int = 0
+    # Latest Clerk `updated_at` among the synced users, in Unix milliseconds.
+    last_updated_at: int | None = None
 
 
 class ClerkAPIError(Exception):
@@ -46,8 +103,6 @@ class ClerkAPIError(Exception):
 
 def get_clerk_secret_key() -> str:
     """Get the Clerk secret key from environment."""
-    import os
-
     secret_key = os.getenv("CLERK_SECRET_KEY")
     if not secret_key:
         raise ValueError(
@@ -57,54 +112,173 @@ def get_clerk_secret_key() -> str:
     return secret_key
 
 
-def fetch_all_clerk_users() -> list[dict]:
+def clerk_api_client(
+    concurrency: int = DEFAULT_CONCURRENCY,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
     """
-    Fetch all users from Clerk API with pagination.
-
-    Returns:
-        List of user dictionaries from Clerk.
+    Create a client for Clerk's Backend API, keeping up to `concurrency`
+    connections alive between requests.
 
-    Raises:
-        ClerkAPIError: If the API request fails.
+    The API URL defaults to Clerk's, and can be pointed at another server
+    (e.g. a local mock) with the CLERK_API_URL environment variable.
     """
     secret_key = get_clerk_secret_key()
-    base_url = "https://api.clerk.com/v1/users"
-    headers = {
-        "Authorization": f"Bearer {secret_key}",
-        "Content-Type": "application/json",
-    }
+    return httpx.AsyncClient(
+        base_url=os.getenv("CLERK_API_URL", CLERK_API_URL),
+        headers={
+            "Authorization": f"Bearer {secret_key}",
+            "Content-Type": "application/json",
+        },
+        timeout=30.0,
+        limits=httpx.Limits(
+            max_connections=concurrency, max_keepalive_connections=concurrency
+        ),
+        transport=transport,
+    )
 
-    all_users = []
-    limit = 100  # Max allowed by Clerk
-    offset = 0
 
-    with httpx.Client(timeout=30.0) as client:
-        while True:
-            params = {"limit": limit, "offset": offset}
+def retry_delay(response: httpx.Response | None, attempt: int, backoff: float) -> float:
+    """Seconds to wait before retrying: Clerk's Retry-After, else exponential."""
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    # Full jitter keeps concurrent requests from retrying in lockstep.
+    return random.uniform(0, backoff * 2**attempt)
+
+
+async def fetch_user_page(
+    client: httpx.AsyncClient,
+    offset: int,
+    limit: int = PAGE_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    order_by: str = "+created_at",
+) -> list[dict]:
+    """
+    Fetch one page of users, retrying rate limited and failed requests.
 
-            try:
-                response = client.get(base_url, headers=headers, params=params)
-                response.raise_for_status()
-            except httpx.HTTPStatusError as e:
-                raise ClerkAPIError(
-                    f"Clerk API error: {e.response.status_code} - {e.response.text}"
-                ) from e
-            except httpx.RequestError as e:
-                raise ClerkAPIError(f"Request error: {e}") from e
+    Users are sorted by `order_by`. The default, oldest first, makes users
+    signing up during a sync land on the last pages instead of shifting the
+    ones not fetched yet.
 
-            users = response.json()
+    Raises:
+        ClerkAPIError: If the request still fails after `max_retries` retries,
+            or fails with a status that isn't worth retrying.
+    """
+    params = {"limit": limit, "offset": offset, "order_by": order_by}
+    attempt = 0
+    while True:
+        response = None
+        try:
+            response = await client.get("/users", params=params)
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            error = ClerkAPIError(
+                f"Clerk API error: {e.response.status_code} - {e.response.text}"
+            )
+            if e.response.status_code not in RETRY_STATUSES:
+                raise error from e
+        except httpx.RequestError as e:
+            error = ClerkAPIError(f"Request error: {e}")
+
+        if attempt == max_retries:
+            raise error
+        await asyncio.sleep(retry_delay(response, attempt, backoff))
+        attempt += 1
+
+
+async def fetch_clerk_user_pages(
+    client: httpx.AsyncClient,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    page_size: int = PAGE_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream all users from Clerk API, one page at a time.
 
-            if not users:
-                break
+    Up to `concurrency` pages are requested at once, at consecutive offsets,
+    and each page is yielded as soon as it arrives, so pages come in no
+    particular order. The first page shorter than `page_size` marks the end
+    of the directory; no page past it is requested.
 
-            all_users.extend(users)
+    Yields:
+        Lists of user dictionaries from Clerk.
 
-            if len(users) < limit:
-                break
+    Raises:
+        ClerkAPIError: If a page can't be fetched.
+    """
+    pending: dict[asyncio.Task, int] = {}
+    next_offset = 0
+    end_offset: int | None = None
+
+    def schedule() -> None:
+        nonlocal next_offset
+        while len(pending) < concurrency and (
+            end_offset is None or next_offset < end_offset
+        ):
+            page = fetch_user_page(client, next_offset, page_size, max_retries, backoff)
+            pending[asyncio.create_task(page)] = next_offset
+            next_offset += page_size
+
+    try:
+        schedule()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                offset = pending.pop(task)
+                users = task.result()
+                if len(users) < page_size:
+                    end = offset + len(users)
+                    end_offset = end if end_offset is None else min(end_offset, end)
+                if users:
+                    yield users
+            schedule()
+    finally:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+async def fetch_changed_user_pages(
+    client: httpx.AsyncClient,
+    since: int,
+    page_size: int = PAGE_SIZE,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+) -> AsyncIterator[list[dict]]:
+    """
+    Stream the users updated at or after `since`, most recently updated first.
 
-            offset += limit
+    Pages are fetched one after the other, until one reaches a user updated
+    before `since`; usually, a single page is enough. A user updated while
+    the pages are walked moves to the first page and may be skipped, but is
+    then newer than any user seen, so the next incremental sync gets it.
 
-    return all_users
+    Args:
+        client: Client returned by `clerk_api_client`.
+        since: Unix timestamp in milliseconds.
+
+    Yields:
+        Lists of user dictionaries from Clerk.
+
+    Raises:
+        ClerkAPIError: If a page can't be fetched.
+    """
+    offset = 0
+    while True:
+        users = await fetch_user_page(
+            client, offset, page_size, max_retries, backoff, order_by="-updated_at"
+        )
+        changed = [user for user in users if (user.get("updated_at") or 0) >= since]
+        if changed:
+            yield changed
+        if len(changed) < page_size:
+            return
+        offset += page_size
 
 
 def extract_user_data(clerk_user: dict) -> dict:
@@ -144,169 +318,349 @@ def extract_user_data(clerk_user: dict) -> dict:
     }
 
 
-def sync_user(
-    db: Session, clerk_user_data: dict, dry_run: bool = False
-) -> tuple[str, User | None]:
+def staging_table() -> Table:
+    """Temporary table receiving the users fetched from Clerk, dropped on commit."""
+    return Table(
+        "clerk_user_staging",
+        MetaData(),
+        *(Column(name, String) for name in STAGED_COLUMNS),
+        prefixes=["TEMPORARY"],
+        postgresql_on_commit="DROP",
+    )
+
+
+async def stage_users(db: AsyncSession, staging: Table, clerk_users: list[dict]) -> int:
     """
-    Sync a single Clerk user with the database.
+    Copy a page of Clerk users into the staging table.
 
     Args:
         db: Database session.
-        clerk_user_data: Extracted user data from Clerk.
-        dry_run: If True, don't make any changes.
+        staging: Table returned by `staging_table`, created in this transaction.
+        clerk_users: User objects from Clerk.
+
+    Users without an email address can't be synced, but are staged with a
+    NULL `email` all the same: they still exist in Clerk, and must not be
+    deactivated as missing.
 
     Returns:
-        Tuple of (action, user) where action is 'created', 'updated', 'unchanged', or 'error'.
+        Number of users skipped because of missing data.
     """
-    clerk_id = clerk_user_data.get("clerk_id")
-    email = clerk_user_data.get("email")
+    records = []
+    errors = 0
+    for clerk_user in clerk_users:
+        user_data = extract_user_data(clerk_user)
+        if not user_data["clerk_id"] or not user_data["email"]:
+            print(f"   Skipping user with missing data: {user_data}")
+            errors += 1
+            if not user_data["clerk_id"]:
+                continue
+        records.append(tuple(user_data[name] for name in STAGED_COLUMNS))
+
+    if records:
+        connection = await (await db.connection()).get_raw_connection()
+        await connection.driver_connection.copy_records_to_table(  # type: ignore
+            staging.name, records=records, columns=STAGED_COLUMNS
+        )
+    return errors
 
-    if not clerk_id or not email:
-        print(f"   Skipping user with missing data: {clerk_user_data}")
-        return ("error", None)
 
-    existing_user = db.exec(select(User).where(User.clerk_id == clerk_id)).first()
+def changed_users(staging: Table, dry_run: bool) -> Executable:
+    """
+    Statement creating or updating the staged users that differ locally.
 
-    if existing_user:
-        needs_update = False
-        changes = []
+    Users whose synced columns are unchanged, and who are active, are left
+    alone, and so are users staged without an email address. The statement returns the `email` of each user it changes, and
+    `created`, true if the user is new, and queues a `user.created` or
+    `user.updated` domain event for each.
 
-        if existing_user.email != email:
-            changes.append(f"email: {existing_user.email} -> {email}")
-            needs_update = True
+    When `dry_run` is True, it's a SELECT returning the same rows without
+    changing anything.
+    """
+    # A user may be fetched twice if pages shift during the sync.
+    staged = (
+        select(staging)
+        .where(staging.c.email.is_not(None))
+        .distinct(staging.c.clerk_id)
+        .subquery("staged")
+    )
+    synced = ("email", "full_name", "image_url")
 
-        if existing_user.full_name != clerk_user_data.get("full_name"):
-            changes.append(
-                f"full_name: {existing_user.full_name} -> {clerk_user_data.get('full_name')}"
+    if dry_run:
+        existing = user_table.alias("existing")
+        return (
+            select(staged.c.email, existing.c.id.is_(None).label("created"))
+            .outerjoin(existing, existing.c.clerk_id == staged.c.clerk_id)
+            .where(
+                tuple_(
+                    *(existing.c[name] for name in synced), existing.c.is_active
+                ).is_distinct_from(tuple_(*(staged.c[name] for name in synced), true()))
             )
-            needs_update = True
+        )
 
-        if existing_user.image_url != clerk_user_data.get("image_url"):
-            changes.append(
-                f"image_url: {existing_user.image_url} -> {clerk_user_data.get('image_url')}"
-            )
-            needs_update = True
-
-        if not existing_user.is_active:
-            changes.append("is_active: False -> True")
-            needs_update = True
-
-        if needs_update:
-            if not dry_run:
-                existing_user.email = email
-                existing_user.full_name = clerk_user_data.get("full_name")
-                existing_user.image_url = clerk_user_data.get("image_url")
-                existing_user.is_active = True
-                db.add(existing_user)
-            print(f"  Updated: {email} ({', '.join(changes)})")
-            return ("updated", existing_user)
-        else:
-            return ("unchanged", existing_user)
-    else:
-        new_user = User(
-            clerk_id=clerk_id,
-            email=email,
-            full_name=clerk_user_data.get("full_name"),
-            image_url=clerk_user_data.get("image_url"),
-            is_active=True,
-            is_superuser=False,
+    upsert = insert(user_table).from_select(
+        ["id", "clerk_id", *synced, "is_active", "is_superuser"],
+        select(
+            func.gen_random_uuid(),
+            staged.c.clerk_id,
+            *(staged.c[name] for name in synced),
+            true(),
+            false(),
+        ),
+    )
+    # xmax is only set on rows the statement updated, not on inserted ones.
+    created = literal_column("xmax = 0", Boolean)
+    written = (
+        upsert.on_conflict_do_update(
+            index_elements=[user_table.c.clerk_id],
+            set_={
+                **{name: upsert.excluded[name] for name in synced},
+                "is_active": true(),
+            },
+            where=tuple_(
+                *(user_table.c[name] for name in synced), user_table.c.is_active
+            ).is_distinct_from(
+                tuple_(*(upsert.excluded[name] for name in synced), true())
+            ),
         )
-        if not dry_run:
-            db.add(new_user)
-        print(f"  Created: {email}")
-        return ("created", new_user)
+        .returning(*user_table.c, created.label("created"))
+        .cte("written")
+    )
+    event_type = case((written.c.created, "user.created"), else_="user.updated")
+    return select(written.c.email, written.c.created).add_cte(
+        queue_domain_events(
+            written,
+            "user",
+            event_type,
+            written.c.id,
+            json_object(written, USER_FIELDS),
+        )
+    )
+
+
+def missing_users(staging: Table, dry_run: bool) -> Executable:
+    """
+    Statement deactivating the active users that weren't staged.
 
+    It returns the `email` of each of them, and queues a `user.deactivated`
+    domain event for each; when `dry_run` is True, it's a
+    SELECT returning them without changing anything.
+    """
+    missing = user_table.c.is_active & ~exists().where(
+        staging.c.clerk_id == user_table.c.clerk_id
+    )
+    if dry_run:
+        return select(user_table.c.email).where(missing)
+    deactivated = (
+        update(user_table)
+        .where(missing)
+        .values(is_active=False)
+        .returning(*user_table.c)
+        .cte("deactivated")
+    )
+    return select(deactivated.c.email).add_cte(
+        queue_domain_events(
+            deactivated,
+            "user",
+            "user.deactivated",
+            deactivated.c.id,
+            json_object(deactivated, USER_FIELDS),
+        )
+    )
 
-def deactivate_missing_users(
-    db: Session, clerk_user_ids: set[str], dry_run: bool = False
-) -> int:
+
+async def sync_user_pages(
+    db: AsyncSession,
+    pages: AsyncIterator[list[dict]],
+    dry_run: bool = False,
+    deactivate_missing: bool = False,
+) -> SyncStats:
     """
-    Deactivate local users that no longer exist in Clerk.
+    Sync pages of Clerk users with the database, without committing.
+
+    Each page is copied into a temporary staging table as it arrives. The
+    users are then created or updated by a single INSERT ... ON CONFLICT, and
+    the missing ones deactivated by a single UPDATE, whatever their number.
 
     Args:
         db: Database session.
-        clerk_user_ids: Set of Clerk user IDs.
-        dry_run: If True, don't make any changes.
+        pages: Pages of user objects from Clerk.
+        dry_run: If True, only report what would change.
+        deactivate_missing: If True, deactivate local users not in Clerk.
 
     Returns:
-        Number of users deactivated.
+        SyncStats with counts of actions taken.
     """
-    local_users = db.exec(
-        select(User).where(User.is_active)  # noqa: E712
-    ).all()
+    stats = SyncStats()
+    staging = staging_table()
+    await (await db.connection()).run_sync(staging.create)
+
+    async for page in pages:
+        stats.errors += await stage_users(db, staging, page)
+        for user in page:
+            updated_at = user.get("updated_at")
+            if updated_at and updated_at > (stats.last_updated_at or 0):
+                stats.last_updated_at = updated_at
+
+    # Temporary tables aren't analyzed automatically; without statistics
+    # the planner can't pick a hash join for the whole directory.
+    await db.exec(text(f"ANALYZE {staging.name}"))  # type: ignore
+    staged = (
+        await db.exec(
+            select(func.count(staging.c.clerk_id.distinct())).where(  # type: ignore
+                staging.c.email.is_not(None)
+            )
+        )
+    ).scalar_one()
+    print(f"Found {staged} users in Clerk")
 
-    deactivated = 0
-    for user in local_users:
-        if user.clerk_id not in clerk_user_ids:
-            if not dry_run:
-                user.is_active = False
-                db.add(user)
-            print(f"  Deactivated: {user.email} (not found in Clerk)")
-            deactivated += 1
+    for email, created in (await db.exec(changed_users(staging, dry_run))).all():  # type: ignore
+        if created:
+            stats.created += 1
+            print(f"  Created: {email}")
+        else:
+            stats.updated += 1
+            print(f"  Updated: {email}")
+    stats.unchanged = staged - stats.created - stats.updated
 
-    return deactivated
+    if deactivate_missing:
+        print("\n Checking for users to deactivate...")
+        for (email,) in (await db.exec(missing_users(staging, dry_run))).all():  # type: ignore
+            stats.deactivated += 1
+            print(f"  Deactivated: {email} (not found in Clerk)")
 
+    return stats
+
+
+def needs_full_sync(
+    checkpoint: SyncCheckpoint | None, full_sync_interval: timedelta, now: datetime
+) -> bool:
+    """Whether an incremental sync must fall back to a full one."""
+    return (
+        checkpoint is None
+        or checkpoint.high_water_mark is None
+        or checkpoint.last_full_sync_at is None
+        or now - checkpoint.last_full_sync_at >= full_sync_interval
+    )
 
-def sync_clerk_users(
-    dry_run: bool = False, deactivate_missing: bool = False
+
+async def save_checkpoint(
+    db: AsyncSession,
+    checkpoint: SyncCheckpoint | None,
+    stats: SyncStats,
+    full: bool,
+    now: datetime,
+) -> None:
+    """Record the run in the Clerk users checkpoint, without committing."""
+    marks = (checkpoint and checkpoint.high_water_mark, stats.last_updated_at)
+    high_water_mark = max((mark for mark in marks if mark), default=None)
+    values = {"high_water_mark": high_water_mark, "last_run_at": now}
+    if full:
+        values["last_full_sync_at"] = now
+    statement = insert(SyncCheckpoint).values(name=CLERK_USERS_SYNC, **values)
+    await db.exec(
+        statement.on_conflict_do_update(  # type: ignore
+            index_elements=[SyncCheckpoint.name], set_=values
+        )
+    )
+
+
+async def sync_clerk_users(
+    dry_run: bool = False,
+    deactivate_missing: bool = False,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    incremental: bool = False,
+    full_sync_interval: timedelta = DEFAULT_FULL_SYNC_INTERVAL,
 ) -> SyncStats:
     """
     Main sync function that orchestrates the sync process.
 
+    Pages of Clerk users are staged as they arrive, while the next ones are
+    being fetched. Nothing is committed unless every page was fetched.
+
+    Every run records the latest `updated_at` it saw in a checkpoint. An
+    incremental run only fetches the users updated since then; it falls back
+    to a full sync when there is no checkpoint yet, or when the last full
+    sync is older than `full_sync_interval`. Only full syncs can deactivate
+    missing users.
+
     Args:
         dry_run: If True, don't make any database changes.
         deactivate_missing: If True, deactivate local users not in Clerk.
+        concurrency: Maximum number of pages requested from Clerk at once.
+        incremental: If True, only sync users changed since the last run.
+        full_sync_interval: Maximum time between two full syncs, for
+            incremental runs.
 
     Returns:
         SyncStats with counts of actions taken.
     """
-    stats = SyncStats()
-
-    print("Fetching users from Clerk...")
-    try:
-        clerk_users = fetch_all_clerk_users()
-    except ClerkAPIError as e:
-        print(f"Failed to fetch Clerk users: {e}")
-        sys.exit(1)
-
-    print(f"Found {len(clerk_users)} users in Clerk")
-
     if dry_run:
         print("\n DRY RUN MODE - No changes will be made\n")
 
-    print("\n Syncing users...")
-
-    clerk_user_ids = set()
-
-    with Session(engine) as db:
-        for clerk_user in clerk_users:
-            user_data = extract_user_data(clerk_user)
-            clerk_user_ids.add(user_data["clerk_id"])
-
-            action, _ = sync_user(db, user_data, dry_run)
-
-            if action == "created":
-                stats.created += 1
-            elif action == "updated":
-                stats.updated += 1
-            elif action == "unchanged":
-                stats.unchanged += 1
-            elif action == "error":
-                stats.errors += 1
+    async with (
+        clerk_api_client(concurrency) as client,
+        AsyncSession(async_engine) as db,
+    ):
+        now = datetime.now(timezone.utc)
+        # Locked so that overlapping runs (e.g. from cron) take turns.
+        checkpoint = (
+            await db.exec(
+                select(SyncCheckpoint)
+                .where(SyncCheckpoint.name == CLERK_USERS_SYNC)
+                .with_for_update()
+            )
+        ).scalar_one_or_none()
+        full = not incremental or needs_full_sync(checkpoint, full_sync_interval, now)
 
-        if deactivate_missing:
-            print("\n Checking for users to deactivate...")
-            stats.deactivated = deactivate_missing_users(db, clerk_user_ids, dry_run)
+        if full:
+            print("Fetching and syncing all users from Clerk...")
+            pages = fetch_clerk_user_pages(client, concurrency)
+        else:
+            since = checkpoint.high_water_mark - CHECKPOINT_OVERLAP_MS  # type: ignore
+            print(
+                "Fetching and syncing users changed since "
+                f"{datetime.fromtimestamp(since / 1000, timezone.utc):%Y-%m-%d %H:%M:%S}..."
+            )
+            pages = fetch_changed_user_pages(client, since)
+            if deactivate_missing:
+                print("Incremental sync: missing users are deactivated by full syncs")
+
+        try:
+            stats = await sync_user_pages(
+                db,
+                pages,
+                dry_run=dry_run,
+                deactivate_missing=deactivate_missing and full,
+            )
+        except ClerkAPIError as e:
+            print(f"Failed to fetch Clerk users: {e}")
+            sys.exit(1)
 
         if not dry_run:
-            db.commit()
+            await save_checkpoint(db, checkpoint, stats, full, now)
+            if stats.created or stats.updated or stats.deactivated:
+                await db.exec(bump_versions(USER_COLLECTION))
+                # The API workers run in other processes: with shared
+                # invalidation they drop their cached users on commit,
+                # otherwise changes reach them after USER_CACHE_TTL.
+                if shared_invalidation():
+                    await db.exec(invalidation_notify(ALL_USERS))  # type: ignore
+            await db.commit()
             print("\n Changes committed to database")
         else:
+            await db.rollback()
             print("\n Dry run - no changes were made")
 
     return stats
 
 
+async def run_sync(**options) -> SyncStats:
+    try:
+        return await sync_clerk_users(**options)
+    finally:
+        await async_engine.dispose()
+
+
 def main():
     parser = argparse.ArgumentParser(description="Sync Clerk users with local database")
     parser.add_argument(
@@ -319,6 +673,24 @@ def main():
         action="store_true",
         help="Deactivate local users not found in Clerk",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum number of pages requested from Clerk at once",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only sync users changed since the last run",
+    )
+    parser.add_argument(
+        "--full-sync-every",
+        type=float,
+        default=DEFAULT_FULL_SYNC_INTERVAL.total_seconds() / 3600,
+        metavar="HOURS",
+        help="With --incremental, run a full sync when the last one is older",
+    )
 
     args = parser.parse_args()
 
@@ -326,8 +698,14 @@ def main():
     print("Clerk User Sync Script")
     print("=" * 50)
 
-    stats = sync_clerk_users(
-        dry_run=args.dry_run, deactivate_missing=args.deactivate_missing
+    stats = asyncio.run(
+        run_sync(
+            dry_run=args.dry_run,
+            deactivate_missing=args.deactivate_missing,
+            concurrency=args.concurrency,
+            incremental=args.incremental,
+            full_sync_interval=timedelta(hours=args.full_sync_every),
+        )
     )
 
     print("\n" + "=" * 50)
@@ -1,211 +1,307 @@
 # app/webhooks/handlers.py
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import Session
-
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from sqlalchemy import (
+    ColumnElement,
+    case,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.serializers import USER_FIELDS
+from src.core.db import unnest_rows
+from src.core.outbox import json_object, queue_domain_events
 from src.models.users import User
+from src.models.versions import USER_COLLECTION, bump_versions
+
+USER_UPSERT_EVENTS = ("user.created", "user.updated")
+USER_DELETE_EVENT = "user.deleted"
+
+# Columns taken from Clerk; the others are only set when a user is created.
+SYNCED_USER_FIELDS = ("email", "full_name", "image_url")
+
+user_table = User.__table__  # type: ignore
 
 
 class WebhookDataError(ValueError):
     """Raised when incoming webhook data is invalid or incomplete."""
 
 
-def handle_user_created(db: Session, user_data: dict) -> None:
+def user_fields(user_data: dict) -> dict:
     """
-    Handle the creation of a new user from Clerk webhook data.
-
-    This function processes user creation webhook events from Clerk, extracting user
-    information and creating a corresponding User record in the database.
+    Extract the local user columns from a Clerk user object.
 
     Args:
-        db (Session): SQLAlchemy database session for database operations.
-        user_data (dict): Dictionary containing user data from Clerk webhook with the following structure:
+        user_data (dict): Clerk user object, as sent in the `data` of user webhook
+            events, with the following structure:
             - id (str): Clerk user ID
             - email_addresses (list): List of email address objects, where first item contains:
                 - email_address (str): User's email address
             - first_name (str, optional): User's first name
             - last_name (str, optional): User's last name
+            - image_url (str, optional): User's profile image URL
 
     Returns:
-        None
-
-    Side effects:
-        It commits the new user to the database.
+        dict: `clerk_id`, `email`, `full_name` and `image_url`.
 
     Raises:
-        SQLAlchemyError: If there's an error during database operations.
-        KeyError: If required fields are missing from user_data.
-        IndexError: If email_addresses list is empty.
+        WebhookDataError: If the Clerk ID or the email address is missing or
+            malformed.
 
     Example:
-        >>> user_data = {
-        ...     "id": "user_123",
-        ...     "email_addresses": [{"email_address": "user@example.com"}],
-        ...     "first_name": "John",
-        ...     "last_name": "Doe",
-        ... }
-        >>> handle_user_created(db_session, user_data)
+        >>> user_fields(
+        ...     {
+        ...         "id": "user_123",
+        ...         "email_addresses": [{"email_address": "user@example.com"}],
+        ...         "first_name": "John",
+        ...         "last_name": "Doe",
+        ...     }
+        ... )
+        {'clerk_id': 'user_123', 'email': 'user@example.com', 'full_name': 'John Doe', 'image_url': None}
     """
-    try:
-        clerk_id = user_data.get("id")
-        if not clerk_id:
-            raise WebhookDataError("Clerk ID is missing")
+    if not isinstance(user_data, dict):
+        raise WebhookDataError("Invalid user data")
 
-        email_addresses = user_data.get("email_addresses")
-        if not email_addresses or not isinstance(email_addresses, list):
-            raise WebhookDataError("Missing or invalid email addresses")
+    clerk_id = user_data.get("id")
+    if not clerk_id or not isinstance(clerk_id, str):
+        raise WebhookDataError("Clerk ID is missing")
 
-        primary_email = email_addresses[0].get("email_address")
-        if not primary_email:
-            raise WebhookDataError("Missing email address")
+    email_addresses = user_data.get("email_addresses")
+    if not email_addresses or not isinstance(email_addresses, list):
+        raise WebhookDataError("Missing or invalid email addresses")
+    if not isinstance(email_addresses[0], dict):
+        raise WebhookDataError("Invalid email address")
 
-        first_name = user_data.get("first_name", "")
-        last_name = user_data.get("last_name", "")
+    primary_email = email_addresses[0].get("email_address")
+    if not primary_email or not isinstance(primary_email, str):
+        raise WebhookDataError("Missing email address")
 
-        full_name = (
-            f"{first_name} {last_name}".strip() if first_name or last_name else None
-        )
-
-        image_url = user_data.get("image_url")
+    first_name = user_data.get("first_name", "")
+    last_name = user_data.get("last_name", "")
+    full_name = f"{first_name or ''} {last_name or ''}".strip() or None
 
-        user = User(
-            clerk_id=clerk_id,
-            email=primary_email,
-            full_name=full_name,
-            image_url=image_url,
-            is_active=True,
-            is_superuser=False,
-        )
+    return {
+        "clerk_id": clerk_id,
+        "email": primary_email,
+        "full_name": full_name,
+        "image_url": user_data.get("image_url"),
+    }
 
-        db.add(user)
-        db.commit()
 
-    except WebhookDataError:
-        db.rollback()
-        raise
+@dataclass
+class UserChanges:
+    """
+    Net effect of a batch of Clerk user events.
+
+    Attributes:
+        upserts: Latest user columns per Clerk ID, for users to create or update.
+        deletes: Clerk IDs of users to deactivate.
+        events: svix IDs of the events that led to each Clerk ID's change.
+        timestamps: Clerk `timestamp` (ms) of the latest of these events, for
+            the Clerk IDs whose events have one.
+        invalid: Error per svix ID, for events that can't ever be applied.
+    """
 
-    except SQLAlchemyError as exc:
-        db.rollback()
-        raise RuntimeError("Database error while creating a user") from exc
+    upserts: dict[str, dict] = field(default_factory=dict)
+    deletes: set[str] = field(default_factory=set)
+    events: dict[str, list[str]] = field(default_factory=dict)
+    timestamps: dict[str, int] = field(default_factory=dict)
+    invalid: dict[str, str] = field(default_factory=dict)
+
+    def only(self, clerk_id: str) -> "UserChanges":
+        """Return the change of a single user."""
+        return UserChanges(
+            upserts={clerk_id: self.upserts[clerk_id]}
+            if clerk_id in self.upserts
+            else {},
+            deletes={clerk_id} & self.deletes,
+            events={clerk_id: self.events[clerk_id]},
+            timestamps={clerk_id: self.timestamps[clerk_id]}
+            if clerk_id in self.timestamps
+            else {},
+        )
 
 
-def handle_user_updated(db: Session, user_data: dict) -> None:
+def coalesce_user_events(events: Iterable[tuple[str, str, dict]]) -> UserChanges:
     """
-    Handle the update of an existing user from Clerk webhook data.
+    Reduce user webhook events to the last known state of each user.
 
-    This function processes user update webhook events from Clerk, finding the existing
-    user by Clerk ID and updating their information in the database.
+    Clerk sends the full user object with every `user.created` and
+    `user.updated` event, so only the last one of each user matters; a
+    `user.deleted` event deactivates the user once it is written, and is
+    cancelled by a later upsert. Other event types are ignored.
 
     Args:
-        db (Session): SQLAlchemy database session for database operations.
-        user_data (dict): Dictionary containing user data from Clerk webhook with the following structure:
-            - id (str): Clerk user ID
-            - email_addresses (list): List of email address objects, where first item contains:
-                - email_address (str): User's email address
-            - first_name (str, optional): User's first name
-            - last_name (str, optional): User's last name
-            - image_url (str, optional): User's profile image URL
+        events: `(svix_id, event_type, payload)` tuples, oldest first.
 
     Returns:
-        None
-
-    Side effects:
-        Updates the existing user in the database and commits the changes.
-
-    Raises:
-        SQLAlchemyError: If there's an error during database operations.
-        WebhookDataError: If required fields are missing or user is not found.
-
-    Example:
-        >>> user_data = {
-        ...     "id": "user_123",
-        ...     "email_addresses": [{"email_address": "newemail@example.com"}],
-        ...     "first_name": "Jane",
-        ...     "last_name": "Smith",
-        ... }
-        >>> handle_user_updated(db_session, user_data)
+        UserChanges: The changes to apply.
     """
-    try:
-        clerk_id = user_data.get("id")
-        if not clerk_id:
-            raise WebhookDataError("Clerk ID is missing")
-
-        user = db.query(User).filter(User.clerk_id == clerk_id).first()
-        if not user:
-            raise WebhookDataError(f"User with Clerk ID {clerk_id} not found")
-
-        email_addresses = user_data.get("email_addresses")
-        if email_addresses and isinstance(email_addresses, list):
-            primary_email = email_addresses[0].get("email_address")
-            if primary_email:
-                user.email = primary_email
-
-        first_name = user_data.get("first_name")
-        last_name = user_data.get("last_name")
-        if first_name is not None or last_name is not None:
-            full_name = (
-                f"{first_name} {last_name}".strip() if first_name or last_name else None
+    changes = UserChanges()
+    for svix_id, event_type, payload in events:
+        user_data = payload.get("data") or {}
+        try:
+            if event_type in USER_UPSERT_EVENTS:
+                fields = user_fields(user_data)
+                clerk_id = fields["clerk_id"]
+                changes.deletes.discard(clerk_id)
+                changes.upserts[clerk_id] = fields
+            elif event_type == USER_DELETE_EVENT:
+                clerk_id = user_data.get("id") if isinstance(user_data, dict) else None
+                if not clerk_id or not isinstance(clerk_id, str):
+                    raise WebhookDataError("Clerk ID is missing")
+                # An upsert before it is kept: the user is created, then
+                # deactivated, and holds the timestamp of the deletion.
+                changes.deletes.add(clerk_id)
+            else:
+                continue
+        except WebhookDataError as exc:
+            changes.invalid[svix_id] = str(exc)
+            continue
+        changes.events.setdefault(clerk_id, []).append(svix_id)
+        timestamp = payload.get("timestamp")
+        if isinstance(timestamp, (int, float)):
+            changes.timestamps[clerk_id] = max(
+                int(timestamp), changes.timestamps.get(clerk_id, 0)
             )
-            user.full_name = full_name
-
-        if "image_url" in user_data:
-            user.image_url = user_data.get("image_url")
-
-        db.commit()
+    return changes
 
-    except WebhookDataError:
-        db.rollback()
-        raise
 
-    except SQLAlchemyError as exc:
-        db.rollback()
-        raise RuntimeError("Database error while updating user") from exc
+def not_older(event_at: ColumnElement[int]) -> ColumnElement[bool]:
+    """Whether a change stamped `event_at` may be applied over the stored user."""
+    return (
+        user_table.c.clerk_event_at.is_(None)
+        | event_at.is_(None)
+        | (event_at >= user_table.c.clerk_event_at)
+    )
 
 
-def handle_user_deleted(db: Session, user_data: dict) -> None:
+async def apply_user_changes(db: AsyncSession, changes: UserChanges) -> None:
     """
-    Handle the deletion of a user from Clerk webhook data.
+    Apply coalesced user changes with one statement per kind of change.
 
-    This function processes user deletion webhook events from Clerk, finding the existing
-    user by Clerk ID and marking them as inactive (soft delete).
+    New users are inserted and known ones updated by a single
+    `INSERT ... ON CONFLICT (clerk_id) DO UPDATE`, which skips users whose
+    columns are unchanged; deleted users are marked as inactive (soft delete)
+    by a single UPDATE. Both statements queue a domain event per user they
+    actually changed: `user.created`, `user.updated` or `user.deactivated`.
+
+    Both also skip users whose `clerk_event_at` is newer than the change:
+    an event retried, or delivered late, never overwrites a later one.
 
     Args:
-        db (Session): SQLAlchemy database session for database operations.
-        user_data (dict): Dictionary containing user data from Clerk webhook with the following structure:
-            - id (str): Clerk user ID
+        db (AsyncSession): Async database session for database operations.
+        changes (UserChanges): Changes returned by `coalesce_user_events`.
 
     Returns:
         None
 
     Side effects:
-        Marks the user as inactive in the database and commits the changes.
+        Bumps the user collection version. It doesn't commit: the caller
+        commits, and then invalidates the changed users in the authorization
+        cache.
 
     Raises:
-        SQLAlchemyError: If there's an error during database operations.
-        WebhookDataError: If required fields are missing or user is not found.
-
-    Example:
-        >>> user_data = {
-        ...     "id": "user_123",
-        ... }
-        >>> handle_user_deleted(db_session, user_data)
+        IntegrityError: If an email address is already used by another user.
     """
-    try:
-        clerk_id = user_data.get("id")
-        if not clerk_id:
-            raise WebhookDataError("Clerk ID is missing")
-
-        user = db.query(User).filter(User.clerk_id == clerk_id).first()
-        if not user:
-            raise WebhookDataError(f"User with Clerk ID {clerk_id} not found")
-
-        user.is_active = False
-
-        db.commit()
+    if changes.upserts:
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                **fields,
+                "is_active": True,
+                "is_superuser": False,
+                "clerk_event_at": changes.timestamps.get(clerk_id),
+            }
+            for clerk_id, fields in changes.upserts.items()
+        ]
+        names = list(rows[0])
+        data = unnest_rows(user_table, names, rows)
+        statement = insert(user_table).from_select(
+            names, select(*(data.c[name] for name in names))
+        )
+        event_at = statement.excluded.clerk_event_at
+        changed = tuple_(
+            *(user_table.c[name] for name in SYNCED_USER_FIELDS)
+        ).is_distinct_from(
+            tuple_(*(statement.excluded[name] for name in SYNCED_USER_FIELDS))
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[user_table.c.clerk_id],
+            set_={
+                **{name: statement.excluded[name] for name in SYNCED_USER_FIELDS},
+                "clerk_event_at": func.greatest(user_table.c.clerk_event_at, event_at),
+            },
+            where=not_older(event_at)
+            & (changed | (event_at > func.coalesce(user_table.c.clerk_event_at, -1))),
+        )
+        # xmax is 0 in the rows inserted, and set in those updated.
+        written = statement.returning(
+            *user_table.c, literal_column("xmax = 0").label("inserted")
+        ).cte("written")
+        event_type = case((written.c.inserted, "user.created"), else_="user.updated")
+        await db.exec(
+            select(func.count())  # type: ignore
+            .select_from(written)
+            .add_cte(
+                queue_domain_events(
+                    written,
+                    "user",
+                    event_type,
+                    written.c.id,
+                    json_object(written, USER_FIELDS),
+                )
+            )
+        )
 
-    except WebhookDataError:
-        db.rollback()
-        raise
+    if changes.deletes:
+        data = unnest_rows(
+            user_table,
+            ("clerk_id", "clerk_event_at"),
+            [
+                {
+                    "clerk_id": clerk_id,
+                    "clerk_event_at": changes.timestamps.get(clerk_id),
+                }
+                for clerk_id in changes.deletes
+            ],
+        )
+        deactivated = (
+            update(user_table)
+            .where(
+                user_table.c.clerk_id == data.c.clerk_id,
+                user_table.c.is_active,
+                not_older(data.c.clerk_event_at),
+            )
+            .values(
+                is_active=False,
+                clerk_event_at=func.greatest(
+                    user_table.c.clerk_event_at, data.c.clerk_event_at
+                ),
+            )
+            .returning(*user_table.c)
+            .cte("deactivated")
+        )
+        await db.exec(
+            select(func.count())  # type: ignore
+            .select_from(deactivated)
+            .add_cte(
+                queue_domain_events(
+                    deactivated,
+                    "user",
+                    "user.deactivated",
+                    deactivated.c.id,
+                    json_object(deactivated, USER_FIELDS),
+                )
+            )
+        )
 
-    except SQLAlchemyError as exc:
-        db.rollback()
-        raise RuntimeError("Database error while deleting user") from exc
+    if changes.upserts or changes.deletes:
+        await db.exec(bump_versions(USER_COLLECTION))
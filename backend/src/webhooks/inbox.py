@@ -0,0 +1,332 @@
+import asyncio
+import logging
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+
+from sqlalchemy import Select, case, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.config import settings
+from src.core.db import async_engine, unnest_rows
+from src.core.metrics import record_webhook_events
+from src.core.user_cache import (
+    ALL_USERS,
+    invalidation_notify,
+    shared_invalidation,
+    user_cache,
+)
+from src.models.webhooks import WebhookInboxEvent, WebhookInboxPartition
+from src.webhooks.handlers import (
+    UserChanges,
+    apply_user_changes,
+    coalesce_user_events,
+)
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_INBOX_CHANNEL = "webhook_inbox"
+
+inbox_table = WebhookInboxEvent.__table__  # type: ignore
+partition_table = WebhookInboxPartition.__table__  # type: ignore
+
+
+async def store_event(session: AsyncSession, svix_id: str, event: dict) -> bool:
+    """
+    Add a verified event to the inbox, unless its svix ID is already there.
+
+    New events are announced on `WEBHOOK_INBOX_CHANNEL` once the transaction
+    commits, so that a worker picks them up right away.
+
+    Returns:
+        bool: False if the event was a redelivery.
+    """
+    stored = (
+        insert(inbox_table)
+        .values(svix_id=svix_id, event_type=event.get("type") or "", payload=event)
+        .on_conflict_do_nothing(index_elements=[inbox_table.c.svix_id])
+        .returning(inbox_table.c.svix_id)
+        .cte("stored")
+    )
+    statement = select(func.pg_notify(WEBHOOK_INBOX_CHANNEL, stored.c.svix_id))
+    return (await session.exec(statement)).first() is not None  # type: ignore
+
+
+async def pending_event_count() -> int:
+    """Return the number of events not processed yet."""
+    statement = select(func.count()).where(inbox_table.c.processed_at.is_(None))
+    async with async_engine.connect() as connection:
+        return (await connection.execute(statement)).scalar_one()
+
+
+def is_data_exception(exc: DBAPIError) -> bool:
+    """Whether Postgres rejected the data itself (SQLSTATE class 22)."""
+    return (getattr(exc.orig, "sqlstate", None) or "").startswith("22")
+
+
+def event_order(event) -> tuple:
+    # Clerk stamps events in milliseconds; fall back to the arrival order.
+    timestamp = event.payload.get("timestamp")
+    return (timestamp if isinstance(timestamp, (int, float)) else 0,)
+
+
+@dataclass
+class InboxStats:
+    """Counters for the webhook inbox worker."""
+
+    batches: int = 0
+    events: int = 0
+    users_changed: int = 0
+    invalid: int = 0
+    retried: int = 0
+    errors: int = 0
+
+
+class WebhookInboxWorker:
+    """
+    Apply the events stored in the webhook inbox, in batches.
+
+    Events are spread over the partitions of `WebhookInboxPartition` by the
+    Clerk ID of their user. A batch locks up to `partitions_per_batch`
+    partitions with pending events, with `FOR UPDATE SKIP LOCKED` and least
+    recently claimed first, then takes their oldest events. Since a
+    partition is only held by one worker at a time, the workers of several
+    API processes can drain the inbox side by side without ever applying
+    the events of a user out of order; a failed event is retried before the
+    later events of its user too.
+
+    A batch is coalesced to one change per user and applied with bulk
+    statements; if that fails, users are applied one by one and only the
+    events of the failing ones are retried, up to `max_attempts`. Events
+    with invalid data, whether the payload or the database rejects it, are
+    marked as processed with their error.
+
+    Args:
+        batch_size: Maximum events claimed per transaction.
+        partitions_per_batch: Maximum partitions locked per transaction.
+        poll_interval: Seconds between two checks of the inbox when no
+            notification wakes the worker up.
+        max_attempts: Attempts after which a failing event is given up on.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        partitions_per_batch: int = 4,
+        poll_interval: float = 5.0,
+        max_attempts: int = 5,
+    ):
+        self.batch_size = batch_size
+        self.partitions_per_batch = partitions_per_batch
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.stats = InboxStats()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def wake(self, payload: str = "") -> None:
+        """Check the inbox now; usable as a `PostgresListener` callback."""
+        self._wakeup.set()
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="webhook-inbox")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                await self.drain()
+            # Failures of single events are handled by the batch: whatever
+            # else is raised is logged and retried, so the worker stays up.
+            except Exception:
+                self.stats.errors += 1
+                logger.exception("Draining the webhook inbox failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except TimeoutError:
+                pass
+
+    async def drain(self) -> int:
+        """Process batches until the inbox is empty; return the event count."""
+        total = 0
+        while processed := await self.process_batch():
+            total += processed
+        return total
+
+    async def process_batch(self) -> int:
+        """Claim, apply and mark one batch of events; return its size."""
+        pending = exists().where(
+            inbox_table.c.partition == partition_table.c.partition,
+            inbox_table.c.processed_at.is_(None),
+        )
+        locked = (
+            select(partition_table.c.partition)
+            .where(pending)
+            .order_by(partition_table.c.claimed_at.asc().nulls_first())
+            .limit(self.partitions_per_batch)
+            .with_for_update(skip_locked=True)
+        )
+        claim = (
+            update(partition_table)
+            .where(partition_table.c.partition.in_(locked.scalar_subquery()))
+            .values(claimed_at=func.now())
+            .returning(partition_table.c.partition)
+        )
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            while True:
+                partitions = (await session.exec(claim)).scalars().all()  # type: ignore
+                if not partitions:
+                    return 0
+                # Read by a statement of their own, whose snapshot is taken
+                # once the partitions are locked: it sees the events marked
+                # by the worker that held them before.
+                claimed = (
+                    (await session.exec(self._select_events(partitions)))  # type: ignore
+                    .scalars()
+                    .all()
+                )
+                if claimed:
+                    break
+                # Drained by another worker in the meantime: claim others,
+                # which now come first.
+                await session.commit()
+            events = sorted(claimed, key=event_order)
+
+            changes = coalesce_user_events(
+                (event.svix_id, event.event_type, event.payload) for event in events
+            )
+            failed = await self._apply(session, changes)
+
+            done = {
+                event.svix_id: None for event in events if event.svix_id not in failed
+            }
+            done.update(changes.invalid)
+            await self._mark(session, done, final=True)
+            await self._mark(session, failed, final=False)
+
+            changed = {
+                clerk_id
+                for clerk_id, svix_ids in changes.events.items()
+                if svix_ids[0] not in failed and svix_ids[0] not in changes.invalid
+            }
+            if changed and shared_invalidation():
+                await session.exec(invalidation_notify(ALL_USERS))  # type: ignore
+            await session.commit()
+
+        for clerk_id in changed:
+            user_cache.invalidate(clerk_id)
+        for outcome, svix_ids in (
+            ("failed", failed),
+            ("invalid", changes.invalid),
+            ("processed", done.keys() - changes.invalid.keys()),
+        ):
+            record_webhook_events(
+                [event.event_type for event in events if event.svix_id in svix_ids],
+                outcome,
+            )
+        self.stats.batches += 1
+        self.stats.events += len(events)
+        self.stats.users_changed += len(changed)
+        self.stats.invalid += len(changes.invalid)
+        self.stats.retried += len(failed)
+        return len(events)
+
+    def _select_events(self, partitions: Sequence[int]) -> Select:
+        """Select the oldest pending events of `partitions`."""
+        return (
+            select(WebhookInboxEvent)
+            .where(
+                WebhookInboxEvent.partition.in_(partitions),  # type: ignore
+                WebhookInboxEvent.processed_at.is_(None),  # type: ignore
+                WebhookInboxEvent.attempts < self.max_attempts,
+            )
+            .order_by(WebhookInboxEvent.received_at)  # type: ignore
+            .limit(self.batch_size)
+        )
+
+    async def _apply(self, session: AsyncSession, changes: UserChanges) -> dict:
+        """
+        Apply `changes`; return the error per svix ID of the failed events.
+
+        When the bulk statements fail, users are applied one by one. The
+        events of a user whose data the database rejects, e.g. a value too
+        long for its column, are moved to `changes.invalid`: retrying them
+        can't succeed.
+        """
+        try:
+            async with session.begin_nested():
+                await apply_user_changes(session, changes)
+            return {}
+        except Exception:
+            logger.info("Bulk apply failed, applying webhook users one by one")
+
+        failed: dict[str, str] = {}
+        for clerk_id in changes.events:
+            try:
+                async with session.begin_nested():
+                    await apply_user_changes(session, changes.only(clerk_id))
+            # Errors other than invalid data fail the events of this user
+            # only, which are retried up to `max_attempts`.
+            except Exception as exc:
+                error = str(exc.orig) if isinstance(exc, DBAPIError) else repr(exc)
+                if isinstance(exc, DBAPIError) and is_data_exception(exc):
+                    outcome = changes.invalid
+                else:
+                    logger.warning(
+                        "Applying webhook events of %s failed", clerk_id, exc_info=True
+                    )
+                    outcome = failed
+                for svix_id in changes.events[clerk_id]:
+                    outcome[svix_id] = error
+        return failed
+
+    async def _mark(
+        self, session: AsyncSession, errors: dict[str, str | None], final: bool
+    ) -> None:
+        """
+        Record an attempt of each event, with its error if any.
+
+        Final events are marked as processed; the others are too once they
+        reach `max_attempts`.
+        """
+        if not errors:
+            return
+        data = unnest_rows(
+            inbox_table,
+            ("svix_id", "error"),
+            [{"svix_id": svix_id, "error": error} for svix_id, error in errors.items()],
+        )
+        attempts = inbox_table.c.attempts + 1
+        processed_at = (
+            func.now()
+            if final
+            else case((attempts >= self.max_attempts, func.now()), else_=None)
+        )
+        await session.exec(
+            update(inbox_table)  # type: ignore
+            .where(inbox_table.c.svix_id == data.c.svix_id)
+            .values(attempts=attempts, error=data.c.error, processed_at=processed_at)
+        )
+
+    def snapshot(self) -> dict:
+        return asdict(self.stats)
+
+
+webhook_inbox_worker = WebhookInboxWorker(
+    batch_size=settings.WEBHOOK_INBOX_BATCH_SIZE,
+    partitions_per_batch=settings.WEBHOOK_INBOX_PARTITIONS_PER_BATCH,
+    poll_interval=settings.WEBHOOK_INBOX_POLL_INTERVAL,
+    max_attempts=settings.WEBHOOK_INBOX_MAX_ATTEMPTS,
+)
@@ -0,0 +1,111 @@
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from dataclasses import dataclass, field
+
+import httpx
+import pytest
+from sqlalchemy import delete, event, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.deps import verify_clerk_token
+from src.core.db import async_engine
+from src.core.user_cache import user_cache
+from src.main import app
+from src.models.notifications import NotificationOutboxEvent
+from src.models.outbox import OutboxEvent
+from src.models.tasks import RecurringTask, Task
+from src.models.users import User
+
+TEST_TASK_PREFIX = "test-"
+
+
+@dataclass
+class QueryLog:
+    """Statements sent to the database, and commits, while counting."""
+
+    statements: list[str] = field(default_factory=list)
+    commits: int = 0
+
+    @property
+    def round_trips(self) -> int:
+        # BEGIN and pool pre-pings are per-connection overhead, the same for
+        # every endpoint, and are left out.
+        return len(self.statements) + self.commits
+
+
+@contextmanager
+def count_queries() -> Iterator[QueryLog]:
+    """Record what the async engine sends to the database within the block."""
+    log = QueryLog()
+    sync_engine = async_engine.sync_engine
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        log.statements.append(statement)
+
+    def on_commit(conn):
+        log.commits += 1
+
+    event.listen(sync_engine, "before_cursor_execute", on_execute)
+    event.listen(sync_engine, "commit", on_commit)
+    try:
+        yield log
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", on_execute)
+        event.remove(sync_engine, "commit", on_commit)
+
+
+@pytest.fixture
+def query_counter() -> Callable[[], AbstractContextManager[QueryLog]]:
+    return count_queries
+
+
+@pytest.fixture
+async def db_user(database: None) -> AsyncIterator[User]:
+    """A user in the configured database; skips the test if it's unreachable."""
+    clerk_id = f"test_{uuid.uuid4().hex}"
+    user = User(email=f"{clerk_id}@example.com", clerk_id=clerk_id)
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.commit()
+        last_event_id = (
+            await session.exec(select(func.coalesce(func.max(OutboxEvent.id), 0)))  # type: ignore
+        ).one()[0]
+
+    yield user
+
+    async with AsyncSession(async_engine) as session:
+        # Domain events can't be told apart by payload (deletions only hold
+        # an ID): those queued during the test are removed instead.
+        await session.exec(
+            delete(OutboxEvent).where(OutboxEvent.id > last_event_id)  # type: ignore
+        )
+        await session.exec(
+            delete(Task).where(Task.title.startswith(TEST_TASK_PREFIX))  # type: ignore
+        )
+        await session.exec(
+            delete(NotificationOutboxEvent).where(
+                NotificationOutboxEvent.payload["title"].astext.startswith(  # type: ignore
+                    TEST_TASK_PREFIX
+                )
+            )
+        )
+        await session.exec(
+            delete(RecurringTask).where(
+                RecurringTask.title.startswith(TEST_TASK_PREFIX)  # type: ignore
+            )
+        )
+        await session.exec(delete(User).where(User.id == user.id))  # type: ignore
+        await session.commit()
+    user_cache.clear()
+
+
+@pytest.fixture
+async def client(db_user: User) -> AsyncIterator[httpx.AsyncClient]:
+    """Client authenticated as `db_user`, whose lookup is already cached."""
+    app.dependency_overrides[verify_clerk_token] = lambda: {"sub": db_user.clerk_id}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        (await c.get("/tasks/category")).raise_for_status()
+        yield c
+    app.dependency_overrides.clear()
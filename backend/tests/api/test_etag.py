@@ -0,0 +1,87 @@
+from datetime import date
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+from starlette.requests import Request
+
+from src.api.etag import if_match_versions, is_not_modified, make_etag
+from src.core.db import async_engine
+from src.models.tasks import Task, TaskCategory, TaskStatus
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+def make_request(if_none_match: str | None, if_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    if if_match is not None:
+        headers.append((b"if-match", if_match.encode()))
+    return Request({"type": "http", "headers": headers})
+
+
+class TestIsNotModified:
+    @pytest.mark.parametrize(
+        "header", ['"3-1"', 'W/"3-1"', '"2-1", "3-1"', "*", ' "0" , W/"3-1" ']
+    )
+    def test_matching_validator(self, header):
+        """Test that any matching (or wildcard) validator yields a 304."""
+        assert is_not_modified(make_request(header), make_etag(3, 1))
+
+    @pytest.mark.parametrize("header", [None, "", '"3-2"', '"3"'])
+    def test_stale_or_missing_validator(self, header):
+        """Test that the body is sent when the client's copy is outdated."""
+        assert not is_not_modified(make_request(header), make_etag(3, 1))
+
+
+class TestIfMatchVersions:
+    @pytest.mark.parametrize(
+        ("header", "versions"),
+        [
+            (None, None),
+            ("*", None),
+            ('"3"', [3]),
+            ('"2", "3"', [2, 3]),
+            ('W/"3"', []),
+            ('"3-1"', []),
+        ],
+    )
+    def test_versions(self, header, versions):
+        """Test that only strong tags holding a version are allowed."""
+        assert if_match_versions(make_request(None, header)) == versions
+
+
+def new_task(title: str) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{title}",
+        "category": "Chore",
+        "due_date": date(2026, 1, 1).isoformat(),
+        "status": "todo",
+    }
+
+
+class TestTaskCollectionETag:
+    async def test_late_commit_changes_etag(self, client):
+        """Test that a write committed after a later one still changes the tag."""
+        before = (await client.get("/tasks/")).headers["etag"]
+        async with AsyncSession(async_engine) as session:
+            # Written first, committed last.
+            session.add(
+                Task(
+                    title=f"{TEST_TASK_PREFIX}late",
+                    category=TaskCategory.Chore,
+                    due_date=date(2026, 1, 1),
+                    status=TaskStatus.TODO,
+                )
+            )
+            await session.flush()
+            await client.post("/tasks/", json=new_task("early"))
+            early = (await client.get("/tasks/")).headers["etag"]
+            await session.commit()
+        late = await client.get("/tasks/", headers={"If-None-Match": early})
+        cached = await client.get(
+            "/tasks/", headers={"If-None-Match": late.headers["etag"]}
+        )
+
+        assert len({before, early, late.headers["etag"]}) == 3
+        assert late.status_code == 200
+        assert cached.status_code == 304
@@ -0,0 +1,308 @@
+import json
+import uuid
+from collections.abc import AsyncIterator
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import delete, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.deps import verify_clerk_token
+from src.core.db import async_engine
+from src.core.scheduler import materialize_recurring_tasks
+from src.main import app
+from src.models.notifications import Notification, NotificationOutboxEvent
+from src.models.tasks import Task
+from src.models.users import User
+from src.notifications.channels import Delivery, InAppChannel
+from src.notifications.outbox import NotificationDispatcher
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+class FailingChannel:
+    name = "failing"
+
+    async def deliver(self, session, deliveries):
+        raise ConnectionError("unreachable")
+
+
+class RecordingChannel:
+    name = "recording"
+
+    def __init__(self):
+        self.deliveries: list[Delivery] = []
+
+    async def deliver(self, session, deliveries):
+        self.deliveries += deliveries
+
+
+class FlakyChannel:
+    """Fails once, then checks that the batch isn't locked while delivered."""
+
+    name = "flaky"
+
+    def __init__(self):
+        self.calls = 0
+        self.locked: list[int] = []
+
+    async def deliver(self, session, deliveries):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("unreachable")
+        async with AsyncSession(async_engine) as other:
+            statement = (
+                select(NotificationOutboxEvent.id)
+                .where(
+                    NotificationOutboxEvent.id.in_(  # type: ignore
+                        [d.event_id for d in deliveries]
+                    )
+                )
+                .with_for_update(nowait=True)
+            )
+            self.locked = list((await other.exec(statement)).scalars())  # type: ignore
+
+
+@pytest.fixture
+async def other_user(db_user: User) -> AsyncIterator[User]:
+    """Another active user, to be notified of the changes of `db_user`."""
+    clerk_id = f"test_{uuid.uuid4().hex}"
+    user = User(email=f"{clerk_id}@example.com", clerk_id=clerk_id)
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        session.add(user)
+        await session.commit()
+
+    yield user
+
+    async with AsyncSession(async_engine) as session:
+        await session.exec(delete(User).where(User.id == user.id))  # type: ignore
+        await session.commit()
+
+
+async def create_task(client, title: str, **fields) -> dict:
+    response = await client.post(
+        "/tasks/",
+        json={
+            "title": f"{TEST_TASK_PREFIX}{title}",
+            "category": "Chore",
+            "due_date": date(2026, 1, 1).isoformat(),
+            "status": "todo",
+            **fields,
+        },
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def queued_events(task_ids: list[int]) -> list[NotificationOutboxEvent]:
+    async with AsyncSession(async_engine) as session:
+        statement = (
+            select(NotificationOutboxEvent)
+            .where(NotificationOutboxEvent.task_id.in_(task_ids))  # type: ignore
+            .order_by(NotificationOutboxEvent.id)  # type: ignore
+        )
+        return list((await session.exec(statement)).scalars())  # type: ignore
+
+
+class TestQueueNotifications:
+    async def test_only_tasks_left_without_assignee_queue_events(self, client, db_user):
+        """Test that creating or unassigning a task queues an event, not more."""
+        unassigned = await create_task(client, "unassigned")
+        assigned = await create_task(client, "assigned", assignee_id=str(db_user.id))
+        renamed = await create_task(client, "renamed", assignee_id=str(db_user.id))
+
+        await client.patch(f"/tasks/{assigned['id']}", json={"assignee_id": None})
+        await client.patch(f"/tasks/{unassigned['id']}", json={"assignee_id": None})
+        await client.patch(f"/tasks/{renamed['id']}", json={"title": "test-other"})
+
+        events = await queued_events([unassigned["id"], assigned["id"], renamed["id"]])
+        assert [(event.kind, event.task_id) for event in events] == [
+            ("task-created-unassigned", unassigned["id"]),
+            ("task-unassigned", assigned["id"]),
+        ]
+        assert {event.actor_id for event in events} == {db_user.id}
+        assert events[0].payload == {"title": f"{TEST_TASK_PREFIX}unassigned"}
+
+    async def test_bulk_writes_queue_events(self, client, db_user):
+        """Test that bulk creates and updates queue events like single ones."""
+        response = await client.post(
+            "/tasks/bulk",
+            json=[
+                {
+                    "title": f"{TEST_TASK_PREFIX}{i}",
+                    "category": "Chore",
+                    "due_date": "2026-01-01",
+                    "status": "todo",
+                    "assignee_id": str(db_user.id) if i else None,
+                }
+                for i in range(3)
+            ],
+        )
+        ids = [task["id"] for task in response.json()["tasks"]]
+        await client.patch("/tasks/bulk", json=[{"id": ids[1], "assignee_id": None}])
+
+        events = await queued_events(ids)
+        assert [(event.kind, event.task_id) for event in events] == [
+            ("task-created-unassigned", ids[0]),
+            ("task-unassigned", ids[1]),
+        ]
+
+    async def test_imported_tasks_queue_events(self, client, db_user):
+        """Test that imported tasks without assignee queue an event."""
+        lines = [
+            {
+                "title": f"{TEST_TASK_PREFIX}imported-{i}",
+                "category": "Chore",
+                "due_date": "2026-01-01",
+                "status": "todo",
+                "assignee_id": str(db_user.id) if i else None,
+            }
+            for i in range(2)
+        ]
+        body = "\n".join(json.dumps(line) for line in lines)
+
+        response = await client.post("/tasks/import", content=body.encode())
+        assert response.json()["imported"] == 2
+
+        async with AsyncSession(async_engine) as session:
+            statement = (
+                select(Task.id)
+                .where(Task.title.startswith(f"{TEST_TASK_PREFIX}imported-"))  # type: ignore
+                .order_by(Task.title)
+            )
+            ids = list((await session.exec(statement)).scalars())  # type: ignore
+        events = await queued_events(ids)
+        assert [(event.kind, event.task_id) for event in events] == [
+            ("task-created-unassigned", ids[0])
+        ]
+        assert events[0].actor_id == db_user.id
+
+    async def test_scheduled_occurrences_queue_events(self, client):
+        """Test that occurrences of a recurring task without assignee do."""
+        response = await client.post(
+            "/recurring-tasks/",
+            params={"today": "2026-03-02"},
+            json={
+                "title": f"{TEST_TASK_PREFIX}recurring",
+                "category": "Chore",
+                "frequency": "daily",
+                "starts_on": "2026-03-02",
+            },
+        )
+        recurring = response.json()
+        async with AsyncSession(async_engine) as session:
+            created = await materialize_recurring_tasks(
+                session, date(2026, 3, 16), 1, [recurring["id"]]
+            )
+            await session.commit()
+            statement = select(Task.id).where(Task.recurring_task_id == recurring["id"])
+            ids = sorted((await session.exec(statement)).scalars())  # type: ignore
+
+        events = await queued_events(ids)
+        # Through March 16 on creation, then March 17.
+        assert created == 1
+        assert len(events) == len(ids) == 16
+        assert {event.kind for event in events} == {"task-created-unassigned"}
+        assert {event.actor_id for event in events} == {None}
+
+
+class TestNotificationDispatcher:
+    async def test_everyone_but_the_actor_is_notified(
+        self, client, db_user, other_user
+    ):
+        """Test that the in-app inboxes of the other users get the event."""
+        task = await create_task(client, "unassigned")
+        dispatcher = NotificationDispatcher(channels=[InAppChannel()])
+
+        await dispatcher.drain()
+        await dispatcher.drain()
+
+        async with AsyncSession(async_engine) as session:
+            statement = select(Notification.user_id).where(
+                Notification.task_id == task["id"]
+            )
+            recipients = list((await session.exec(statement)).scalars())  # type: ignore
+        event = (await queued_events([task["id"]]))[0]
+        assert recipients == [other_user.id]
+        assert event.dispatched_at is not None
+        assert event.attempts == 1
+
+    async def test_failed_delivery_is_retried_later(self, client, db_user):
+        """Test that a failing channel leaves the event pending, backed off."""
+        task = await create_task(client, "unassigned")
+        dispatcher = NotificationDispatcher(
+            channels=[InAppChannel(), FailingChannel()], retry_delay=60
+        )
+
+        await dispatcher.drain()
+
+        event = (await queued_events([task["id"]]))[0]
+        assert event.dispatched_at is None
+        assert event.attempts == 1
+        assert "failing: ConnectionError('unreachable')" in event.error
+        assert event.available_at > event.created_at
+        # Not due yet: the next drain leaves it alone.
+        assert await dispatcher.drain() == 0
+
+    async def test_only_failed_channels_are_retried(self, client, db_user, other_user):
+        """Test that a retry skips the channels that delivered already."""
+        task = await create_task(client, "unassigned")
+        recording, flaky = RecordingChannel(), FlakyChannel()
+        dispatcher = NotificationDispatcher(channels=[recording, flaky], retry_delay=60)
+
+        await dispatcher.drain()
+        event = (await queued_events([task["id"]]))[0]
+        assert event.delivered_channels == ["recording"]
+        async with AsyncSession(async_engine) as session:
+            await session.exec(
+                update(NotificationOutboxEvent)  # type: ignore
+                .where(NotificationOutboxEvent.id == event.id)  # type: ignore
+                .values(available_at=event.created_at)
+            )
+            await session.commit()
+        await dispatcher.drain()
+
+        event = (await queued_events([task["id"]]))[0]
+        assert [(d.event_id, d.user_id) for d in recording.deliveries] == [
+            (event.id, other_user.id)
+        ]
+        assert flaky.calls == 2
+        assert event.id in flaky.locked
+        assert event.delivered_channels == ["recording", "flaky"]
+        assert event.dispatched_at is not None
+        assert (event.attempts, event.error) == (2, None)
+
+    async def test_batch_in_flight_is_skipped(self, client, db_user):
+        """Test that a claimed batch isn't claimed again while delivered."""
+        task = await create_task(client, "unassigned")
+        dispatcher = NotificationDispatcher(
+            channels=[RecordingChannel()], delivery_timeout=60
+        )
+
+        events, _ = await dispatcher._claim()
+
+        event = (await queued_events([task["id"]]))[0]
+        assert event.id in [e.id for e in events]
+        assert event.attempts == 1
+        assert event.available_at > event.created_at + timedelta(seconds=60)
+        assert event.id not in [e.id for e in (await dispatcher._claim())[0]]
+
+
+class TestReadNotifications:
+    async def test_inbox_of_the_current_user(self, client, db_user, other_user):
+        """Test that users read and mark their own notifications."""
+        app.dependency_overrides[verify_clerk_token] = lambda: {
+            "sub": other_user.clerk_id
+        }
+        task = await create_task(client, "unassigned")
+        app.dependency_overrides[verify_clerk_token] = lambda: {"sub": db_user.clerk_id}
+        await NotificationDispatcher(channels=[InAppChannel()]).drain()
+
+        inbox = (await client.get("/notifications/")).json()
+        marked = await client.post(f"/notifications/{inbox[0]['id']}/read")
+        unread = (await client.get("/notifications/", params={"unread": True})).json()
+
+        assert [(n["kind"], n["task_id"]) for n in inbox] == [
+            ("task-created-unassigned", task["id"])
+        ]
+        assert marked.status_code == 204
+        assert unread == []
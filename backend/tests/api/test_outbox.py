@@ -0,0 +1,191 @@
+import asyncio
+import uuid
+from collections import defaultdict
+
+import pytest
+from sqlalchemy import delete, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.core.outbox import DomainEvent, InProcessPublisher, OutboxRelay
+from src.models.outbox import OutboxEvent
+from src.models.users import User
+from src.webhooks.handlers import UserChanges, apply_user_changes
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+class FailingPublisher:
+    async def publish(self, events):
+        raise ConnectionError("broker unreachable")
+
+
+def new_task(title: str) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{title}",
+        "category": "Chore",
+        "due_date": "2026-01-01",
+        "status": "todo",
+    }
+
+
+async def queued_events(
+    aggregate_type: str, aggregate_ids: list[str]
+) -> list[OutboxEvent]:
+    async with AsyncSession(async_engine) as session:
+        statement = (
+            select(OutboxEvent)
+            .where(
+                OutboxEvent.aggregate_type == aggregate_type,
+                OutboxEvent.aggregate_id.in_(aggregate_ids),  # type: ignore
+            )
+            .order_by(OutboxEvent.id)  # type: ignore
+        )
+        return list((await session.exec(statement)).scalars())  # type: ignore
+
+
+def recording_publisher(received: list[DomainEvent]) -> InProcessPublisher:
+    publisher = InProcessPublisher()
+
+    async def record(event: DomainEvent) -> None:
+        received.append(event)
+
+    publisher.subscribe(record, aggregate_types=["task"])
+    return publisher
+
+
+class TestQueueDomainEvents:
+    async def test_task_writes_queue_events(self, client, db_user):
+        """Test that each task write queues its event, with the task as payload."""
+        task = (await client.post("/tasks/", json=new_task("outbox"))).json()
+        await client.patch(f"/tasks/{task['id']}", json={"status": "completed"})
+        await client.delete(f"/tasks/{task['id']}")
+
+        events = await queued_events("task", [str(task["id"])])
+        assert [event.event_type for event in events] == [
+            "task.created",
+            "task.updated",
+            "task.deleted",
+        ]
+        assert events[0].payload["title"] == f"{TEST_TASK_PREFIX}outbox"
+        assert events[1].payload["status"] == "completed"
+        assert events[2].payload == {"id": task["id"]}
+        assert len({event.partition for event in events}) == 1
+
+    async def test_user_changes_queue_events(self, db_user):
+        """Test that user upserts and deletions queue events, no-ops don't."""
+        clerk_id = f"test_{uuid.uuid4().hex}"
+        fields = {"clerk_id": clerk_id, "email": f"{clerk_id}@example.com"}
+        steps = [
+            UserChanges(upserts={clerk_id: {**fields, "full_name": "Ada"}}),
+            UserChanges(upserts={clerk_id: {**fields, "full_name": "Ada L."}}),
+            UserChanges(upserts={clerk_id: {**fields, "full_name": "Ada L."}}),
+            UserChanges(deletes={clerk_id}),
+        ]
+        try:
+            for changes in steps:
+                async with AsyncSession(async_engine) as session:
+                    await apply_user_changes(session, changes)
+                    await session.commit()
+            async with AsyncSession(async_engine) as session:
+                user_id = (
+                    await session.exec(
+                        select(User.id).where(User.clerk_id == clerk_id)  # type: ignore
+                    )
+                ).one()[0]
+        finally:
+            async with AsyncSession(async_engine) as session:
+                await session.exec(delete(User).where(User.clerk_id == clerk_id))  # type: ignore
+                await session.commit()
+
+        events = await queued_events("user", [str(user_id)])
+        assert [(e.event_type, e.payload["full_name"]) for e in events] == [
+            ("user.created", "Ada"),
+            ("user.updated", "Ada L."),
+            ("user.deactivated", "Ada L."),
+        ]
+        assert events[2].payload["is_active"] is False
+
+    async def test_user_routes_queue_events(self, client):
+        """Test that creating and deleting a user through the API queue events."""
+        clerk_id = f"test_{uuid.uuid4().hex}"
+        email = f"{clerk_id}@example.com"
+        try:
+            created = await client.post(
+                "/users/",
+                json={"email": email, "clerk_id": clerk_id, "password": "secret"},
+            )
+            user_id = created.json()["id"]
+            deleted = await client.delete(f"/users/{user_id}")
+            missing = await client.delete(f"/users/{user_id}")
+        finally:
+            async with AsyncSession(async_engine) as session:
+                await session.exec(delete(User).where(User.clerk_id == clerk_id))  # type: ignore
+                await session.commit()
+
+        assert created.status_code == 201
+        assert deleted.status_code == 200
+        assert missing.status_code == 404
+        events = await queued_events("user", [user_id])
+        assert [event.event_type for event in events] == [
+            "user.created",
+            "user.deleted",
+        ]
+        assert events[0].payload["email"] == email
+        assert "hashed_password" not in events[0].payload
+        assert events[1].payload == {"id": user_id}
+
+
+class TestOutboxRelay:
+    async def test_concurrent_relays_keep_order_per_task(self, client, db_user):
+        """Test that relays side by side publish each event once, in order."""
+        response = await client.post(
+            "/tasks/bulk", json=[new_task(str(i)) for i in range(40)]
+        )
+        ids = [task["id"] for task in response.json()["tasks"]]
+        for status in ("in-progress", "completed"):
+            await client.patch(
+                "/tasks/bulk", json=[{"id": id, "status": status} for id in ids]
+            )
+        received: list[DomainEvent] = []
+        relays = [
+            OutboxRelay(recording_publisher(received), batch_size=10) for _ in range(3)
+        ]
+
+        await asyncio.gather(*(relay.drain() for relay in relays))
+
+        by_task = defaultdict(list)
+        for event in received:
+            by_task[event.aggregate_id].append(event)
+        for task_id in ids:
+            events = by_task[str(task_id)]
+            assert [event.event_type for event in events] == [
+                "task.created",
+                "task.updated",
+                "task.updated",
+            ]
+            assert [event.payload["status"] for event in events] == [
+                "todo",
+                "in-progress",
+                "completed",
+            ]
+        assert len({event.id for event in received}) == len(received)
+        events = await queued_events("task", [str(task_id) for task_id in ids])
+        assert all(event.published_at is not None for event in events)
+
+    async def test_failed_batch_is_published_again(self, client, db_user):
+        """Test that a failing publisher leaves the events pending, in order."""
+        task = (await client.post("/tasks/", json=new_task("retried"))).json()
+        await client.patch(f"/tasks/{task['id']}", json={"status": "completed"})
+
+        with pytest.raises(ConnectionError):
+            await OutboxRelay(FailingPublisher()).drain()
+        pending = await queued_events("task", [str(task["id"])])
+        received: list[DomainEvent] = []
+        await OutboxRelay(recording_publisher(received)).drain()
+
+        assert all(event.published_at is None for event in pending)
+        assert [
+            event.event_type
+            for event in received
+            if event.aggregate_id == str(task["id"])
+        ] == ["task.created", "task.updated"]
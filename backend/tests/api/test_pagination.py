@@ -0,0 +1,33 @@
+from datetime import date
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.pagination import decode_cursor, encode_cursor
+
+
+class TestCursor:
+    def test_round_trip(self):
+        """Test that a cursor decodes back to the encoded sort key."""
+        cursor = encode_cursor((date(2026, 1, 31), 42))
+        assert decode_cursor(cursor, (date.fromisoformat, int)) == (
+            date(2026, 1, 31),
+            42,
+        )
+
+    def test_cursor_is_url_safe(self):
+        """Test that cursors can be passed as query parameters unescaped."""
+        cursor = encode_cursor((date(2026, 1, 31), 10**12))
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+
+    @pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor(("x", 1))])
+    def test_invalid_cursor(self, cursor):
+        """Test that malformed cursors are rejected with a 400."""
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor(cursor, (date.fromisoformat, int))
+        assert exc_info.value.status_code == 400
+
+    def test_wrong_shape(self):
+        """Test that a cursor with the wrong number of values is rejected."""
+        with pytest.raises(HTTPException):
+            decode_cursor(encode_cursor((1, 2, 3)), (date.fromisoformat, int))
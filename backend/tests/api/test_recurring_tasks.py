@@ -0,0 +1,166 @@
+from datetime import date, timedelta
+
+import pytest
+from pydantic import ValidationError
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.core.scheduler import materialize_recurring_tasks
+from src.models.tasks import RecurringTaskCreate
+from tests.api.conftest import TEST_TASK_PREFIX
+
+TODAY = date(2026, 3, 2)  # A Monday; the default horizon ends on March 16
+
+
+def recurring_task(**fields) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}recurring",
+        "category": "Chore",
+        **fields,
+    }
+
+
+async def create_recurring_task(client, **fields) -> dict:
+    response = await client.post(
+        "/recurring-tasks/",
+        params={"today": TODAY.isoformat()},
+        json=recurring_task(**fields),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def materialize(recurring_task_id: int, today: date, horizon_days: int) -> int:
+    async with AsyncSession(async_engine) as session:
+        created = await materialize_recurring_tasks(
+            session, today, horizon_days, [recurring_task_id]
+        )
+        await session.commit()
+    return created
+
+
+async def occurrences(client, assignee_id) -> list[dict]:
+    response = await client.get("/tasks/", params={"assignee_id": str(assignee_id)})
+    return response.json()
+
+
+class TestRecurringTaskCreate:
+    def test_weekly_defaults_to_the_start_weekday(self):
+        """Test that a weekly schedule without weekdays repeats on starts_on's."""
+        recurring = RecurringTaskCreate.model_validate(
+            recurring_task(frequency="weekly", starts_on="2026-03-04")
+        )
+
+        assert recurring.by_weekday == [3]
+
+    @pytest.mark.parametrize(
+        "fields",
+        [
+            {"frequency": "monthly", "by_weekday": [1]},
+            {"frequency": "weekly", "by_weekday": [0]},
+            {"frequency": "daily", "until": "2026-02-01"},
+            {"frequency": "daily", "interval": 0},
+        ],
+    )
+    def test_invalid_schedules_are_rejected(self, fields):
+        """Test that inconsistent schedules don't validate."""
+        with pytest.raises(ValidationError):
+            RecurringTaskCreate.model_validate(
+                recurring_task(starts_on="2026-03-01", **fields)
+            )
+
+
+class TestMaterializeRecurringTasks:
+    @pytest.mark.parametrize(
+        "schedule,due_dates",
+        [
+            (
+                {"frequency": "daily", "interval": 3, "starts_on": "2026-02-27"},
+                ["2026-03-02", "2026-03-05", "2026-03-08", "2026-03-11", "2026-03-14"],
+            ),
+            (
+                # Every other week from the week of February 23
+                {
+                    "frequency": "weekly",
+                    "interval": 2,
+                    "by_weekday": [4, 1],
+                    "starts_on": "2026-02-25",
+                },
+                ["2026-03-09", "2026-03-12"],
+            ),
+            (
+                {
+                    "frequency": "daily",
+                    "starts_on": "2026-03-10",
+                    "until": "2026-03-11",
+                },
+                ["2026-03-10", "2026-03-11"],
+            ),
+        ],
+    )
+    async def test_occurrences_follow_the_schedule(
+        self, client, db_user, schedule, due_dates
+    ):
+        """Test that creating a recurring task creates its upcoming occurrences."""
+        recurring = await create_recurring_task(
+            client, assignee_id=str(db_user.id), **schedule
+        )
+
+        tasks = await occurrences(client, db_user.id)
+
+        assert [task["due_date"] for task in tasks] == due_dates
+        assert {task["recurring_task_id"] for task in tasks} == {recurring["id"]}
+        assert {task["status"] for task in tasks} == {"todo"}
+        assert recurring["materialized_through"] == "2026-03-16"
+
+    async def test_monthly_occurrences_skip_short_months(self, client, db_user):
+        """Test that a monthly schedule on the 31st skips April."""
+        recurring = await create_recurring_task(
+            client,
+            assignee_id=str(db_user.id),
+            frequency="monthly",
+            starts_on="2026-01-31",
+        )
+
+        created = await materialize(recurring["id"], TODAY, horizon_days=90)
+
+        tasks = await occurrences(client, db_user.id)
+        assert created == 2
+        assert [task["due_date"] for task in tasks] == ["2026-03-31", "2026-05-31"]
+
+    async def test_occurrences_are_created_once(self, client, db_user):
+        """Test that runs only add new days, even where tasks were deleted."""
+        recurring = await create_recurring_task(
+            client,
+            assignee_id=str(db_user.id),
+            frequency="daily",
+            starts_on=TODAY.isoformat(),
+        )
+        first = (await occurrences(client, db_user.id))[0]
+        (await client.delete(f"/tasks/{first['id']}")).raise_for_status()
+
+        again = await materialize(recurring["id"], TODAY, horizon_days=14)
+        week_later = await materialize(recurring["id"], TODAY + timedelta(7), 14)
+
+        tasks = await occurrences(client, db_user.id)
+        assert (again, week_later) == (0, 7)
+        assert len(tasks) == 14 + 7
+        assert tasks[0]["due_date"] == (TODAY + timedelta(1)).isoformat()
+
+    async def test_deleted_recurring_task_keeps_its_occurrences(self, client, db_user):
+        """Test that deleting a recurring task unlinks its occurrences."""
+        recurring = await create_recurring_task(
+            client,
+            assignee_id=str(db_user.id),
+            frequency="weekly",
+            starts_on=TODAY.isoformat(),
+        )
+
+        response = await client.delete(f"/recurring-tasks/{recurring['id']}")
+
+        assert response.status_code == 204
+        tasks = await occurrences(client, db_user.id)
+        assert len(tasks) == 3
+        assert {task["recurring_task_id"] for task in tasks} == {None}
+        missing = await client.get(f"/recurring-tasks/{recurring['id']}")
+        assert missing.status_code == 404
@@ -0,0 +1,65 @@
+import json
+import uuid
+from datetime import date
+
+from src.api.serializers import (
+    TASK_FIELDS,
+    USER_FIELDS,
+    ORJSONResponse,
+    task_row_to_dict,
+)
+from src.models.tasks import TaskPublic
+
+
+def make_row(assignee_id: uuid.UUID | None) -> tuple:
+    task = {
+        "id": 1,
+        "title": "Dishes",
+        "description": None,
+        "assignee_id": assignee_id,
+        "category": "Chore",
+        "due_date": date(2026, 1, 1),
+        "status": "todo",
+        "updated_at": None,
+        "version": 1,
+        "recurring_task_id": None,
+    }
+    user = {
+        "id": assignee_id,
+        "email": "member@example.com",
+        "full_name": None,
+        "is_active": True,
+        "is_superuser": False,
+        "clerk_id": "user_1",
+        "image_url": None,
+    }
+    if assignee_id is None:
+        user = dict.fromkeys(user)
+    return tuple(task[f] for f in TASK_FIELDS) + tuple(user[f] for f in USER_FIELDS)
+
+
+class SubclassedUUID(uuid.UUID):
+    """Stands in for the UUID type returned by asyncpg."""
+
+
+class TestTaskRowToDict:
+    def test_row_matches_task_public(self):
+        """Test that the direct path produces a valid TaskPublic payload."""
+        task = task_row_to_dict(make_row(uuid.uuid4()))
+
+        assert TaskPublic.model_validate(task).assignee.email == "member@example.com"
+
+    def test_unassigned_task(self):
+        """Test that a task without assignee serializes assignee as null."""
+        task = task_row_to_dict(make_row(None))
+
+        assert task["assignee"] is None
+
+
+class TestORJSONResponse:
+    def test_encodes_uuid_subclasses(self):
+        """Test that driver-specific UUID types are encoded as strings."""
+        value = SubclassedUUID(int=1)
+        body = ORJSONResponse({"id": value, "day": date(2026, 1, 1)}).body
+
+        assert json.loads(body) == {"id": str(value), "day": "2026-01-01"}
@@ -0,0 +1,203 @@
+import uuid
+from datetime import date
+
+from src.api.routes.tasks import MAX_BULK_SIZE
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+def task_body(i: int = 0, **fields) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{i}",
+        "category": "Chore",
+        "due_date": date(2026, 1, 1).isoformat(),
+        "status": "todo",
+        **fields,
+    }
+
+
+async def create_tasks(client, count: int) -> list[int]:
+    response = await client.post(
+        "/tasks/bulk", json=[task_body(i) for i in range(count)]
+    )
+    return [task["id"] for task in response.json()["tasks"]]
+
+
+class TestBulkCreate:
+    async def test_tasks_are_created_in_body_order(self, client, db_user):
+        """Test that created tasks come back in order, with their assignee."""
+        response = await client.post(
+            "/tasks/bulk",
+            json=[
+                task_body(0, assignee_id=str(db_user.id)),
+                task_body(1, category="Shopping", description="Milk"),
+                task_body(2),
+            ],
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["errors"] == []
+        tasks = result["tasks"]
+        assert [task["title"] for task in tasks] == [
+            f"{TEST_TASK_PREFIX}{i}" for i in range(3)
+        ]
+        assert tasks[0]["id"] < tasks[1]["id"] < tasks[2]["id"]
+        assert tasks[0]["assignee"]["id"] == str(db_user.id)
+        assert (tasks[1]["category"], tasks[1]["description"]) == ("Shopping", "Milk")
+        for task in tasks:
+            stored = (await client.get(f"/tasks/{task['id']}")).json()
+            assert stored["title"] == task["title"]
+
+    async def test_missing_assignee_is_reported(self, client):
+        """Test that an unknown assignee rejects its item only."""
+        response = await client.post(
+            "/tasks/bulk",
+            json=[task_body(0), task_body(1, assignee_id=str(uuid.uuid4()))],
+        )
+
+        result = response.json()
+        assert [task["title"] for task in result["tasks"]] == [f"{TEST_TASK_PREFIX}0"]
+        assert result["errors"] == [{"index": 1, "detail": "Assignee not found"}]
+
+    async def test_invalid_items_reject_the_request(self, client):
+        """Test that a malformed item or an oversized body is a 422."""
+        invalid = await client.post(
+            "/tasks/bulk", json=[task_body(0), task_body(1, status="someday")]
+        )
+        oversized = await client.post(
+            "/tasks/bulk", json=[task_body(i) for i in range(MAX_BULK_SIZE + 1)]
+        )
+        empty = await client.post("/tasks/bulk", json=[])
+
+        assert invalid.status_code == 422
+        assert oversized.status_code == 422
+        assert empty.json() == {"tasks": [], "errors": []}
+
+
+class TestBulkUpdate:
+    async def test_items_with_different_fields_are_applied(self, client, db_user):
+        """Test that each item only changes the fields it sets."""
+        ids = await create_tasks(client, 3)
+
+        response = await client.patch(
+            "/tasks/bulk",
+            json=[
+                {"id": ids[2], "status": "completed"},
+                {"id": ids[0], "title": f"{TEST_TASK_PREFIX}renamed"},
+                {"id": ids[1], "assignee_id": str(db_user.id), "status": "completed"},
+            ],
+        )
+
+        assert response.status_code == 200
+        result = response.json()
+        assert result["errors"] == []
+        tasks = result["tasks"]
+        assert [task["id"] for task in tasks] == [ids[2], ids[0], ids[1]]
+        assert (tasks[0]["title"], tasks[0]["status"]) == (
+            f"{TEST_TASK_PREFIX}2",
+            "completed",
+        )
+        assert (tasks[1]["title"], tasks[1]["status"]) == (
+            f"{TEST_TASK_PREFIX}renamed",
+            "todo",
+        )
+        assert tasks[2]["assignee"]["id"] == str(db_user.id)
+        assert all(task["version"] == 2 for task in tasks)
+
+    async def test_invalid_items_are_reported(self, client):
+        """Test that bad items are reported by index and the others applied."""
+        ids = await create_tasks(client, 2)
+
+        response = await client.patch(
+            "/tasks/bulk",
+            json=[
+                {"id": ids[0], "status": "completed"},
+                {"id": ids[0], "status": "in-progress"},
+                {"id": ids[1], "title": None},
+                {"id": ids[1], "assignee_id": str(uuid.uuid4())},
+                {"id": 0, "status": "completed"},
+            ],
+        )
+
+        result = response.json()
+        assert [(task["id"], task["status"]) for task in result["tasks"]] == [
+            (ids[0], "completed")
+        ]
+        assert result["errors"] == [
+            {"index": 1, "detail": "Duplicate task ID"},
+            {"index": 2, "detail": "title cannot be null"},
+            {"index": 3, "detail": "Assignee not found"},
+            {"index": 4, "detail": "Task not found"},
+        ]
+        untouched = (await client.get(f"/tasks/{ids[1]}")).json()
+        assert (untouched["title"], untouched["version"]) == (
+            f"{TEST_TASK_PREFIX}1",
+            1,
+        )
+
+    async def test_items_without_changes_return_the_task(self, client):
+        """Test that an item with only an ID returns the task as it is."""
+        ids = await create_tasks(client, 1)
+
+        result = (await client.patch("/tasks/bulk", json=[{"id": ids[0]}])).json()
+
+        assert [(task["id"], task["version"]) for task in result["tasks"]] == [
+            (ids[0], 1)
+        ]
+        assert result["errors"] == []
+
+    async def test_nullable_fields_can_be_cleared(self, client, db_user):
+        """Test that explicit nulls clear the description and assignee."""
+        response = await client.post(
+            "/tasks/bulk",
+            json=[task_body(0, description="Note", assignee_id=str(db_user.id))],
+        )
+        task_id = response.json()["tasks"][0]["id"]
+
+        result = (
+            await client.patch(
+                "/tasks/bulk",
+                json=[{"id": task_id, "description": None, "assignee_id": None}],
+            )
+        ).json()
+
+        [task] = result["tasks"]
+        assert (task["description"], task["assignee"]) == (None, None)
+
+
+class TestBulkDelete:
+    async def test_tasks_are_deleted(self, client):
+        """Test that tasks are deleted and their IDs returned in body order."""
+        ids = await create_tasks(client, 3)
+
+        response = await client.request("DELETE", "/tasks/bulk", json=ids[::-1])
+
+        assert response.status_code == 200
+        assert response.json() == {"deleted": ids[::-1], "errors": []}
+        for task_id in ids:
+            assert (await client.get(f"/tasks/{task_id}")).status_code == 404
+
+    async def test_duplicate_and_missing_ids_are_reported(self, client):
+        """Test that repeated and unknown IDs are reported, others deleted."""
+        ids = await create_tasks(client, 2)
+
+        response = await client.request(
+            "DELETE", "/tasks/bulk", json=[ids[0], 0, ids[0], ids[1]]
+        )
+
+        assert response.json() == {
+            "deleted": [ids[0], ids[1]],
+            "errors": [
+                {"index": 1, "detail": "Task not found"},
+                {"index": 2, "detail": "Duplicate task ID"},
+            ],
+        }
+
+    async def test_nothing_to_delete(self, client):
+        """Test that a body of unknown IDs only reports errors."""
+        response = await client.request("DELETE", "/tasks/bulk", json=[0])
+
+        assert response.json() == {
+            "deleted": [],
+            "errors": [{"index": 0, "detail": "Task not found"}],
+        }
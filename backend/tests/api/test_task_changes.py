@@ -0,0 +1,108 @@
+from datetime import date
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.models.tasks import Task, TaskCategory, TaskStatus
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+def task_body(title: str) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{title}",
+        "category": "Chore",
+        "due_date": date(2026, 1, 1).isoformat(),
+        "status": "todo",
+    }
+
+
+async def drain_changes(client, cursor: str | None = None) -> tuple[dict, str]:
+    """Read the changes feed to its end; return the last page and cursor."""
+    while True:
+        params = {"limit": 500} if cursor is None else {"limit": 500, "since": cursor}
+        response = await client.get("/tasks/changes", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        cursor = page["cursor"]
+        if not page["has_more"]:
+            return page, cursor
+
+
+async def read_changes(client, cursor: str) -> dict:
+    response = await client.get("/tasks/changes", params={"since": cursor})
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestTaskChanges:
+    async def test_writes_are_returned_in_order(self, client):
+        """Test that creations, updates and deletions come back in order."""
+        _, cursor = await drain_changes(client)
+        first = (await client.post("/tasks/", json=task_body("first"))).json()
+        second = (await client.post("/tasks/", json=task_body("second"))).json()
+        await client.patch(f"/tasks/{first['id']}", json={"status": "completed"})
+        await client.delete(f"/tasks/{second['id']}")
+
+        page = await read_changes(client, cursor)
+
+        assert [task["id"] for task in page["tasks"]] == [first["id"]]
+        assert page["tasks"][0]["status"] == "completed"
+        assert page["deleted"] == [second["id"]]
+        assert page["has_more"] is False
+        assert await read_changes(client, page["cursor"]) == {
+            **page,
+            "tasks": [],
+            "deleted": [],
+        }
+
+    async def test_pages_follow_the_cursor(self, client):
+        """Test that `has_more` pages return each change once."""
+        _, cursor = await drain_changes(client)
+        response = await client.post(
+            "/tasks/bulk", json=[task_body(str(i)) for i in range(5)]
+        )
+        ids = [task["id"] for task in response.json()["tasks"]]
+
+        seen: list[int] = []
+        while True:
+            response = await client.get(
+                "/tasks/changes", params={"since": cursor, "limit": 2}
+            )
+            page = response.json()
+            assert len(page["tasks"]) <= 2
+            seen += [task["id"] for task in page["tasks"]]
+            cursor = page["cursor"]
+            if not page["has_more"]:
+                break
+
+        assert seen == ids
+
+    async def test_invalid_cursor(self, client):
+        """Test that a malformed cursor is a client error."""
+        response = await client.get("/tasks/changes", params={"since": "nope"})
+
+        assert response.status_code == 400
+
+    async def test_late_commit_is_not_passed(self, client):
+        """Test that a change committed after a later one is still returned."""
+        _, cursor = await drain_changes(client)
+        async with AsyncSession(async_engine, expire_on_commit=False) as session:
+            # Written first, committed last.
+            late = Task(
+                title=f"{TEST_TASK_PREFIX}late",
+                category=TaskCategory.Chore,
+                due_date=date(2026, 1, 1),
+                status=TaskStatus.TODO,
+            )
+            session.add(late)
+            await session.flush()
+            early = (await client.post("/tasks/", json=task_body("early"))).json()
+
+            page = await read_changes(client, cursor)
+            assert page["tasks"] == []
+            assert page["cursor"] == cursor
+
+            await session.commit()
+
+        page = await read_changes(client, cursor)
+        assert [task["id"] for task in page["tasks"]] == [late.id, early["id"]]
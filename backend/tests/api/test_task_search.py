@@ -0,0 +1,85 @@
+import uuid
+from datetime import date
+
+import pytest
+
+from src.api.pagination import NEXT_CURSOR_HEADER
+from src.api.search import prefix_tsquery
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+@pytest.fixture
+def word() -> str:
+    """A word no other task contains."""
+    return f"zq{uuid.uuid4().hex[:10]}"
+
+
+async def create_task(client, title: str, description: str | None = None, **fields):
+    response = await client.post(
+        "/tasks/",
+        json={
+            "title": f"{TEST_TASK_PREFIX}{title}",
+            "description": description,
+            "category": "Chore",
+            "due_date": date(2026, 1, 1).isoformat(),
+            "status": "todo",
+            **fields,
+        },
+    )
+    response.raise_for_status()
+    return response.json()["id"]
+
+
+class TestPrefixTsquery:
+    def test_operators_are_dropped(self):
+        """Test that only words make it into the query, each as a prefix."""
+        assert prefix_tsquery("buy & (milk | eggs):*!") == "buy:* & milk:* & eggs:*"
+        assert prefix_tsquery("!?") is None
+
+
+class TestSearchTasks:
+    async def test_prefixes_match_and_titles_rank_first(self, client, word):
+        """Test that words match by prefix, title matches first."""
+        in_description = await create_task(client, "Chores", f"{word}groceries")
+        in_title = await create_task(client, f"Buy {word}groceries")
+        await create_task(client, f"Buy {word}milk")
+
+        response = await client.get("/tasks/search", params={"q": f"{word}groc"})
+
+        assert response.status_code == 200
+        assert [task["id"] for task in response.json()] == [in_title, in_description]
+
+    async def test_filters_apply(self, client, word):
+        """Test that the filters of `GET /tasks/` narrow the search."""
+        await create_task(client, f"Clean {word}", status="todo")
+        done = await create_task(client, f"Clean {word} again", status="completed")
+
+        response = await client.get(
+            "/tasks/search", params={"q": word, "status": "completed"}
+        )
+
+        assert [task["id"] for task in response.json()] == [done]
+
+    async def test_pages_cover_every_match(self, client, word):
+        """Test that following the cursor returns each match once."""
+        ids = {await create_task(client, f"{word} {i}") for i in range(5)}
+
+        found, cursor = [], None
+        while True:
+            params = {"q": word, "limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/tasks/search", params=params)
+            found += [task["id"] for task in response.json()]
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if cursor is None:
+                break
+
+        assert sorted(found) == sorted(ids)
+
+    async def test_no_words_match_nothing(self, client):
+        """Test that a query of punctuation only returns no tasks."""
+        response = await client.get("/tasks/search", params={"q": "&!"})
+
+        assert response.status_code == 200
+        assert response.json() == []
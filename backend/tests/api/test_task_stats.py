@@ -0,0 +1,70 @@
+from datetime import date
+
+from tests.api.conftest import TEST_TASK_PREFIX
+
+TODAY = date(2026, 3, 1)
+
+
+async def create_tasks(client, assignee_id: str) -> None:
+    for i, (category, status, due_date) in enumerate(
+        [
+            ("Chore", "todo", date(2026, 2, 1)),  # overdue
+            ("Chore", "completed", date(2026, 2, 1)),
+            ("Chore", "in-progress", date(2026, 4, 1)),
+            ("Shopping", "todo", date(2026, 3, 1)),  # due today
+        ]
+    ):
+        response = await client.post(
+            "/tasks/",
+            json={
+                "title": f"{TEST_TASK_PREFIX}{i}",
+                "category": category,
+                "status": status,
+                "due_date": due_date.isoformat(),
+                "assignee_id": assignee_id,
+            },
+        )
+        response.raise_for_status()
+
+
+class TestTaskStats:
+    async def test_counts_per_group(self, client, db_user, query_counter):
+        """Test that each grouping set is counted by a single statement."""
+        await create_tasks(client, str(db_user.id))
+
+        with query_counter() as log:
+            response = await client.get(
+                "/tasks/stats",
+                params={"assignee_id": str(db_user.id), "today": TODAY.isoformat()},
+            )
+
+        assert response.status_code == 200
+        stats = response.json()
+        assert stats["counts"] == {"total": 4, "completed": 1, "overdue": 1}
+        assert stats["by_status"] == {"todo": 2, "in-progress": 1, "completed": 1}
+        assert stats["by_category"] == [
+            {"category": "Chore", "total": 3, "completed": 1, "overdue": 1},
+            {"category": "Shopping", "total": 1, "completed": 0, "overdue": 0},
+        ]
+        assert stats["by_assignee"] == [
+            {"assignee_id": str(db_user.id), "total": 4, "completed": 1, "overdue": 1}
+        ]
+        # Collection versions for the ETag, then the stats.
+        assert len(log.statements) == 2, log.statements
+
+    async def test_unchanged_stats_are_not_modified(self, client, db_user):
+        """Test that stats are revalidated with their ETag until tasks change."""
+        params = {"assignee_id": str(db_user.id), "today": TODAY.isoformat()}
+        etag = (await client.get("/tasks/stats", params=params)).headers["ETag"]
+
+        cached = await client.get(
+            "/tasks/stats", params=params, headers={"If-None-Match": etag}
+        )
+        await create_tasks(client, str(db_user.id))
+        changed = await client.get(
+            "/tasks/stats", params=params, headers={"If-None-Match": etag}
+        )
+
+        assert cached.status_code == 304
+        assert changed.status_code == 200
+        assert changed.json()["counts"]["total"] == 4
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import uuid
+
+from sqlalchemy import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.task_transfer import TaskImport, read_records
+from src.core.db import async_engine
+from src.models.outbox import OutboxEvent
+from tests.api.conftest import TEST_TASK_PREFIX
+
+
+async def chunks_of(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def task_record(i: int, **fields) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{i}",
+        "category": "Chore",
+        "due_date": "2026-01-01",
+        "status": "todo",
+        **fields,
+    }
+
+
+class TestReadRecords:
+    async def test_csv_values_may_span_lines_and_chunks(self):
+        """Test that quoted newlines don't split a record, wherever chunks end."""
+        data = b'title,description\r\na,"two\r\nlines, ""quoted"""\r\nb,\r\n'
+
+        records = [record async for record in read_records(chunks_of(data, 3), "csv")]
+
+        assert records == [
+            {"title": "a", "description": 'two\nlines, "quoted"'},
+            {"title": "b", "description": None},
+        ]
+
+    async def test_unreadable_ndjson_lines_are_yielded_as_errors(self):
+        """Test that a broken line doesn't stop the records after it."""
+        data = b'{"title": "a"}\n{"title": \n\n{"title": "b"}'
+
+        records = [r async for r in read_records(chunks_of(data, 5), "ndjson")]
+
+        assert records[0] == {"title": "a"}
+        assert isinstance(records[1], ValueError)
+        assert records[2] == {"title": "b"}
+
+
+class TestImportTasks:
+    async def test_valid_records_are_loaded_and_others_reported(self, client, db_user):
+        """Test that invalid records are skipped and reported by position."""
+        lines = [
+            task_record(0, assignee_id=str(db_user.id)),
+            task_record(1, status="someday"),
+            task_record(2, assignee_id=str(uuid.uuid4())),
+            task_record(3, description="Also imported"),
+        ]
+        body = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+
+        response = await client.post("/tasks/import", content=body.encode())
+
+        assert response.status_code == 200
+        result = response.json()
+        assert (result["imported"], result["skipped"]) == (2, 3)
+        assert [error["index"] for error in result["errors"]] == [1, 2, 4]
+        assert result["errors"][1]["detail"] == "Assignee not found"
+
+        exported = await client.get(
+            "/tasks/export", params={"assignee_id": str(db_user.id)}
+        )
+        rows = [json.loads(line) for line in exported.text.splitlines()]
+        assert [(row["title"], row["status"]) for row in rows] == [
+            (f"{TEST_TASK_PREFIX}0", "todo")
+        ]
+
+    async def test_imported_tasks_queue_domain_events(self, db_user):
+        """Test that each imported task queues its `task.created` event."""
+        async with AsyncSession(async_engine) as session:
+            # Two batches, through the same staging table.
+            task_import = TaskImport(session, batch_size=2)
+            for i in range(3):
+                await task_import.add(i, task_record(i))
+            await task_import.finish()
+
+        assert task_import.imported == 3
+        async with AsyncSession(async_engine) as session:
+            statement = (
+                select(OutboxEvent.payload["title"].astext)
+                .where(
+                    OutboxEvent.event_type == "task.created",
+                    OutboxEvent.payload["title"].astext.startswith(TEST_TASK_PREFIX),  # type: ignore
+                )
+                .order_by(OutboxEvent.id)  # type: ignore
+            )
+            titles = (await session.exec(statement)).scalars().all()  # type: ignore
+        assert titles[-3:] == [f"{TEST_TASK_PREFIX}{i}" for i in range(3)]
+
+
+class TestExportTasks:
+    async def test_csv_export_imports_back(self, client, db_user):
+        """Test that an exported CSV creates the same tasks when imported."""
+        assignee = {"assignee_id": str(db_user.id)}
+        for i in range(3):
+            description = "multi\nline" if i == 1 else None
+            response = await client.post(
+                "/tasks/", json=task_record(i, description=description, **assignee)
+            )
+            response.raise_for_status()
+
+        exported = await client.get(
+            "/tasks/export", params={"format": "csv", **assignee}
+        )
+        imported = await client.post(
+            "/tasks/import", params={"format": "csv"}, content=exported.content
+        )
+        again = await client.get("/tasks/export", params={"format": "csv", **assignee})
+
+        assert exported.headers["content-type"].startswith("text/csv")
+        assert imported.json() == {"imported": 3, "skipped": 0, "errors": []}
+        rows = list(csv.DictReader(io.StringIO(again.text)))
+        assert len(rows) == 6
+        assert [row["description"] for row in rows].count("multi\nline") == 2
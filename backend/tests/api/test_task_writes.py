@@ -0,0 +1,199 @@
+import asyncio
+from datetime import date
+
+from tests.api.conftest import TEST_TASK_PREFIX
+
+MAX_WRITE_ROUND_TRIPS = 2
+
+
+def task_body(i: int = 0, **fields) -> dict:
+    return {
+        "title": f"{TEST_TASK_PREFIX}{i}",
+        "category": "Chore",
+        "due_date": date(2026, 1, 1).isoformat(),
+        "status": "todo",
+        **fields,
+    }
+
+
+class TestTaskWriteRoundTrips:
+    async def test_create_task(self, client, db_user, query_counter):
+        """Test that creating a task, assignee included, is one statement."""
+        with query_counter() as log:
+            response = await client.post(
+                "/tasks/", json=task_body(assignee_id=str(db_user.id))
+            )
+
+        assert response.status_code == 201
+        assert response.json()["assignee"]["id"] == str(db_user.id)
+        assert log.round_trips <= MAX_WRITE_ROUND_TRIPS, log.statements
+
+    async def test_update_task(self, client, db_user, query_counter):
+        """Test that updating a task returns it from the UPDATE itself."""
+        task_id = (await client.post("/tasks/", json=task_body())).json()["id"]
+
+        with query_counter() as log:
+            response = await client.patch(
+                f"/tasks/{task_id}",
+                json={"status": "completed", "assignee_id": str(db_user.id)},
+            )
+
+        assert response.status_code == 200
+        assert response.json()["status"] == "completed"
+        assert response.json()["assignee"]["id"] == str(db_user.id)
+        assert log.round_trips <= MAX_WRITE_ROUND_TRIPS, log.statements
+
+    async def test_delete_task(self, client, query_counter):
+        """Test that deleting a task, tombstone included, is one statement."""
+        task_id = (await client.post("/tasks/", json=task_body())).json()["id"]
+
+        with query_counter() as log:
+            response = await client.delete(f"/tasks/{task_id}")
+
+        assert response.status_code == 204
+        assert log.round_trips <= MAX_WRITE_ROUND_TRIPS, log.statements
+
+    async def test_missing_task_is_not_committed(self, client, query_counter):
+        """Test that writes to a missing task are rolled back."""
+        with query_counter() as log:
+            patched = await client.patch("/tasks/0", json={"status": "completed"})
+            deleted = await client.delete("/tasks/0")
+
+        assert patched.status_code == 404
+        assert deleted.status_code == 404
+        assert log.commits == 0
+
+    async def test_bulk_writes_do_not_grow_with_batch(self, client, query_counter):
+        """Test that bulk endpoints cost the same round trips for 1 or 50 items."""
+        counts = []
+        for size in (1, 50):
+            with query_counter() as created:
+                response = await client.post(
+                    "/tasks/bulk", json=[task_body(i) for i in range(size)]
+                )
+            ids = [task["id"] for task in response.json()["tasks"]]
+            with query_counter() as updated:
+                await client.patch(
+                    "/tasks/bulk",
+                    json=[{"id": task_id, "status": "completed"} for task_id in ids],
+                )
+            with query_counter() as deleted:
+                await client.request("DELETE", "/tasks/bulk", json=ids)
+
+            assert len(ids) == size
+            counts.append(
+                (created.round_trips, updated.round_trips, deleted.round_trips)
+            )
+
+        assert counts[0] == counts[1]
+        assert all(count <= MAX_WRITE_ROUND_TRIPS for count in counts[0])
+
+
+class TestOptimisticConcurrency:
+    async def test_stale_version_is_rejected(self, client, query_counter):
+        """Test that an update based on an old version fails, in one UPDATE."""
+        task = (await client.post("/tasks/", json=task_body())).json()
+        updated = await client.patch(
+            f"/tasks/{task['id']}", json={"status": "completed", "version": 1}
+        )
+
+        with query_counter() as log:
+            stale = await client.patch(
+                f"/tasks/{task['id']}", json={"title": "test-stale", "version": 1}
+            )
+        current = (await client.get(f"/tasks/{task['id']}")).json()
+
+        assert task["version"] == 1
+        assert updated.status_code == 200
+        assert updated.json()["version"] == 2
+        assert stale.status_code == 409
+        assert stale.json()["detail"].endswith("version 2")
+        assert current["title"] == task["title"]
+        assert log.commits == 0
+
+    async def test_if_match_header(self, client):
+        """Test that the version can be given as an If-Match entity tag."""
+        task_id = (await client.post("/tasks/", json=task_body())).json()["id"]
+
+        matching = await client.patch(
+            f"/tasks/{task_id}",
+            json={"status": "completed"},
+            headers={"If-Match": '"1"'},
+        )
+        stale = await client.patch(
+            f"/tasks/{task_id}", json={}, headers={"If-Match": '"1"'}
+        )
+        disagreeing = await client.patch(
+            f"/tasks/{task_id}", json={"version": 2}, headers={"If-Match": '"1"'}
+        )
+        missing = await client.patch("/tasks/0", json={}, headers={"If-Match": "*"})
+
+        assert matching.status_code == 200
+        assert matching.headers["etag"] == '"2"'
+        assert stale.status_code == 412
+        assert disagreeing.status_code == 412
+        assert missing.status_code == 404
+
+    async def test_etag_round_trip(self, client):
+        """Test that the ETag of a read task is accepted back as If-Match."""
+        task_id = (await client.post("/tasks/", json=task_body())).json()["id"]
+
+        read = await client.get(f"/tasks/{task_id}")
+        updated = await client.patch(
+            f"/tasks/{task_id}",
+            json={"status": "completed"},
+            headers={"If-Match": read.headers["etag"]},
+        )
+        stale = await client.patch(
+            f"/tasks/{task_id}",
+            json={"status": "todo"},
+            headers={"If-Match": read.headers["etag"]},
+        )
+        revalidated = await client.get(
+            f"/tasks/{task_id}", headers={"If-None-Match": updated.headers["etag"]}
+        )
+
+        assert read.headers["etag"] == '"1"'
+        assert updated.status_code == 200
+        assert updated.headers["etag"] == '"2"'
+        assert stale.status_code == 412
+        assert revalidated.status_code == 304
+
+    async def test_concurrent_updates_of_a_version(self, client):
+        """Test that of updates based on the same version, only one applies."""
+        task_id = (await client.post("/tasks/", json=task_body())).json()["id"]
+
+        responses = await asyncio.gather(
+            *(
+                client.patch(
+                    f"/tasks/{task_id}", json={"title": f"test-{i}", "version": 1}
+                )
+                for i in range(5)
+            )
+        )
+
+        assert sorted(r.status_code for r in responses) == [200, 409, 409, 409, 409]
+
+    async def test_bulk_update_versions(self, client):
+        """Test that bulk items with a stale version are reported, not applied."""
+        response = await client.post(
+            "/tasks/bulk", json=[task_body(i) for i in range(3)]
+        )
+        ids = [task["id"] for task in response.json()["tasks"]]
+        await client.patch(f"/tasks/{ids[1]}", json={"status": "completed"})
+
+        result = (
+            await client.patch(
+                "/tasks/bulk",
+                json=[
+                    {"id": ids[0], "status": "in-progress", "version": 1},
+                    {"id": ids[1], "status": "in-progress", "version": 1},
+                    {"id": ids[2], "version": 2},
+                ],
+            )
+        ).json()
+
+        assert [task["id"] for task in result["tasks"]] == [ids[0]]
+        assert result["tasks"][0]["version"] == 2
+        assert [error["index"] for error in result["errors"]] == [1, 2]
+        assert result["errors"][0]["detail"].endswith("version 2")
@@ -0,0 +1,287 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlalchemy import delete
+from sqlalchemy.exc import DBAPIError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from svix import Webhook
+
+from src.core.config import settings
+from src.core.db import async_engine
+from src.models.users import User
+from src.models.webhooks import WebhookInboxEvent, WebhookInboxPartition
+from src.webhooks.handlers import apply_user_changes, coalesce_user_events
+from src.webhooks.inbox import WebhookInboxWorker
+
+TEST_PREFIX = "test_wh_"
+
+
+def user_event(
+    event_type: str,
+    clerk_id: str,
+    email: str | None = None,
+    timestamp: int | None = None,
+) -> dict:
+    data: dict = {"id": clerk_id}
+    if event_type != "user.deleted":
+        data["email_addresses"] = [{"email_address": email}] if email else []
+        data["first_name"] = "Test"
+    event = {"type": event_type, "data": data}
+    if timestamp is not None:
+        event["timestamp"] = timestamp
+    return event
+
+
+async def post_event(client, event: dict, svix_id: str | None = None):
+    svix_id = svix_id or f"{TEST_PREFIX}{uuid.uuid4().hex}"
+    body = json.dumps(event)
+    now = datetime.now(timezone.utc)
+    signature = Webhook(settings.CLERK_WEBHOOK_SECRET_KEY).sign(svix_id, now, body)
+    return await client.post(
+        "/webhooks/clerk",
+        content=body,
+        headers={
+            "svix-id": svix_id,
+            "svix-timestamp": str(int(now.timestamp())),
+            "svix-signature": signature,
+        },
+    )
+
+
+@pytest.fixture
+async def inbox(client):
+    """Drop the events and users created through webhooks by the test."""
+    yield
+    async with AsyncSession(async_engine) as session:
+        await session.exec(
+            delete(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(TEST_PREFIX)  # type: ignore
+            )
+        )
+        await session.exec(delete(User).where(User.clerk_id.startswith(TEST_PREFIX)))  # type: ignore
+        await session.commit()
+
+
+async def fetch(statement):
+    async with AsyncSession(async_engine) as session:
+        return (await session.exec(statement)).all()
+
+
+class TestWebhookInbox:
+    async def test_redelivery_is_stored_once(self, client, inbox):
+        """Test that an event delivered twice is queued once, with 202s."""
+        svix_id = f"{TEST_PREFIX}{uuid.uuid4().hex}"
+        event = user_event("user.created", f"{TEST_PREFIX}1", "wh1@example.com")
+        labels = {"event_type": "user.created", "outcome": "duplicate"}
+        duplicates = REGISTRY.get_sample_value("webhook_events_total", labels) or 0
+
+        first = await post_event(client, event, svix_id)
+        second = await post_event(client, event, svix_id)
+
+        assert (first.status_code, second.status_code) == (202, 202)
+        rows = await fetch(
+            select(WebhookInboxEvent).where(WebhookInboxEvent.svix_id == svix_id)
+        )
+        assert len(rows) == 1
+        assert REGISTRY.get_sample_value("webhook_events_total", labels) == (
+            duplicates + 1
+        )
+
+    async def test_bad_signature_is_rejected(self, client, inbox):
+        """Test that unsigned events never reach the inbox."""
+        response = await client.post(
+            "/webhooks/clerk",
+            content=b"{}",
+            headers={"svix-id": "x", "svix-timestamp": "0", "svix-signature": "v1,x"},
+        )
+
+        assert response.status_code == 400
+
+    async def test_worker_coalesces_events(self, client, inbox):
+        """Test that a batch is reduced to the last state of each user."""
+        kept, removed = f"{TEST_PREFIX}kept", f"{TEST_PREFIX}removed"
+        events = [
+            user_event("user.created", kept, "old@example.com"),
+            user_event("user.updated", kept, "new@example.com"),
+            user_event("user.created", removed, "removed@example.com"),
+            user_event("user.updated", removed, "removed@example.com"),
+            user_event("user.created", f"{TEST_PREFIX}invalid"),
+        ]
+        for event in events:
+            assert (await post_event(client, event)).status_code == 202
+        # The removed user is created by a first batch, then deleted.
+        await WebhookInboxWorker(batch_size=100).drain()
+        await post_event(client, user_event("user.deleted", removed))
+        await WebhookInboxWorker(batch_size=100).drain()
+
+        users = {
+            user.clerk_id: user
+            for user in await fetch(
+                select(User).where(User.clerk_id.startswith(TEST_PREFIX))  # type: ignore
+            )
+        }
+        assert users[kept].email == "new@example.com"
+        assert users[kept].full_name == "Test"
+        assert users[removed].is_active is False
+        assert f"{TEST_PREFIX}invalid" not in users
+
+        pending = await fetch(
+            select(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(TEST_PREFIX),  # type: ignore
+                WebhookInboxEvent.error.is_not(None),  # type: ignore
+            )
+        )
+        assert [event.processed_at is not None for event in pending] == [True]
+
+    async def test_conflict_retries_only_failing_user(self, client, inbox):
+        """Test that a duplicate email leaves the other users applied."""
+        first, second = f"{TEST_PREFIX}first", f"{TEST_PREFIX}second"
+        await post_event(client, user_event("user.created", first, "same@example.com"))
+        await post_event(client, user_event("user.created", second, "same@example.com"))
+
+        await WebhookInboxWorker(batch_size=100).process_batch()
+
+        clerk_ids = await fetch(
+            select(User.clerk_id).where(User.clerk_id.startswith(TEST_PREFIX))  # type: ignore
+        )
+        assert len(clerk_ids) == 1
+        retried = await fetch(
+            select(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(TEST_PREFIX),  # type: ignore
+                WebhookInboxEvent.processed_at.is_(None),  # type: ignore
+            )
+        )
+        assert len(retried) == 1
+        assert retried[0].attempts == 1
+        assert "email" in retried[0].error
+
+    async def test_late_events_are_not_applied(self, client, inbox):
+        """Test that an event older than the applied ones changes nothing."""
+        clerk_id = f"{TEST_PREFIX}late"
+        await post_event(
+            client, user_event("user.created", clerk_id, "new@example.com", 2_000)
+        )
+        await post_event(client, user_event("user.deleted", clerk_id, timestamp=3_000))
+        await WebhookInboxWorker(batch_size=100).drain()
+        # Retried by Clerk after the deletion, e.g. once the first try failed.
+        await post_event(
+            client, user_event("user.updated", clerk_id, "old@example.com", 1_000)
+        )
+        await WebhookInboxWorker(batch_size=100).drain()
+
+        [user] = await fetch(select(User).where(User.clerk_id == clerk_id))
+        assert (user.email, user.is_active) == ("new@example.com", False)
+        assert user.clerk_event_at == 3_000
+
+    async def test_events_of_a_held_partition_wait(self, client, inbox):
+        """Test that a user's events are left alone while another worker has them."""
+        clerk_id = f"{TEST_PREFIX}held"
+        await post_event(
+            client, user_event("user.created", clerk_id, "held@example.com")
+        )
+        [partition] = await fetch(
+            select(WebhookInboxEvent.partition).where(
+                WebhookInboxEvent.payload["data"]["id"].astext == clerk_id  # type: ignore
+            )
+        )
+
+        async with AsyncSession(async_engine) as holder:
+            await holder.exec(
+                select(WebhookInboxPartition)
+                .where(WebhookInboxPartition.partition == partition)
+                .with_for_update()
+            )
+            await WebhookInboxWorker(batch_size=100).drain()
+            held = await fetch(select(User).where(User.clerk_id == clerk_id))
+        await WebhookInboxWorker(batch_size=100).drain()
+        applied = await fetch(select(User).where(User.clerk_id == clerk_id))
+
+        assert held == []
+        assert len(applied) == 1
+
+    async def test_rejected_data_is_not_retried(self, client, inbox):
+        """Test that data the database rejects marks only its event invalid."""
+        long, valid = f"{TEST_PREFIX}long", f"{TEST_PREFIX}valid"
+        long_email = f"{'x' * 300}@example.com"
+        await post_event(client, user_event("user.updated", long, long_email))
+        await post_event(client, user_event("user.created", valid, "ok@example.com"))
+
+        await WebhookInboxWorker(batch_size=100).drain()
+
+        clerk_ids = await fetch(
+            select(User.clerk_id).where(User.clerk_id.startswith(TEST_PREFIX))  # type: ignore
+        )
+        [rejected] = await fetch(
+            select(WebhookInboxEvent).where(
+                WebhookInboxEvent.payload["data"]["id"].astext == long  # type: ignore
+            )
+        )
+        assert clerk_ids == [valid]
+        assert rejected.processed_at is not None
+        assert rejected.attempts == 1
+        assert "too long" in rejected.error
+
+    async def test_failing_user_counts_an_attempt(self, client, inbox, monkeypatch):
+        """Test that an unexpected error fails the user's events, not the batch."""
+        broken, valid = f"{TEST_PREFIX}broken", f"{TEST_PREFIX}valid"
+
+        async def apply(session, changes):
+            if broken in changes.events:
+                raise RuntimeError("boom")
+            await apply_user_changes(session, changes)
+
+        monkeypatch.setattr("src.webhooks.inbox.apply_user_changes", apply)
+        await post_event(client, user_event("user.created", broken, "b@example.com"))
+        await post_event(client, user_event("user.created", valid, "v@example.com"))
+
+        await WebhookInboxWorker(batch_size=100).process_batch()
+
+        clerk_ids = await fetch(
+            select(User.clerk_id).where(User.clerk_id.startswith(TEST_PREFIX))  # type: ignore
+        )
+        [retried] = await fetch(
+            select(WebhookInboxEvent).where(
+                WebhookInboxEvent.svix_id.startswith(TEST_PREFIX),  # type: ignore
+                WebhookInboxEvent.processed_at.is_(None),  # type: ignore
+            )
+        )
+        assert clerk_ids == [valid]
+        assert retried.payload["data"]["id"] == broken
+        assert (retried.attempts, retried.error) == (1, "RuntimeError('boom')")
+
+    async def test_worker_survives_unexpected_errors(self, monkeypatch):
+        """Test that the background task keeps running after any exception."""
+        worker = WebhookInboxWorker(poll_interval=0.01)
+
+        async def process_batch():
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(worker, "process_batch", process_batch)
+        worker.start()
+        try:
+            await asyncio.sleep(0.05)
+            assert worker.stats.errors >= 2
+            assert worker._task is not None and not worker._task.done()
+        finally:
+            await worker.stop()
+
+
+class TestApplyUserChanges:
+    async def test_overlong_values_are_rejected(self, inbox):
+        """Test that values too long for their column raise, not truncate."""
+        clerk_id = f"{TEST_PREFIX}long"
+        email = f"{'x' * 300}@example.com"
+        changes = coalesce_user_events(
+            [("msg_1", "user.updated", user_event("user.updated", clerk_id, email))]
+        )
+
+        async with AsyncSession(async_engine) as session:
+            with pytest.raises(DBAPIError, match="too long"):
+                await apply_user_changes(session, changes)
+
+        assert await fetch(select(User).where(User.clerk_id == clerk_id)) == []
@@ -0,0 +1,34 @@
+import asyncio
+import os
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Settings are instantiated at import time; provide dummy values so that
+# modules depending on them can be imported without a .env file.
+os.environ.setdefault("CLERK_WEBHOOK_SECRET_KEY", "whsec_test")
+os.environ.setdefault("CLERK_JWT_ISSUER", "https://clerk.test")
+os.environ.setdefault("CLERK_JWKS_URL", "https://clerk.test/.well-known/jwks.json")
+os.environ.setdefault("POSTGRES_DB", "test")
+os.environ.setdefault("POSTGRES_USER", "test")
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+
+
+@pytest.fixture
+async def database() -> AsyncIterator[None]:
+    """Skip the test unless the configured database is reachable and migrated."""
+    from src.core.db import async_engine
+
+    try:
+        async with asyncio.timeout(5):
+            async with async_engine.connect() as connection:
+                await connection.execute(text("SELECT 1 FROM task LIMIT 0"))
+    except (OSError, TimeoutError, SQLAlchemyError):
+        await async_engine.dispose()
+        pytest.skip("No migrated Postgres database reachable")
+
+    yield
+    # The pool's connections belong to this test's event loop.
+    await async_engine.dispose()
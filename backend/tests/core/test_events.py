@@ -0,0 +1,33 @@
+import asyncio
+
+from src.core.events import EventBroker
+
+
+class TestEventBroker:
+    async def test_fan_out_to_every_subscriber(self):
+        """Test that a published message reaches all subscribers."""
+        broker = EventBroker()
+        async with broker.subscribe() as first, broker.subscribe() as second:
+            broker.publish("hello")
+
+            assert await asyncio.wait_for(first.get(), 1) == "hello"
+            assert await asyncio.wait_for(second.get(), 1) == "hello"
+
+    async def test_unsubscribe_on_exit(self):
+        """Test that leaving the context removes the subscriber."""
+        broker = EventBroker()
+        async with broker.subscribe():
+            assert broker.subscriber_count == 1
+        assert broker.subscriber_count == 0
+
+        broker.publish("nobody listening")
+
+    async def test_slow_subscriber_drops_oldest(self):
+        """Test that a full queue never blocks the publisher."""
+        broker = EventBroker(max_queue_size=2)
+        async with broker.subscribe() as queue:
+            for message in ("1", "2", "3"):
+                broker.publish(message)
+
+            assert [queue.get_nowait(), queue.get_nowait()] == ["2", "3"]
+            assert broker.dropped == 1
@@ -0,0 +1,88 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from prometheus_client import REGISTRY
+
+from src.api.middleware import MetricsMiddleware
+from src.core.metrics import JWKSFetchTimer
+from src.main import app as main_app
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/test-metrics/{item_id}")
+    async def read_item(item_id: int):
+        return {}
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+class TestMetricsMiddleware:
+    async def test_requests_are_labelled_by_route_template(self, client):
+        """Test that requests to the same route share their series."""
+        route = {"method": "GET", "route": "/test-metrics/{item_id}"}
+        ok_before = sample("http_requests_total", **route, status="200")
+        invalid_before = sample("http_requests_total", **route, status="422")
+        count_before = sample("http_request_duration_seconds_count", **route)
+
+        async with client:
+            await client.get("/test-metrics/1")
+            await client.get("/test-metrics/2")
+            await client.get("/test-metrics/x")
+
+        assert sample("http_requests_total", **route, status="200") == ok_before + 2
+        assert sample("http_requests_total", **route, status="422") == (
+            invalid_before + 1
+        )
+        assert sample("http_request_duration_seconds_count", **route) == (
+            count_before + 3
+        )
+        assert sample("http_requests_in_progress") == 0
+
+    async def test_unknown_paths_share_one_series(self, client):
+        """Test that paths matching no route don't create new series."""
+        labels = {"method": "GET", "route": "unmatched", "status": "404"}
+        before = sample("http_requests_total", **labels)
+
+        async with client:
+            await client.get("/missing/1")
+            await client.get("/missing/2")
+
+        assert sample("http_requests_total", **labels) == before + 2
+
+
+class TestJWKSFetchTimer:
+    def test_failed_fetches_are_counted(self):
+        """Test that a fetch raising is counted as an error and timed."""
+        errors_before = sample("jwks_fetches_total", result="error")
+        count_before = sample("jwks_fetch_duration_seconds_count")
+
+        with pytest.raises(RuntimeError), JWKSFetchTimer():
+            raise RuntimeError
+
+        assert sample("jwks_fetches_total", result="error") == errors_before + 1
+        assert sample("jwks_fetch_duration_seconds_count") == count_before + 1
+
+
+class TestMetricsEndpoint:
+    async def test_exposition_format(self):
+        """Test that /metrics serves the metrics in Prometheus' text format."""
+        transport = httpx.ASGITransport(app=main_app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            response = await client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'db_pool_size{engine="async"}' in response.text
@@ -0,0 +1,55 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from src.core.pool import InstrumentedQueuePool, pool_status
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+class TestInstrumentedQueuePool:
+    def test_records_checkouts(self, engine):
+        """Test that every checkout is counted and timed."""
+        for _ in range(3):
+            with engine.connect():
+                pass
+
+        status = pool_status(engine.pool)
+        assert status["checkouts"] == 3
+        assert status["checked_out"] == 0
+        assert status["wait_seconds_max"] >= 0
+
+    def test_records_overflow_and_timeout(self, engine):
+        """Test that overflow connections and pool exhaustion are visible."""
+        first = engine.connect()
+        second = engine.connect()
+
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+        status = pool_status(engine.pool)
+        assert status["checked_out"] == 2
+        assert status["overflow"] == 1
+        assert status["overflow_events"] == 1
+        assert status["timeouts"] == 1
+
+        first.close()
+        second.close()
+
+    def test_stats_survive_dispose(self, engine):
+        """Test that recreating the pool keeps the cumulative stats."""
+        with engine.connect():
+            pass
+        engine.dispose()
+
+        assert pool_status(engine.pool)["checkouts"] == 1
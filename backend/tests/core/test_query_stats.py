@@ -0,0 +1,88 @@
+import logging
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from src.api.middleware import QueryStatsMiddleware
+from src.core.query_stats import QueryStats, instrument_engine, statement_shape
+
+
+class TestStatementShape:
+    def test_placeholder_runs_are_collapsed(self):
+        """Test that IN lists of any length have the same shape."""
+        two = "SELECT * FROM task WHERE id IN ($1::INTEGER, $2::INTEGER)"
+        three = "SELECT * FROM task WHERE id IN ($1::INTEGER, $2::INTEGER, $3)"
+
+        assert statement_shape(two) == statement_shape(three)
+        assert statement_shape(two) == "SELECT * FROM task WHERE id IN (?)"
+
+    def test_psycopg2_placeholders(self):
+        """Test that named pyformat parameters are recognized too."""
+        statement = "UPDATE task SET title=%(title)s WHERE task.id = %(id_1)s"
+
+        assert statement_shape(statement) == "UPDATE task SET title=? WHERE task.id = ?"
+
+
+class TestQueryStats:
+    def test_totals_and_slowest_statement(self):
+        """Test that statements add up and the slowest one is kept."""
+        stats = QueryStats()
+        stats.record("SELECT 1", 0.002)
+        stats.record("SELECT 2", 0.005)
+        stats.record("SELECT 3", 0.001)
+
+        assert (stats.count, stats.slowest_statement) == (3, "SELECT 2")
+        assert stats.server_timing() == (
+            'db;dur=8.00;desc="3 queries", db-slowest;dur=5.00'
+        )
+
+    def test_repeated_shapes(self):
+        """Test that shapes run at least the threshold are reported."""
+        stats = QueryStats()
+        for i in range(5):
+            stats.record(f"SELECT * FROM task WHERE id = ${i + 1}", 0.001)
+        stats.record("SELECT count(*) FROM task", 0.001)
+
+        assert stats.repeated(5) == [("SELECT * FROM task WHERE id = ?", 5)]
+        assert stats.repeated(0) == []
+
+
+@pytest.fixture
+def client():
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, slow_query_ms=0)
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware, n_plus_one_threshold=3)
+
+    @app.get("/items")
+    def read_items(count: int):
+        with engine.connect() as connection:
+            for i in range(count):
+                connection.execute(text("SELECT :i"), {"i": i})
+        return {}
+
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    )
+
+
+class TestQueryStatsMiddleware:
+    async def test_server_timing_header(self, client):
+        """Test that each request reports its own statements."""
+        async with client:
+            first = await client.get("/items", params={"count": 2})
+            second = await client.get("/items", params={"count": 1})
+
+        assert '"2 queries"' in first.headers["Server-Timing"]
+        assert '"1 queries"' in second.headers["Server-Timing"]
+
+    async def test_n_plus_one_is_logged(self, client, caplog):
+        """Test that a statement repeated within a request is flagged."""
+        caplog.set_level(logging.INFO, logger="src.api.middleware")
+        async with client:
+            await client.get("/items", params={"count": 3})
+
+        assert "queries=3" in caplog.text
+        assert "Possible N+1 query: run 3 times by GET /items" in caplog.text
@@ -0,0 +1,148 @@
+import threading
+import time
+
+import pytest
+from jwt import PyJWK, PyJWKSet
+from jwt.exceptions import PyJWKClientConnectionError, PyJWKClientError
+
+from src.core.security import JWKSKeyStore, VerifiedTokenCache
+
+JWK = {"kty": "oct", "k": "c2VjcmV0", "alg": "HS256"}
+
+
+def make_jwk_set(*kids: str) -> PyJWKSet:
+    return PyJWKSet.from_dict({"keys": [{**JWK, "kid": kid} for kid in kids]})
+
+
+class FakeClient:
+    def __init__(self, *kids: str, delay: float = 0.0):
+        self.kids = list(kids)
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+
+    def get_jwk_set(self, refresh: bool = False) -> PyJWKSet:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise PyJWKClientConnectionError("unreachable")
+        return make_jwk_set(*self.kids)
+
+
+def make_store(client: FakeClient, **kwargs) -> JWKSKeyStore:
+    store = JWKSKeyStore("https://clerk.test/jwks", **kwargs)
+    store._client = client
+    return store
+
+
+class TestJWKSKeyStore:
+    def test_fetches_once_and_serves_from_memory(self):
+        """Test that fresh keys are served without refetching."""
+        client = FakeClient("a")
+        store = make_store(client)
+
+        assert isinstance(store.get_signing_key("a"), PyJWK)
+        store.get_signing_key("a")
+
+        assert client.calls == 1
+        assert store.stats.hits == 1
+        assert store.stats.misses == 1
+
+    def test_unknown_kid_triggers_refetch(self):
+        """Test that a rotated key is picked up on a kid miss."""
+        client = FakeClient("a")
+        store = make_store(client, min_refetch_interval=0)
+        store.get_signing_key("a")
+
+        client.kids = ["a", "b"]
+        assert store.get_signing_key("b").key_id == "b"
+        assert client.calls == 2
+
+    def test_unknown_kid_refetch_is_rate_limited(self):
+        """Test that bogus kids cannot hammer the JWKS endpoint."""
+        client = FakeClient("a")
+        store = make_store(client, min_refetch_interval=60)
+        store.get_signing_key("a")
+
+        for _ in range(3):
+            with pytest.raises(PyJWKClientError):
+                store.get_signing_key("bogus")
+        assert client.calls == 1
+
+    def test_concurrent_misses_are_single_flight(self):
+        """Test that concurrent cold requests share a single fetch."""
+        client = FakeClient("a", delay=0.05)
+        store = make_store(client)
+
+        threads = [
+            threading.Thread(target=store.get_signing_key, args=("a",))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert client.calls == 1
+
+    def test_stale_keys_served_when_refresh_fails(self):
+        """Test that an unreachable Clerk does not break known keys."""
+        client = FakeClient("a")
+        store = make_store(client, ttl=0, min_refetch_interval=0)
+        store.get_signing_key("a")
+
+        client.fail = True
+        assert store.get_signing_key("a").key_id == "a"
+        assert store.stats.fetch_errors == 1
+
+    def test_first_fetch_failure_is_raised(self):
+        """Test that a failure without any cached keys is surfaced."""
+        client = FakeClient("a")
+        client.fail = True
+        store = make_store(client)
+
+        with pytest.raises(PyJWKClientConnectionError):
+            store.get_signing_key("a")
+
+
+class TestVerifiedTokenCache:
+    def test_hit_after_put(self):
+        """Test that a cached payload is returned until it expires."""
+        cache = VerifiedTokenCache()
+        payload = {"sub": "user_1", "exp": time.time() + 60}
+        cache.put("token", payload)
+
+        assert cache.get("token") == payload
+        assert cache.get("other") is None
+        assert cache.stats.hits == 1
+        assert cache.stats.misses == 1
+
+    def test_expired_entry_is_dropped(self):
+        """Test that entries are evicted once exp has passed."""
+        cache = VerifiedTokenCache()
+        cache.put("token", {"sub": "user_1", "exp": time.time() + 0.05})
+        time.sleep(0.1)
+
+        assert cache.get("token") is None
+        assert cache.stats.expirations == 1
+        assert cache.snapshot()["size"] == 0
+
+    def test_payload_without_exp_is_not_cached(self):
+        """Test that tokens without exp always go through verification."""
+        cache = VerifiedTokenCache()
+        cache.put("token", {"sub": "user_1"})
+
+        assert cache.get("token") is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first."""
+        cache = VerifiedTokenCache(maxsize=2)
+        exp = time.time() + 60
+        cache.put("a", {"exp": exp})
+        cache.put("b", {"exp": exp})
+        cache.get("a")
+        cache.put("c", {"exp": exp})
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.stats.evictions == 1
@@ -0,0 +1,67 @@
+import time
+import uuid
+
+from src.core.user_cache import ALL_USERS, AuthUser, UserCache
+
+
+def make_user(clerk_id: str, is_active: bool = True) -> AuthUser:
+    return AuthUser(
+        id=uuid.uuid4(), clerk_id=clerk_id, is_active=is_active, is_superuser=False
+    )
+
+
+class TestUserCache:
+    def test_hit_after_put(self):
+        """Test that a cached user is returned without a lookup."""
+        cache = UserCache()
+        user = make_user("user_1")
+        cache.put(user)
+
+        assert cache.get("user_1") is user
+        assert cache.get("user_2") is None
+        assert cache.snapshot()["hits"] == 1
+        assert cache.snapshot()["misses"] == 1
+
+    def test_entries_expire(self, monkeypatch):
+        """Test that entries are dropped after the TTL."""
+        cache = UserCache(ttl=10)
+        cache.put(make_user("user_1"))
+
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get("user_1") is None
+        assert cache.snapshot()["expirations"] == 1
+        assert cache.snapshot()["size"] == 0
+
+    def test_evicts_least_recently_used(self):
+        """Test that the cache never grows past maxsize."""
+        cache = UserCache(maxsize=2)
+        cache.put(make_user("user_1"))
+        cache.put(make_user("user_2"))
+        cache.get("user_1")
+        cache.put(make_user("user_3"))
+
+        assert cache.get("user_2") is None
+        assert cache.get("user_1") is not None
+        assert cache.snapshot()["evictions"] == 1
+
+    def test_invalidate_one_or_all(self):
+        """Test that invalidation drops one user, or every user for '*'."""
+        cache = UserCache()
+        for clerk_id in ("user_1", "user_2", "user_3"):
+            cache.put(make_user(clerk_id))
+
+        cache.invalidate("user_1")
+        assert cache.get("user_1") is None
+        assert cache.get("user_2") is not None
+
+        cache.invalidate(ALL_USERS)
+        assert cache.snapshot()["size"] == 0
+
+    def test_zero_ttl_disables_cache(self):
+        """Test that a TTL of 0 turns the cache off."""
+        cache = UserCache(ttl=0)
+        cache.put(make_user("user_1"))
+
+        assert cache.get("user_1") is None
@@ -0,0 +1,270 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.core.db import async_engine
+from src.models.outbox import OutboxEvent
+from src.models.users import User
+from src.scripts.sync_clerk_users import (
+    ClerkAPIError,
+    clerk_api_client,
+    fetch_changed_user_pages,
+    fetch_clerk_user_pages,
+    needs_full_sync,
+    sync_user_pages,
+)
+from src.models.sync import CLERK_USERS_SYNC, SyncCheckpoint
+
+
+class MockClerk:
+    """Clerk's `GET /v1/users`, failing the first requests of given offsets."""
+
+    def __init__(self, users: int, failures: dict[int, list[int]] | None = None):
+        self.users = [
+            {
+                "id": f"user_{i}",
+                "email_addresses": [{"email_address": f"{i}@x.io"}],
+                "created_at": i,
+                "updated_at": i,
+            }
+            for i in range(users)
+        ]
+        self.failures = failures or {}
+        self.requests: list[int] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.app = FastAPI()
+        self.app.get("/v1/users")(self.list_users)
+
+    async def list_users(self, limit: int, offset: int, order_by: str):
+        self.requests.append(offset)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failures.get(offset):
+                status_code = self.failures[offset].pop(0)
+                return Response(status_code=status_code, headers={"Retry-After": "0"})
+            key = order_by.lstrip("+-")
+            users = sorted(
+                self.users, key=lambda user: user[key], reverse=order_by[0] == "-"
+            )
+            return users[offset : offset + limit]
+        finally:
+            self.in_flight -= 1
+
+    def client(self, concurrency: int) -> httpx.AsyncClient:
+        transport = httpx.ASGITransport(app=self.app)
+        return clerk_api_client(concurrency, transport=transport)
+
+
+@pytest.fixture(autouse=True)
+def clerk_env(monkeypatch):
+    monkeypatch.setenv("CLERK_SECRET_KEY", "sk_test")
+    monkeypatch.setenv("CLERK_API_URL", "http://clerk.test/v1")
+
+
+async def fetch_ids(clerk: MockClerk, concurrency: int = 4, **options) -> list[str]:
+    async with clerk.client(concurrency) as client:
+        pages = fetch_clerk_user_pages(
+            client, concurrency, page_size=10, backoff=0, **options
+        )
+        return [user["id"] async for page in pages for user in page]
+
+
+class TestFetchClerkUserPages:
+    async def test_pages_are_fetched_concurrently(self):
+        """Test that every user is fetched once, several pages at a time."""
+        clerk = MockClerk(users=95)
+
+        ids = await fetch_ids(clerk, concurrency=4)
+
+        assert sorted(ids) == sorted(user["id"] for user in clerk.users)
+        assert clerk.max_in_flight == 4
+        # Pages past the first short one are only requested speculatively.
+        assert max(clerk.requests) < 95 + 4 * 10
+
+    async def test_exact_multiple_of_page_size(self):
+        """Test that a full last page is followed by an empty one."""
+        clerk = MockClerk(users=40)
+
+        ids = await fetch_ids(clerk, concurrency=1)
+
+        assert len(ids) == 40
+        assert clerk.requests == [0, 10, 20, 30, 40]
+
+    async def test_rate_limits_and_server_errors_are_retried(self):
+        """Test that 429 and 5xx responses are retried until they succeed."""
+        clerk = MockClerk(users=30, failures={0: [429, 503], 10: [500]})
+
+        ids = await fetch_ids(clerk)
+
+        assert len(ids) == 30
+        assert clerk.requests.count(0) == 3
+        assert clerk.requests.count(10) == 2
+
+    async def test_gives_up_after_max_retries(self):
+        """Test that a page failing every retry fails the fetch."""
+        clerk = MockClerk(users=30, failures={10: [503] * 3})
+
+        with pytest.raises(ClerkAPIError, match="503"):
+            await fetch_ids(clerk, max_retries=2)
+
+        assert clerk.requests.count(10) == 3
+
+    async def test_client_errors_are_not_retried(self):
+        """Test that an unauthorized request fails right away."""
+        clerk = MockClerk(users=30, failures={0: [401]})
+
+        with pytest.raises(ClerkAPIError, match="401"):
+            await fetch_ids(clerk)
+
+        assert clerk.requests.count(0) == 1
+
+
+class TestIncrementalSync:
+    async def test_stops_at_first_user_not_changed(self):
+        """Test that only the pages of changed users are fetched."""
+        clerk = MockClerk(users=100)
+
+        async with clerk.client(1) as client:
+            pages = fetch_changed_user_pages(client, since=75, page_size=10)
+            ids = [user["id"] async for page in pages for user in page]
+
+        assert ids == [f"user_{i}" for i in range(99, 74, -1)]
+        assert clerk.requests == [0, 10, 20]
+
+    def test_falls_back_to_full_sync(self):
+        """Test that a full sync runs first, then once per interval."""
+        now = datetime.now(timezone.utc)
+        interval = timedelta(hours=24)
+
+        def checkpoint(last_full_sync: timedelta) -> SyncCheckpoint:
+            return SyncCheckpoint(
+                name=CLERK_USERS_SYNC,
+                high_water_mark=1,
+                last_run_at=now,
+                last_full_sync_at=now - last_full_sync,
+            )
+
+        assert needs_full_sync(None, interval, now)
+        assert not needs_full_sync(checkpoint(timedelta(hours=1)), interval, now)
+        assert needs_full_sync(checkpoint(timedelta(hours=25)), interval, now)
+
+
+async def pages_of(*pages: list[dict]):
+    for page in pages:
+        yield page
+
+
+def clerk_user(clerk_id: str, email: str, **fields) -> dict:
+    return {
+        "id": clerk_id,
+        "email_addresses": [{"email_address": email}],
+        "updated_at": 1_700_000_000_000,
+        **fields,
+    }
+
+
+@pytest.fixture
+async def db(database) -> AsyncSession:
+    """Session whose changes are rolled back after the test."""
+    async with AsyncSession(async_engine) as session:
+        session.add_all(
+            [
+                User(clerk_id="test_sync_same", email="same@sync.test"),
+                User(clerk_id="test_sync_changed", email="old@sync.test"),
+                User(clerk_id="test_sync_gone", email="gone@sync.test"),
+            ]
+        )
+        await session.flush()
+        yield session
+        await session.rollback()
+
+
+class TestSyncUserPages:
+    pages = (
+        [
+            clerk_user("test_sync_same", "same@sync.test"),
+            clerk_user(
+                "test_sync_changed",
+                "new@sync.test",
+                first_name="Ada",
+                updated_at=1_700_000_000_001,
+            ),
+        ],
+        [
+            clerk_user("test_sync_new", "new-user@sync.test"),
+            # Pages may shift during a sync and repeat a user.
+            clerk_user("test_sync_new", "new-user@sync.test"),
+            {"id": "test_sync_invalid", "email_addresses": []},
+        ],
+    )
+
+    async def fetch_user(self, db: AsyncSession, clerk_id: str) -> User | None:
+        statement = select(User).where(User.clerk_id == clerk_id)
+        return (
+            await db.exec(statement.execution_options(populate_existing=True))
+        ).first()
+
+    async def test_changes_are_applied_in_bulk(self, db):
+        """Test that users are created, updated and deactivated as needed."""
+        stats = await sync_user_pages(
+            db, pages_of(*self.pages), deactivate_missing=True
+        )
+
+        assert (stats.created, stats.updated, stats.errors) == (1, 1, 1)
+        assert stats.unchanged == 1
+        assert stats.deactivated >= 1
+        assert stats.last_updated_at == 1_700_000_000_001
+        changed = await self.fetch_user(db, "test_sync_changed")
+        assert (changed.email, changed.full_name) == ("new@sync.test", "Ada")
+        assert (await self.fetch_user(db, "test_sync_new")) is not None
+        assert not (await self.fetch_user(db, "test_sync_gone")).is_active
+
+    async def test_changes_queue_domain_events(self, db):
+        """Test that each user created, updated or deactivated queues its event."""
+        await sync_user_pages(db, pages_of(*self.pages), deactivate_missing=True)
+
+        statement = select(
+            OutboxEvent.event_type, OutboxEvent.payload["email"].astext
+        ).where(
+            OutboxEvent.aggregate_type == "user",
+            OutboxEvent.payload["email"].astext.endswith("@sync.test"),  # type: ignore
+        )
+        events = set((await db.exec(statement)).all())
+        assert events == {
+            ("user.updated", "new@sync.test"),
+            ("user.created", "new-user@sync.test"),
+            ("user.deactivated", "gone@sync.test"),
+        }
+
+    async def test_dry_run_reports_without_changes(self, db):
+        """Test that a dry run reports the same counts and changes nothing."""
+        stats = await sync_user_pages(
+            db, pages_of(*self.pages), dry_run=True, deactivate_missing=True
+        )
+
+        assert (stats.created, stats.updated, stats.unchanged) == (1, 1, 1)
+        assert stats.deactivated >= 1
+        assert (await self.fetch_user(db, "test_sync_changed")).email == "old@sync.test"
+        assert (await self.fetch_user(db, "test_sync_new")) is None
+        assert (await self.fetch_user(db, "test_sync_gone")).is_active
+
+    async def test_users_without_email_are_not_deactivated(self, db):
+        """Test that a Clerk user skipped for its missing email is kept."""
+        db.add(User(clerk_id="test_sync_no_email", email="no-email@sync.test"))
+        await db.flush()
+        pages = ([{"id": "test_sync_no_email", "email_addresses": []}],)
+
+        stats = await sync_user_pages(db, pages_of(*pages), deactivate_missing=True)
+
+        user = await self.fetch_user(db, "test_sync_no_email")
+        assert (stats.created, stats.updated, stats.errors) == (0, 0, 1)
+        assert (user.email, user.is_active) == ("no-email@sync.test", True)
+        assert not (await self.fetch_user(db, "test_sync_gone")).is_active
@@ -0,0 +1,105 @@
+import pytest
+
+from src.webhooks.handlers import WebhookDataError, coalesce_user_events, user_fields
+
+
+def user_data(clerk_id: str, email: str = "user@example.com", **fields) -> dict:
+    return {"id": clerk_id, "email_addresses": [{"email_address": email}], **fields}
+
+
+class TestUserFields:
+    def test_full_name_is_joined(self):
+        """Test that first and last names make up the full name."""
+        fields = user_fields(user_data("user_1", first_name="Ada", last_name=None))
+
+        assert fields == {
+            "clerk_id": "user_1",
+            "email": "user@example.com",
+            "full_name": "Ada",
+            "image_url": None,
+        }
+
+    def test_missing_email_is_rejected(self):
+        """Test that users without an email address can't be stored."""
+        with pytest.raises(WebhookDataError):
+            user_fields({"id": "user_1", "email_addresses": []})
+
+
+class TestCoalesceUserEvents:
+    def test_last_update_wins(self):
+        """Test that only the latest state of a user is kept."""
+        changes = coalesce_user_events(
+            [
+                ("msg_1", "user.created", {"data": user_data("user_1", "a@x.io")}),
+                ("msg_2", "user.updated", {"data": user_data("user_1", "b@x.io")}),
+            ]
+        )
+
+        assert changes.upserts["user_1"]["email"] == "b@x.io"
+        assert changes.events == {"user_1": ["msg_1", "msg_2"]}
+        assert not changes.deletes
+
+    def test_delete_follows_earlier_updates(self):
+        """Test that a deletion applies after the updates before it, not after."""
+        changes = coalesce_user_events(
+            [
+                ("msg_1", "user.updated", {"data": user_data("user_1")}),
+                ("msg_2", "user.deleted", {"data": {"id": "user_1"}}),
+                ("msg_3", "user.deleted", {"data": {"id": "user_2"}}),
+                ("msg_4", "user.created", {"data": user_data("user_2")}),
+            ]
+        )
+
+        assert changes.deletes == {"user_1"}
+        assert set(changes.upserts) == {"user_1", "user_2"}
+
+    def test_latest_timestamp_is_kept(self):
+        """Test that each user's change is stamped with its latest event."""
+        changes = coalesce_user_events(
+            [
+                (
+                    "msg_1",
+                    "user.created",
+                    {"data": user_data("user_1"), "timestamp": 2},
+                ),
+                ("msg_2", "user.deleted", {"data": {"id": "user_1"}, "timestamp": 3}),
+                (
+                    "msg_3",
+                    "user.updated",
+                    {"data": user_data("user_1"), "timestamp": 1},
+                ),
+                ("msg_4", "user.created", {"data": user_data("user_2")}),
+            ]
+        )
+
+        assert changes.timestamps == {"user_1": 3}
+
+    def test_invalid_events_are_reported(self):
+        """Test that invalid events are set aside and others are ignored."""
+        changes = coalesce_user_events(
+            [
+                ("msg_1", "user.created", {"data": {"id": "user_1"}}),
+                ("msg_2", "session.created", {"data": {"id": "sess_1"}}),
+            ]
+        )
+
+        assert list(changes.invalid) == ["msg_1"]
+        assert not changes.events
+
+    def test_malformed_events_are_reported(self):
+        """Test that payloads of the wrong shape are invalid, not raising."""
+        changes = coalesce_user_events(
+            [
+                ("msg_1", "user.updated", {"data": ["user_1"]}),
+                (
+                    "msg_2",
+                    "user.updated",
+                    {"data": {"id": "user_1", "email_addresses": ["x"]}},
+                ),
+                ("msg_3", "user.deleted", {"data": "user_1"}),
+                ("msg_4", "user.deleted", {"data": {"id": {"nested": 1}}}),
+            ]
+        )
+
+        assert list(changes.invalid) == ["msg_1", "msg_2", "msg_3", "msg_4"]
+        assert not changes.events